@@ -0,0 +1,198 @@
+"""
+여러 기획서를 프로세스 풀에서 병렬로 처리하는 일괄 처리 엔진
+"""
+import os
+import json
+import time
+import hashlib
+import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _option_state(value):
+    """JSON으로 바로 쓸 수 없는 옵션 값을 비교용 값으로 변환 (작업 객체, 백엔드 등은 repr에 메모리 주소가 들어가므로 속성 값 사용)"""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    # 백엔드의 __getstate__는 API 클라이언트, 캐시 연결 등 실행 중에만 필요한 값을 제외함
+    state = value.__getstate__() if hasattr(value, "__getstate__") else getattr(value, "__dict__", None)
+    return state if state is not None else repr(value)
+
+
+def options_hash(process_kwargs):
+    """
+    처리 옵션(섹션, 처리 방식, 백엔드 등)의 안정적인 해시
+    같은 파일이라도 옵션이 다르면 이전 결과를 재사용하지 않도록 작업 기록에 함께 저장합니다
+    """
+    encoded = json.dumps(process_kwargs, sort_keys=True, ensure_ascii=False, default=_option_state)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _run_file(process_fn, file_path, process_kwargs):
+    """
+    작업자 프로세스에서 단일 기획서 처리 (예외는 결과로 변환)
+    """
+    start_time = time.time()
+    # 처리 도중 파일이 수정되는 경우를 감지할 수 있도록 처리 시작 시점의 상태 기록
+    try:
+        stat = os.stat(file_path)
+        file_state = {"size": stat.st_size, "mtime": stat.st_mtime}
+    except OSError:
+        file_state = {}
+
+    try:
+        docx_path = process_fn(file_path, **process_kwargs)
+        error = None if docx_path else "문서가 생성되지 않았습니다."
+    except Exception as e:  # 작업자 내 input() 호출 시 발생하는 EOFError 등도 실패로 기록
+        docx_path = None
+        error = f"{type(e).__name__}: {str(e)}"
+
+    return {
+        "file_path": file_path,
+        "docx_path": docx_path,
+        "elapsed": round(time.time() - start_time, 3),
+        "error": error,
+        "file_state": file_state
+    }
+
+
+class BatchRunner:
+    """
+    기획서 파일 목록을 프로세스 풀에 분배하여 처리하는 클래스
+
+    완료된 파일의 결과는 완료되는 즉시 반환(yield)되며, 작업 기록(journal)에 저장됩니다.
+    중단 후 다시 실행하면 이미 성공한 파일(내용과 처리 옵션이 변경되지 않은 경우)은 건너뜁니다.
+    작업자 프로세스는 표준 입력을 사용할 수 없으므로 process_fn은 비대화형이어야 합니다.
+
+    file_kwargs(file_path)를 지정하면 반환한 사전을 해당 파일의 process_fn 인자에 추가합니다.
+    파일별 작업 명세(PlanJob 등)는 이 방식으로 전달해야 다른 파일의 옵션이 바뀌어도 완료된 파일을 다시 처리하지 않습니다.
+    """
+    def __init__(self, process_fn, output_dir="output", max_workers=None, journal_path=None, file_kwargs=None):
+        self.process_fn = process_fn
+        self.file_kwargs = file_kwargs
+        self.output_dir = output_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.journal_path = journal_path or os.path.join(output_dir, "batch_journal.jsonl")
+        os.makedirs(output_dir, exist_ok=True)
+
+    def load_completed(self):
+        """
+        작업 기록에서 성공적으로 완료된 파일 정보를 읽어옵니다
+        """
+        completed = {}
+        if not os.path.exists(self.journal_path):
+            return completed
+
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 비정상 종료로 잘린 마지막 줄은 무시
+                    continue
+                file_key = os.path.abspath(record.get("file_path", ""))
+                if record.get("error") is None and record.get("docx_path"):
+                    completed[file_key] = record
+                else:
+                    completed.pop(file_key, None)
+        return completed
+
+    def _kwargs_for(self, file_path, process_kwargs):
+        """파일 하나의 process_fn 인자 (공통 인자 + 파일별 인자)"""
+        if self.file_kwargs is None:
+            return process_kwargs
+        return {**process_kwargs, **self.file_kwargs(file_path)}
+
+    def pending_files(self, files, **process_kwargs):
+        """
+        이미 완료된 파일을 제외한 처리 대상 파일 목록을 반환합니다
+        파일 크기나 수정 시간, 처리 옵션(process_kwargs와 파일별 인자)이 바뀌었거나 결과 문서가 없으면 다시 처리합니다
+        """
+        completed = self.load_completed()
+        pending = []
+        for file_path in files:
+            record = completed.get(os.path.abspath(file_path))
+            options = options_hash(self._kwargs_for(file_path, process_kwargs))
+            if record and self._is_unchanged(file_path, record, options):
+                continue
+            pending.append(file_path)
+        return pending
+
+    def run(self, files, resume=True, **process_kwargs):
+        """
+        파일 목록을 병렬로 처리하고, 완료되는 순서대로 결과 사전을 반환합니다
+
+        Args:
+            files: 처리할 기획서 파일 경로 목록
+            resume: True이면 이미 완료된 파일을 건너뜁니다
+            process_kwargs: process_fn에 전달할 추가 인자
+
+        Yields:
+            {"file_path", "docx_path", "elapsed", "error", "skipped"} 형태의 결과
+        """
+        files_to_run = self.pending_files(files, **process_kwargs) if resume else list(files)
+
+        # 건너뛴 파일도 결과로 보고
+        if resume:
+            completed = self.load_completed()
+            for file_path in files:
+                if file_path not in files_to_run:
+                    record = completed[os.path.abspath(file_path)]
+                    yield {
+                        "file_path": file_path,
+                        "docx_path": record["docx_path"],
+                        "elapsed": 0.0,
+                        "error": None,
+                        "skipped": True
+                    }
+
+        if not files_to_run:
+            return
+
+        max_workers = min(self.max_workers, len(files_to_run))
+        kwargs_by_file = {file_path: self._kwargs_for(file_path, process_kwargs) for file_path in files_to_run}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_file, self.process_fn, file_path, kwargs_by_file[file_path]): file_path
+                for file_path in files_to_run
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 작업자 프로세스 자체가 비정상 종료된 경우
+                    result = {
+                        "file_path": futures[future],
+                        "docx_path": None,
+                        "elapsed": 0.0,
+                        "error": f"{type(e).__name__}: {str(e)}"
+                    }
+                self._append_journal(result, kwargs_by_file[futures[future]])
+                result.pop("file_state", None)
+                result["skipped"] = False
+                yield result
+
+    def _append_journal(self, result, process_kwargs):
+        """결과를 작업 기록 파일에 즉시 기록"""
+        record = dict(result)
+        record.pop("skipped", None)
+        record.update(record.pop("file_state", None) or {})
+        record["options_hash"] = options_hash(process_kwargs)
+        record["finished_at"] = datetime.datetime.now().isoformat()
+
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _is_unchanged(self, file_path, record, options):
+        """기록 이후 입력 파일, 처리 옵션, 결과 문서가 그대로인지 확인 (옵션 해시가 없는 이전 기록은 다시 처리)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (
+            record.get("options_hash") == options
+            and stat.st_size == record.get("size")
+            and stat.st_mtime == record.get("mtime")
+            and os.path.exists(record["docx_path"])
+        )
@@ -19,12 +19,15 @@ class BusinessPlan:
             "financials": "",
             "scale_up": ""
         }
+        # 스트리밍 중인 섹션의 청크 목록 (완료되면 sections로 합쳐짐)
+        self._streaming = {}
     
     def add_section_content(self, section_name, content):
         """
         특정 섹션에 내용을 추가합니다
         """
         if section_name in self.sections:
+            self._streaming.pop(section_name, None)
             self.sections[section_name] = content
             return True
         return False
@@ -36,10 +39,31 @@ class BusinessPlan:
         """
         return self.add_section_content(section_id, content)
     
+    def append_section_content(self, section_name, chunk):
+        """
+        스트리밍 중인 섹션에 내용 조각을 이어 붙입니다
+        finish_section()을 호출하기 전까지 get_section_content()는 지금까지 받은 내용을 반환합니다
+        """
+        if section_name not in self.sections:
+            return False
+        self._streaming.setdefault(section_name, [self.sections[section_name]]).append(chunk)
+        return True
+    
+    def finish_section(self, section_name, content=None):
+        """
+        스트리밍 중인 섹션을 완료합니다 (content를 지정하면 최종 내용으로 교체)
+        """
+        parts = self._streaming.pop(section_name, None)
+        if content is None:
+            content = "".join(parts) if parts is not None else self.sections.get(section_name, "")
+        return self.add_section_content(section_name, content)
+    
     def get_section_content(self, section_name):
         """
         특정 섹션의 내용을 반환합니다
         """
+        if section_name in self._streaming:
+            return "".join(self._streaming[section_name])
         return self.sections.get(section_name, "")
     
     def get_completed_sections(self):
@@ -11,6 +11,8 @@ sys.path.append(project_root)
 
 from utils import pdf_utils
 from utils.pdf_utils import merge_docx_files  # merge_docx_files 함수 명시적으로 가져오기
+from utils.document_export import export_document
+from core.section_config import get_section_config
 
 
 class DocumentManager:
@@ -27,23 +29,26 @@ class DocumentManager:
         """
         output_path = os.path.join(self.output_dir, output_filename)
         
-        # sections 사전에서 내용 추출
-        completed_sections = {}
-        for section_name, content in business_plan.sections.items():
-            if content:  # 내용이 있는 섹션만 포함
-                # 섹션 이름을 더 읽기 쉬운 형식으로 변환
-                section_title = section_name.replace('_', ' ').title()
-                completed_sections[section_title] = content
-        
         # Word 문서 생성
         try:
-            pdf_utils.create_docx_with_sections(output_path, completed_sections)
+            pdf_utils.create_docx_with_sections(output_path, self._completed_sections(business_plan))
             print(f"문서가 성공적으로 생성되었습니다: {output_path}")
             return output_path
         except Exception as e:
             print(f"문서 생성 중 오류 발생: {str(e)}")
             return None
     
+    @staticmethod
+    def _completed_sections(business_plan):
+        """내용이 있는 섹션만 {읽기 쉬운 제목: 내용} 사전으로 추출"""
+        completed_sections = {}
+        for section_name, content in business_plan.sections.items():
+            if content:  # 내용이 있는 섹션만 포함
+                # 섹션 이름을 더 읽기 쉬운 형식으로 변환
+                section_title = section_name.replace('_', ' ').title()
+                completed_sections[section_title] = content
+        return completed_sections
+    
     # create_word_document를 create_document_from_sections의 별칭으로 추가
     def create_word_document(self, business_plan, output_filename="business_plan.docx"):
         """
@@ -51,12 +56,68 @@ class DocumentManager:
         """
         return self.create_document_from_sections(business_plan, output_filename)
     
+    def create_pdf_from_template(self, business_plan, output_filename="business_plan_template.pdf",
+                                 template_path=pdf_utils.DEFAULT_TEMPLATE_PDF, section_config=None):
+        """
+        PDF 템플릿의 섹션별 위치(section_config의 pdf_position)에 사업계획서 내용을 한 번에 채워 넣습니다
+        """
+        section_config = section_config or get_section_config()
+        placements = []
+        for section in section_config:
+            content = business_plan.sections.get(section.id)
+            # [페이지, x, y] 형식의 위치가 있는 섹션만 배치
+            if content and isinstance(section.pdf_position, tuple):
+                placements.append((content, section.pdf_position))
+        
+        if not placements:
+            print("PDF 템플릿에 배치할 섹션 내용이 없습니다.")
+            return None
+        
+        try:
+            output_path = os.path.join(self.output_dir, output_filename)
+            pdf_utils.fill_pdf_template(template_path, output_path, placements)
+            print(f"PDF 템플릿 문서가 생성되었습니다: {output_path}")
+            return output_path
+        except Exception as e:
+            print(f"PDF 템플릿 채우기 중 오류 발생: {str(e)}")
+            return None
+    
+    def create_pdf_document(self, business_plan, output_filename="business_plan.pdf"):
+        """
+        사업계획서 객체로부터 Word 문서를 거치지 않고 PDF 문서를 직접 생성합니다
+        """
+        output_path = os.path.join(self.output_dir, output_filename)
+        try:
+            pdf_utils.create_pdf_with_sections(output_path, self._completed_sections(business_plan))
+            print(f"PDF가 성공적으로 생성되었습니다: {output_path}")
+            return output_path
+        except Exception as e:
+            print(f"PDF 생성 중 오류 발생: {str(e)}")
+            return None
+    
+    def export_documents(self, business_plan, base_filename="business_plan", formats=("docx", "pdf")):
+        """
+        사업계획서 섹션을 한 번만 블록으로 변환해 여러 형식(docx, pdf, markdown, html)으로 동시에 저장합니다
+        
+        Returns:
+            {형식: 저장한 경로} (실패하면 빈 사전)
+        """
+        try:
+            outputs = export_document(self._completed_sections(business_plan),
+                                      os.path.join(self.output_dir, base_filename), formats)
+            for output_path in outputs.values():
+                print(f"문서가 성공적으로 생성되었습니다: {output_path}")
+            return outputs
+        except Exception as e:
+            print(f"문서 내보내기 중 오류 발생: {str(e)}")
+            return {}
+    
     def create_pdf_from_docx(self, docx_path):
         """
-        Word 문서를 PDF로 변환합니다
+        Word 문서를 PDF로 변환합니다 (사업계획서 객체가 있으면 create_pdf_document가 더 빠름)
         """
         try:
-            pdf_path = docx_path.replace('.docx', '.pdf')
+            pdf_path = os.path.splitext(docx_path)[0] + '.pdf'
             pdf_utils.convert_docx_to_pdf(docx_path, pdf_path)
             print(f"PDF가 성공적으로 생성되었습니다: {pdf_path}")
             return pdf_path
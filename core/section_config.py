@@ -0,0 +1,257 @@
+"""
+섹션 설정 모델 - 섹션 설정 파일을 한 번만 읽어 검증/색인한 불변 객체로 공유
+"""
+import os
+import re
+import json
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# 기본 섹션 설정 파일 경로 (새 구조 우선, 없으면 레거시 구조)
+DEFAULT_CONFIG_PATHS = [
+    os.path.join("data", "prompts", "section_config.json"),
+    os.path.join("config", "section_config.json")
+]
+
+# 섹션 제목 앞의 번호 ("1. 문제 인식" → "문제 인식")
+TITLE_NUMBER_PATTERN = re.compile(r'^\d+\.\s+')
+
+
+class _Frozen:
+    """생성 후 속성 변경을 막는 기본 클래스"""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 객체는 변경할 수 없습니다.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} 객체는 변경할 수 없습니다.")
+
+
+class RequiredElement(_Frozen):
+    """
+    섹션 필수 요소
+    설정 파일의 문자열 형식("시장 규모")과 사전 형식({"name", "description"})을 모두 이 형태로 정규화합니다
+    """
+    __slots__ = ("name", "description")
+
+    def __init__(self, name: str, description: str = ""):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "description", description)
+
+    @classmethod
+    def parse(cls, value) -> "RequiredElement":
+        if isinstance(value, str):
+            return cls(value)
+        if isinstance(value, dict) and value.get("name"):
+            return cls(value["name"], value.get("description", ""))
+        raise ValueError(f"잘못된 필수 요소 형식입니다: {value!r}")
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"name": self.name, "description": self.description}
+
+    def __eq__(self, other):
+        return isinstance(other, RequiredElement) and (self.name, self.description) == (other.name, other.description)
+
+    def __hash__(self):
+        return hash((self.name, self.description))
+
+    def __repr__(self):
+        return f"RequiredElement({self.name!r})"
+
+
+class Section(_Frozen):
+    """
+    단일 섹션 설정 (불변)
+
+    기존 코드와의 호환을 위해 section["id"], section.get("title") 같은 사전 형식 접근도 지원합니다.
+    title은 번호가 제거된 제목이며, 원본 제목은 original_title에 보존됩니다.
+    """
+    __slots__ = ("id", "title", "original_title", "required_elements", "pdf_position",
+                 "analysis_prompt", "generation_prompt", "depends_on", "extra")
+
+    def __init__(self, id: str, title: str, original_title: str, required_elements=(), pdf_position=None,
+                 analysis_prompt: Optional[str] = None, generation_prompt: Optional[str] = None,
+                 depends_on=(), extra: Optional[Dict] = None):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "title", title)
+        object.__setattr__(self, "original_title", original_title)
+        object.__setattr__(self, "required_elements", tuple(required_elements))
+        object.__setattr__(self, "pdf_position", pdf_position)
+        object.__setattr__(self, "analysis_prompt", analysis_prompt)
+        object.__setattr__(self, "generation_prompt", generation_prompt)
+        object.__setattr__(self, "depends_on", tuple(depends_on))
+        object.__setattr__(self, "extra", dict(extra or {}))
+
+    @classmethod
+    def parse(cls, data: Dict) -> "Section":
+        """설정 파일의 섹션 항목을 검증하여 Section 생성"""
+        section_id = data.get("id")
+        if not section_id or not isinstance(section_id, str):
+            raise ValueError(f"섹션 ID가 없거나 올바르지 않습니다: {data!r}")
+
+        original_title = data.get("title") or section_id
+        pdf_position = data.get("pdf_position")
+        if isinstance(pdf_position, list):
+            if len(pdf_position) != 3:
+                raise ValueError(f"'{section_id}' 섹션의 pdf_position은 [페이지, x, y] 형식이어야 합니다.")
+            pdf_position = tuple(pdf_position)
+
+        known_keys = {"id", "title", "original_title", "required_elements", "pdf_position",
+                      "analysis_prompt", "generation_prompt", "depends_on"}
+        return cls(
+            id=section_id,
+            title=TITLE_NUMBER_PATTERN.sub('', original_title),
+            original_title=data.get("original_title", original_title),
+            required_elements=[RequiredElement.parse(e) for e in data.get("required_elements", []) or []],
+            pdf_position=pdf_position,
+            analysis_prompt=data.get("analysis_prompt"),
+            generation_prompt=data.get("generation_prompt"),
+            depends_on=data.get("depends_on", []) or [],
+            extra={k: v for k, v in data.items() if k not in known_keys}
+        )
+
+    @property
+    def element_names(self) -> List[str]:
+        """필수 요소 이름 목록"""
+        return [element.name for element in self.required_elements]
+
+    def get(self, key, default=None):
+        """사전 형식 접근 (기존 코드 호환용)"""
+        if key in self.__slots__ and key != "extra":
+            value = getattr(self, key)
+            if key == "required_elements":
+                return [element.to_dict() for element in value]
+            return list(value) if key == "depends_on" else value
+        return self.extra.get(key, default)
+
+    def __getitem__(self, key):
+        if key not in self.__slots__ and key not in self.extra:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key):
+        return (key in self.__slots__ and key != "extra") or key in self.extra
+
+    def to_dict(self) -> Dict:
+        """기존 사전 형식으로 변환"""
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "original_title": self.original_title,
+            "required_elements": self.get("required_elements"),
+            "pdf_position": list(self.pdf_position) if isinstance(self.pdf_position, tuple) else self.pdf_position
+        }
+        for key in ("analysis_prompt", "generation_prompt"):
+            if getattr(self, key):
+                data[key] = getattr(self, key)
+        if self.depends_on:
+            data["depends_on"] = list(self.depends_on)
+        data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"Section({self.id!r})"
+
+
+class SectionConfig(_Frozen):
+    """
+    섹션 설정 전체 (불변, ID 및 pdf_position으로 색인)
+    """
+    __slots__ = ("path", "sections", "_by_id", "_by_pdf_position")
+
+    def __init__(self, sections: Iterable[Section], path: Optional[str] = None):
+        sections = tuple(sections)
+        by_id = {}
+        by_pdf_position = {}
+        for section in sections:
+            if section.id in by_id:
+                raise ValueError(f"섹션 ID가 중복되었습니다: {section.id}")
+            by_id[section.id] = section
+            if section.pdf_position is not None:
+                by_pdf_position.setdefault(section.pdf_position, section)
+
+        for section in sections:
+            unknown = [dep for dep in section.depends_on if dep not in by_id]
+            if unknown:
+                raise ValueError(f"'{section.id}' 섹션이 알 수 없는 섹션에 의존합니다: {', '.join(unknown)}")
+
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "sections", sections)
+        object.__setattr__(self, "_by_id", by_id)
+        object.__setattr__(self, "_by_pdf_position", by_pdf_position)
+
+    @classmethod
+    def from_dict(cls, data: Dict, path: Optional[str] = None) -> "SectionConfig":
+        sections = data.get("sections")
+        if not isinstance(sections, list):
+            raise ValueError("섹션 설정에 sections 목록이 없습니다.")
+        return cls([Section.parse(section) for section in sections], path)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SectionConfig":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), path)
+
+    @property
+    def ids(self) -> List[str]:
+        return [section.id for section in self.sections]
+
+    def get(self, section_id: str) -> Optional[Section]:
+        """ID로 섹션 조회"""
+        return self._by_id.get(section_id)
+
+    def by_pdf_position(self, pdf_position) -> Optional[Section]:
+        """pdf_position([페이지, x, y] 또는 위치 코드)으로 섹션 조회"""
+        if isinstance(pdf_position, list):
+            pdf_position = tuple(pdf_position)
+        return self._by_pdf_position.get(pdf_position)
+
+    def select(self, section_ids: Optional[Iterable[str]] = None) -> List[Section]:
+        """선택된 섹션 목록을 설정 순서대로 반환 (선택이 없으면 모든 섹션)"""
+        if not section_ids:
+            return list(self.sections)
+        selected = set(section_ids)
+        return [section for section in self.sections if section.id in selected]
+
+    def to_dict(self) -> Dict:
+        """기존 {"sections": [...]} 사전 형식으로 변환"""
+        return {"sections": [section.to_dict() for section in self.sections]}
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, section_id):
+        return section_id in self._by_id
+
+
+_configs: Dict[str, SectionConfig] = {}
+_configs_lock = threading.Lock()
+
+
+def get_section_config(path: Optional[str] = None) -> SectionConfig:
+    """
+    섹션 설정을 프로세스당 한 번만 로드하여 반환
+
+    Args:
+        path: 설정 파일 경로 (없으면 data/prompts/section_config.json, config/section_config.json 순서로 사용)
+
+    Raises:
+        FileNotFoundError: 설정 파일이 없는 경우
+        ValueError: 설정 형식이 올바르지 않은 경우
+    """
+    if path is None:
+        path = next((p for p in DEFAULT_CONFIG_PATHS if os.path.exists(p)), DEFAULT_CONFIG_PATHS[0])
+    key = os.path.abspath(path)
+
+    config = _configs.get(key)
+    if config is None:
+        with _configs_lock:
+            config = _configs.get(key)
+            if config is None:
+                config = SectionConfig.from_file(path)
+                _configs[key] = config
+    return config
@@ -0,0 +1,106 @@
+"""
+섹션 처리 파이프라인 - 섹션 간 의존성을 고려한 동시 처리
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class SectionPipeline:
+    """
+    섹션 의존성 그래프를 만들고, 서로 독립적인 섹션을 제한된 작업자 풀에서 동시에 처리하는 클래스
+
+    섹션 설정의 "depends_on" 항목(섹션 ID 목록)을 의존성으로 사용합니다.
+    결과는 완료 순서와 관계없이 항상 입력된 섹션 순서대로 반환됩니다.
+    """
+    def __init__(self, max_workers=1):
+        self.max_workers = max(1, int(max_workers or 1))
+
+    def build_graph(self, sections):
+        """
+        섹션 목록으로부터 의존성 그래프를 생성합니다
+        선택되지 않은 섹션에 대한 의존성은 무시합니다
+        """
+        section_ids = [section["id"] for section in sections]
+        graph = {}
+        for section in sections:
+            section_id = section["id"]
+            depends_on = section.get("depends_on", []) or []
+            graph[section_id] = [dep for dep in depends_on if dep in section_ids and dep != section_id]
+
+        # 순환 의존성 확인
+        self.topological_order(graph)
+        return graph
+
+    def topological_order(self, graph):
+        """
+        의존성 그래프의 위상 정렬 결과를 반환합니다
+        같은 단계의 섹션은 입력 순서를 유지합니다
+        """
+        remaining = {section_id: set(deps) for section_id, deps in graph.items()}
+        order = []
+
+        while remaining:
+            ready = [section_id for section_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"섹션 의존성에 순환이 있습니다: {', '.join(remaining.keys())}")
+
+            for section_id in ready:
+                order.append(section_id)
+                del remaining[section_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+    def run(self, sections, task):
+        """
+        섹션을 의존성 순서에 따라 처리합니다
+
+        Args:
+            sections: 처리할 섹션 설정 목록
+            task: task(section, dependency_results) 형태의 호출 가능 객체
+                  dependency_results는 의존 섹션 ID → 결과 사전입니다
+
+        Returns:
+            섹션 ID → 결과 사전 (입력된 섹션 순서 유지, 실패한 섹션은 None)
+        """
+        graph = self.build_graph(sections)
+        sections_by_id = {section["id"]: section for section in sections}
+        results = {}
+
+        if self.max_workers == 1:
+            # 단일 작업자: 위상 순서대로 현재 스레드에서 처리
+            for section_id in self.topological_order(graph):
+                results[section_id] = self._run_task(task, sections_by_id[section_id], graph, results)
+        else:
+            self._run_concurrently(sections, graph, task, results)
+
+        return {section["id"]: results.get(section["id"]) for section in sections}
+
+    def _run_concurrently(self, sections, graph, task, results):
+        """의존성이 충족된 섹션을 작업자 풀에 제출하여 동시 처리"""
+        pending = [section["id"] for section in sections]
+        sections_by_id = {section["id"]: section for section in sections}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 의존성이 모두 완료된 섹션 제출 (입력 순서 유지)
+                for section_id in list(pending):
+                    if all(dep in results for dep in graph[section_id]):
+                        pending.remove(section_id)
+                        future = executor.submit(self._run_task, task, sections_by_id[section_id], graph, results)
+                        running[future] = section_id
+
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    section_id = running.pop(future)
+                    results[section_id] = future.result()
+
+    def _run_task(self, task, section, graph, results):
+        """단일 섹션 작업 실행 (오류 발생 시 None 반환)"""
+        dependency_results = {dep: results.get(dep) for dep in graph[section["id"]]}
+        try:
+            return task(section, dependency_results)
+        except Exception as e:
+            print(f"{section.get('title', section['id'])} 섹션 처리 중 오류 발생: {str(e)}")
+            return None
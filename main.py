@@ -1,10 +1,11 @@
 import os
-import re
 import sys
 import glob
 import json
-import pyperclip
+import time
+import argparse
 import datetime
+import threading
 from typing import List, Dict, Optional
 
 # utils 폴더 및 core 폴더를 import 경로에 추가
@@ -15,200 +16,158 @@ from utils.api_service import APIService
 from utils.data_integration import DataIntegration
 from utils.agent import BusinessPlanAgent
 from utils.agent_system import BusinessPlanAgentSystem  # 새로운 에이전트 시스템 추가
+from utils.agent_runtime import get_agent_runtime
+from utils.llm_backend import (LLMBackend, ClipboardBackend, get_backend, BACKENDS, complete_or_fallback,
+                               stream_or_fallback)
+from utils.prompt_registry import get_prompt_registry
+from utils.streaming import PLACEHOLDER_PATTERN, consume_stream
+from utils.incremental import IncrementalPlan
+from utils.chunking import CONTEXT_TOKEN_BUDGET, SectionContextBuilder
+from utils.llm_cache import CACHE_MODES, with_cache
 
 # 기존 클래스 임포트
 from core.business_plan import BusinessPlan, BusinessPlanService
 from core.document_manager import DocumentManager, merge_docx_files
+from core.section_pipeline import SectionPipeline
+from core.section_config import SectionConfig, get_section_config
+from core.batch_runner import BatchRunner
 
 # 버전 설정
 VERSION = "3.1.0"  # OpenAI Agents SDK 지원 추가
 
+# 섹션 동시 처리 시 콘솔 입력이 섞이지 않도록 보호
+_interaction_lock = threading.RLock()
+
+# Agent SDK 기획서 처리 방식 (대화형 선택 번호 → 모드 이름)
+PROCESSING_MODES = {"1": "raw", "2": "summarize", "3": "analyze"}
+
 def generate_analysis_prompt(section_id: str, business_idea: str) -> str:
-    """분석 프롬프트 생성"""
-    # 프롬프트 파일 경로 결정 - 새 구조와 레거시 구조 모두 지원
-    new_path = os.path.join("data", "prompts", "analysis_prompts", f"{section_id}_analysis.txt")
-    legacy_path = os.path.join("prompts", f"{section_id}_analysis.txt")
-    
-    # 파일 경로 결정 (새 구조 우선, 없으면 레거시 경로)
-    prompt_path = new_path if os.path.exists(new_path) else legacy_path
-    
-    if not os.path.exists(prompt_path):
-        # 통합 분석 프롬프트 사용 (새 구조 또는 레거시 구조)
-        new_fallback_path = os.path.join("data", "prompts", "analysis_prompt.txt")
-        legacy_fallback_path = os.path.join("prompts", "analysis_prompt.txt")
-        prompt_path = new_fallback_path if os.path.exists(new_fallback_path) else legacy_fallback_path
+    """분석 프롬프트 생성 (템플릿은 프롬프트 레지스트리에서 한 번만 읽어 재사용)"""
+    prompt = get_prompt_registry().render_analysis(section_id, business_idea)
     
-    if not os.path.exists(prompt_path):
+    if prompt is None:
         print(f"오류: {section_id} 섹션을 위한 분석 프롬프트 파일을 찾을 수 없습니다.")
         return ""
-    
-    try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            template = f.read()
-            
-        # business_idea 변수 대체
-        prompt = template.replace("{business_idea}", business_idea)
-        
-        # 프롬프트 클립보드에 복사
-        pyperclip.copy(prompt)
-        return prompt
-    except Exception as e:
-        print(f"프롬프트 생성 중 오류 발생: {str(e)}")
-        return ""
+    return prompt
 
 def generate_section_prompt(section_id: str, business_idea: str, analysis_result: str) -> str:
-    """섹션 생성 프롬프트 생성"""
-    # 프롬프트 파일 경로 결정 - 새 구조와 레거시 구조 모두 지원
-    new_path = os.path.join("data", "prompts", "generation_prompts", f"{section_id}_generation.txt")
-    legacy_path = os.path.join("prompts", f"{section_id}_generation.txt")
-    
-    # 파일 경로 결정 (새 구조 우선, 없으면 레거시 경로)
-    prompt_path = new_path if os.path.exists(new_path) else legacy_path
-    
-    if not os.path.exists(prompt_path):
-        # 통합 생성 프롬프트 사용 (새 구조 또는 레거시 구조)
-        new_fallback_path = os.path.join("data", "prompts", "generation_prompt.txt")
-        legacy_fallback_path = os.path.join("prompts", "generation_prompt.txt")
-        prompt_path = new_fallback_path if os.path.exists(new_fallback_path) else legacy_fallback_path
+    """섹션 생성 프롬프트 생성 (템플릿은 프롬프트 레지스트리에서 한 번만 읽어 재사용)"""
+    prompt = get_prompt_registry().render_generation(section_id, business_idea, analysis_result)
     
-    if not os.path.exists(prompt_path):
+    if prompt is None:
         print(f"오류: {section_id} 섹션을 위한 생성 프롬프트 파일을 찾을 수 없습니다.")
         return ""
-    
-    try:
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            template = f.read()
-            
-        # 변수 대체
-        prompt = template.replace("{business_idea}", business_idea).replace("{analysis}", analysis_result)
-        
-        # 프롬프트 클립보드에 복사
-        pyperclip.copy(prompt)
-        return prompt
-    except Exception as e:
-        print(f"프롬프트 생성 중 오류 발생: {str(e)}")
-        return ""
+    return prompt
 
-def load_section_config() -> Dict:
-    """섹션 설정 로드"""
-    # 섹션 설정 파일 경로 결정 - 새 구조와 레거시 구조 모두 지원
-    new_path = os.path.join("data", "prompts", "section_config.json")
-    legacy_path = os.path.join("config", "section_config.json")
-    
-    config_path = new_path if os.path.exists(new_path) else legacy_path
-    
-    if not os.path.exists(config_path):
-        print(f"오류: 섹션 설정 파일을 찾을 수 없습니다: {config_path}")
-        return {"sections": []}
-    
+def section_prompt_texts(section_id: str):
+    """섹션의 (분석, 생성) 프롬프트 템플릿 원문 (증분 처리의 입력 해시에 사용, 없는 템플릿은 빈 문자열)"""
+    registry = get_prompt_registry()
+    templates = (registry.get_section_template(kind, section_id) for kind in ("analysis", "generation"))
+    return tuple(template.text if template else "" for template in templates)
+
+def load_section_config() -> Optional[SectionConfig]:
+    """섹션 설정 로드 (프로세스당 한 번만 읽어 검증된 설정 객체를 공유)"""
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            
-        # 섹션 제목에서 번호 제거 (원본 제목은 original_title로 보존)
-        for section in config.get("sections", []):
-            if "title" in section:
-                # 원본 제목 보존
-                section["original_title"] = section["title"]
-                # 섹션 제목에서 번호 제거
-                section["title"] = re.sub(r'^\d+\.\s+', '', section["title"])
-        
-        return config
+        return get_section_config()
+    except FileNotFoundError as e:
+        print(f"오류: 섹션 설정 파일을 찾을 수 없습니다: {e.filename}")
     except Exception as e:
         print(f"섹션 설정 로드 중 오류 발생: {str(e)}")
-        return {"sections": []}
+    return None
 
 def handle_clipboard_interaction(prompt, prompt_type="분석"):
     """클립보드 복사 및 사용자 상호작용 처리"""
-    pyperclip.copy(prompt)
-    print(f"{prompt_type} 프롬프트가 클립보드에 복사되었습니다.")
-    copy_again = True
-    
-    while copy_again:
-        print("1. Cursor AI에 붙여넣기 후 실행해주세요")
-        print("2. 응답이 생성되면 복사 버튼을 클릭하세요")
-        option = input("3. 복사가 완료되면 Enter를 눌러 계속하세요 (다시 복사하려면 'r' 입력): ").strip().lower()
-        
-        if option == 'r':
-            pyperclip.copy(prompt)
-            print(f"{prompt_type} 프롬프트가 클립보드에 다시 복사되었습니다.")
-        else:
-            copy_again = False
-    
-    # 클립보드에서 결과 가져오기
-    result = pyperclip.paste()
-    if not result or result == prompt:
-        print(f"경고: 클립보드에서 유효한 {prompt_type} 결과를 가져올 수 없습니다.")
-        user_input = input(f"직접 {prompt_type} 결과를 입력하시겠습니까? (y/n): ").strip().lower()
-        if user_input == 'y':
-            print(f"{prompt_type} 결과를 입력하세요. 입력을 마치려면 빈 줄에서 Ctrl+D (Unix) 또는 Ctrl+Z (Windows)를 입력하세요:")
-            lines = []
-            while True:
-                try:
-                    line = input()
-                    lines.append(line)
-                except EOFError:
-                    break
-            result = "\n".join(lines)
-        else:
-            result = f"{prompt_type} 정보 없음"
-    
-    return result
+    return complete_or_fallback(ClipboardBackend(), prompt, prompt_type)
 
-def process_section_with_agent(agent, section_id, section_title, business_idea, analysis_result, can_use_api):
-    """에이전트를 사용한 섹션 처리"""
+def console_confirm(key, question):
+    """콘솔에서 y/n 확인 입력 받기 (key는 확인 항목 식별자로, 콘솔 입력에서는 사용하지 않음)"""
+    with _interaction_lock:
+        return input(question).strip().lower() == 'y'
+
+class FixedConfirm:
+    """
+    비대화형 실행용 확인 응답
+    확인 항목("search": 에이전트 검색, "integrate": 검색 데이터 통합)별로 미리 정한 값을 반환합니다
+    """
+    def __init__(self, search=True, integrate=True):
+        self.answers = {"search": search, "integrate": integrate}
+    
+    def __call__(self, key, question):
+        return self.answers.get(key, False)
+
+def process_section_with_agent(agent, section_id, section_title, business_idea, analysis_result, can_use_api,
+                               confirm=None):
+    """
+    에이전트를 사용한 섹션 처리
+    confirm은 (확인 항목, 질문)을 받아 True/False를 반환하는 함수입니다 (기본값: 콘솔 입력)
+    """
     # 에이전트를 통한 분석 결과 처리
     if "없음" in analysis_result and can_use_api:
-        print("\n🔍 에이전트가 분석 결과를 확인하고 부족한 정보를 검색합니다...")
+        if confirm is None:
+            # 목록 출력과 확인 입력이 다른 섹션 출력과 섞이지 않도록 잠금 유지
+            with _interaction_lock:
+                return _process_section_with_agent(agent, section_id, business_idea, analysis_result, console_confirm)
+        return _process_section_with_agent(agent, section_id, business_idea, analysis_result, confirm)
+    
+    return analysis_result
+
+def _process_section_with_agent(agent, section_id, business_idea, analysis_result, confirm):
+    """에이전트 검색 및 사용자 확인 처리"""
+    print("\n🔍 에이전트가 분석 결과를 확인하고 부족한 정보를 검색합니다...")
+    
+    # 부족한 정보 분석
+    missing_info, business_context = agent.analyze_missing_info(analysis_result, business_idea, section_id)
+    
+    if missing_info:
+        print(f"\n📋 다음 정보가 부족합니다:")
+        for i, item in enumerate(missing_info, 1):
+            print(f"  {i}. {item['item']} - {item['explanation']}")
         
-        # 부족한 정보 분석
-        missing_info, business_context = agent.analyze_missing_info(analysis_result, business_idea, section_id)
+        # 검색 여부 확인
+        search_api = confirm("search", "\n에이전트가 이 정보를 검색하도록 할까요? (y/n): ")
         
-        if missing_info:
-            print(f"\n📋 다음 정보가 부족합니다:")
-            for i, item in enumerate(missing_info, 1):
-                print(f"  {i}. {item['item']} - {item['explanation']}")
+        if search_api:
+            print("\n🔎 에이전트가 관련 정보를 검색 중입니다...")
             
-            # 검색 여부 확인
-            search_api = input("\n에이전트가 이 정보를 검색하도록 할까요? (y/n): ").strip().lower() == 'y'
+            # 검색 수행
+            search_results = agent.search_and_integrate(missing_info, business_context, section_id)
             
-            if search_api:
-                print("\n🔎 에이전트가 관련 정보를 검색 중입니다...")
+            if search_results["success"]:
+                print(f"✅ {search_results['message']}")
                 
-                # 검색 수행
-                search_results = agent.search_and_integrate(missing_info, business_context, section_id)
+                # 결과 평가
+                evaluation = agent.evaluate_search_results(search_results, missing_info, section_id)
                 
-                if search_results["success"]:
-                    print(f"✅ {search_results['message']}")
-                    
-                    # 결과 평가
-                    evaluation = agent.evaluate_search_results(search_results, missing_info, section_id)
-                    
-                    # 통합 추천
-                    recommendation = agent.create_integration_recommendation(search_results, evaluation, section_id)
-                    print("\n" + recommendation)
-                    
-                    # 통합 여부 확인
-                    use_data = input("\n이 데이터를 분석 결과에 통합할까요? (y/n): ").strip().lower() == 'y'
-                    
-                    if use_data:
-                        # 데이터 통합
-                        additional_info = f"\n\n### 에이전트가 찾은 추가 정보:\n{recommendation}"
-                        enhanced_analysis = analysis_result + additional_info
-                        print("✅ 에이전트가 검색한 데이터가 분석 결과에 추가되었습니다.")
-                        return enhanced_analysis
-                else:
-                    print(f"❌ {search_results['message']}")
+                # 통합 추천
+                recommendation = agent.create_integration_recommendation(search_results, evaluation, section_id)
+                print("\n" + recommendation)
+                
+                # 통합 여부 확인
+                use_data = confirm("integrate", "\n이 데이터를 분석 결과에 통합할까요? (y/n): ")
+                
+                if use_data:
+                    # 데이터 통합
+                    additional_info = f"\n\n### 에이전트가 찾은 추가 정보:\n{recommendation}"
+                    enhanced_analysis = analysis_result + additional_info
+                    print("✅ 에이전트가 검색한 데이터가 분석 결과에 추가되었습니다.")
+                    return enhanced_analysis
+            else:
+                print(f"❌ {search_results['message']}")
     
     return analysis_result
 
-def integrate_api_data_into_generation(agent, section_id, generation_result, business_idea, can_use_api):
-    """생성 결과에 API 데이터 통합"""
+def integrate_api_data_into_generation(agent, section_id, generation_result, business_idea, can_use_api,
+                                       missing_info_patterns=None):
+    """
+    생성 결과에 API 데이터 통합
+    missing_info_patterns를 지정하면 (스트리밍 중 이미 찾은 표시) 생성 결과를 다시 검색하지 않습니다
+    """
     if can_use_api and "[필요 정보:" in generation_result:
         print("\n🔍 에이전트가 생성된 내용에서 부족한 정보를 검색합니다...")
         
         # 부족한 정보 분석 - 생성 결과에서 "[필요 정보:" 패턴 추출
-        missing_info_patterns = re.findall(r'\[필요 정보:[^\]]+\]', generation_result)
+        if missing_info_patterns is None:
+            missing_info_patterns = PLACEHOLDER_PATTERN.findall(generation_result)
         
         if missing_info_patterns:
             # 가상 분석 결과 생성
@@ -257,8 +216,93 @@ def integrate_api_data_into_generation(agent, section_id, generation_result, bus
     
     return generation_result
 
-def process_single_proposal(file_path, output_dir, selected_sections, use_agent_sdk=False):
-    """단일 기획서 처리"""
+def with_dependency_results(context, dependency_results, section_config=None):
+    """
+    선행 섹션(depends_on)의 생성 결과를 섹션 입력 뒤에 덧붙임
+    분석/생성 프롬프트의 {business_idea}에 함께 들어가므로 의존 섹션이 앞 섹션 내용을 이어받아 작성됩니다
+    """
+    completed = [(dep, result.strip()) for dep, result in dependency_results.items() if result and result.strip()]
+    if not completed:
+        return context
+    
+    parts = [context, "[먼저 작성된 관련 섹션]"]
+    for dep, result in completed:
+        upstream = section_config.get(dep) if section_config else None
+        parts.append(f"## {upstream.title if upstream else dep}\n{result}")
+    return "\n\n".join(parts)
+
+def process_section(agent, section, business_idea, can_use_api, output_dir, backend=None, confirm=None,
+                    business_plan=None):
+    """
+    단일 섹션 처리 (분석 → 에이전트 검색 → 생성 → 데이터 통합)
+    business_plan을 지정하면 생성 결과를 받는 대로 해당 섹션에 이어 붙입니다
+    """
+    backend = backend or ClipboardBackend()
+    section_id = section.id
+    section_title = section.title
+    
+    print(f"\n===== {section_title} 섹션 처리 중 =====")
+    
+    # 1단계: 분석 프롬프트 생성 및 결과 가져오기
+    print(f"\n1단계: 기획서 분석 - {section_title}")
+    analysis = generate_analysis_prompt(section_id, business_idea)
+    
+    if not analysis:
+        print(f"{section_title} 섹션을 위한 분석 프롬프트를 생성할 수 없습니다.")
+        return None
+    
+    # LLM 백엔드로 분석 결과 가져오기
+    analysis_result = complete_or_fallback(backend, analysis, "분석")
+    
+    # 에이전트를 통한 분석 결과 처리
+    analysis_result = process_section_with_agent(agent, section_id, section_title, business_idea, analysis_result,
+                                                 can_use_api, confirm)
+    
+    # 2단계: 사업계획서 섹션 생성 프롬프트 생성
+    print(f"\n2단계: 섹션 생성 - {section_title}")
+    generation_prompt = generate_section_prompt(section_id, business_idea, analysis_result)
+    
+    if not generation_prompt:
+        print(f"{section_title} 섹션을 위한 생성 프롬프트를 생성할 수 없습니다.")
+        return None
+    
+    # LLM 백엔드로 생성 결과를 스트리밍하면서 필요 정보 표시를 바로 검출
+    chunks = []
+    if business_plan is not None:
+        business_plan.add_section(section_id, section_title, "")
+        on_chunk = lambda chunk: business_plan.append_section_content(section_id, chunk)
+    else:
+        on_chunk = chunks.append
+    
+    _, missing_info_patterns = consume_stream(stream_or_fallback(backend, generation_prompt, "생성"), section_title,
+                                              on_chunk)
+    generation_result = business_plan.get_section_content(section_id) if business_plan is not None else "".join(chunks)
+    
+    # 생성 결과에 API 데이터 통합
+    generation_result = integrate_api_data_into_generation(agent, section_id, generation_result, business_idea, can_use_api,
+                                                           missing_info_patterns)
+    
+    # 섹션 결과 저장 (디버깅용)
+    section_output_path = os.path.join(output_dir, f"{section_id}_section_result.txt")
+    with open(section_output_path, "w", encoding="utf-8") as f:
+        f.write(generation_result)
+    
+    print(f"✅ {section_title} 섹션이 완료되었습니다.")
+    return generation_result
+
+def process_single_proposal(file_path, output_dir, selected_sections, use_agent_sdk=False, max_workers=1,
+                            processing_mode=None, create_pdf=None, backend=None, confirm=None, orchestration="fanout",
+                            incremental=False, cache="off", context_tokens=CONTEXT_TOKEN_BUDGET):
+    """
+    단일 기획서 처리
+    max_workers가 1보다 크면 의존성이 없는 섹션들을 동시에 처리합니다
+    processing_mode, create_pdf를 지정하면 Agent SDK 처리 시 해당 항목을 묻지 않습니다
+    orchestration은 Agent SDK 분석 모드의 처리 방식입니다 ("fanout" 또는 "coordinator")
+    incremental이면 이전 실행 이후 입력이 바뀐 섹션만 다시 처리합니다 (output_dir/.incremental/에 기록)
+    cache는 LLM 결과 캐시 사용 방식입니다 ("off", "read", "readwrite")
+    context_tokens는 섹션 프롬프트에 넣을 기획서 문맥의 토큰 예산입니다 (0이면 항상 전체 기획서)
+    backend는 분석/생성 프롬프트를 처리할 LLM 백엔드입니다 (기본값: 클립보드)
+    """
     file_name = os.path.basename(file_path)
     file_base_name = os.path.splitext(file_name)[0]
     
@@ -270,7 +314,11 @@ def process_single_proposal(file_path, output_dir, selected_sections, use_agent_
     
     # Agent SDK 기반 처리
     if use_agent_sdk:
-        return process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, output_dir, selected_sections)
+        return process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, output_dir, selected_sections,
+                                      processing_mode, create_pdf, orchestration, cache)
+    
+    # 같은 프롬프트의 이전 LLM 결과 재사용
+    backend = with_cache(backend or ClipboardBackend(), cache)
     
     # 기존 에이전트 사용
     agent = BusinessPlanAgent()
@@ -286,12 +334,9 @@ def process_single_proposal(file_path, output_dir, selected_sections, use_agent_
     # 사업계획서 객체 생성
     business_plan = bp_service.create_plan(f"{file_base_name}의 사업계획서", business_idea)
     
-    # 섹션 설정 로드
+    # 섹션 설정 로드 후 선택된 섹션 목록 또는 모든 섹션 (설정 순서 유지)
     section_config = load_section_config()
-    sections = section_config.get("sections", [])
-    
-    # 선택된 섹션 목록 또는 모든 섹션
-    sections_to_process = [s for s in sections if s["id"] in selected_sections or not selected_sections]
+    sections_to_process = section_config.select(selected_sections) if section_config else []
     
     if not sections_to_process:
         print("처리할 섹션이 없습니다.")
@@ -307,62 +352,66 @@ def process_single_proposal(file_path, output_dir, selected_sections, use_agent_
         print("\n⚠️ 경고: API 키가 설정되지 않아 에이전트의 외부 데이터 검색 기능이 제한됩니다.")
         print("API 기능을 사용하려면 config/api_keys.json 파일에 API 키를 설정하세요.")
     
-    # 선택된 모든 섹션 처리
+    # 증분 처리: 섹션별 입력 해시를 이전 실행 기록과 비교
+    incremental_plan = None
+    if incremental:
+        incremental_plan = IncrementalPlan(
+            business_idea, sections_to_process,
+            os.path.join(output_dir, ".incremental", f"{file_base_name}.json"),
+            backend_id=backend.backend_id,
+            extra_key=f"api={can_use_api}",
+            prompt_texts=section_prompt_texts,
+            max_tokens=context_tokens
+        )
+        changed = set(incremental_plan.changed_sections())
+        print(f"\n♻️ 증분 처리: {len(sections_to_process) - len(changed)}개 섹션 재사용, {len(changed)}개 섹션 다시 처리")
+    else:
+        # 기획서가 토큰 예산을 넘으면 섹션별로 관련 문단만 골라 프롬프트에 사용
+        section_contexts = SectionContextBuilder(sections_to_process, context_tokens).build(business_idea)
+    
+    # 섹션 처리 파이프라인 실행 (독립적인 섹션은 동시에 처리하고, 의존 섹션에는 선행 섹션 결과를 함께 전달)
+    def section_task(section, dependency_results):
+        if incremental_plan is None:
+            context = with_dependency_results(section_contexts[section.id], dependency_results, section_config)
+            return process_section(agent, section, context, can_use_api, output_dir, backend, confirm, business_plan)
+        
+        incremental_plan.include_dependencies(section.id, dependency_results)
+        cached = incremental_plan.cached_result(section.id)
+        if cached is not None:
+            print(f"♻️ {section.title} 섹션은 입력이 바뀌지 않아 이전 결과를 사용합니다.")
+            return cached
+        context = with_dependency_results(incremental_plan.section_input(section.id), dependency_results,
+                                          section_config)
+        result = process_section(agent, section, context, can_use_api, output_dir, backend, confirm, business_plan)
+        if result is not None:
+            incremental_plan.store(section.id, result)
+        return result
+
+    pipeline = SectionPipeline(max_workers=max_workers)
+    section_results = pipeline.run(sections_to_process, section_task)
+    
+    # 완료 순서와 관계없이 섹션 설정 순서대로 사업계획서에 추가
     for section in sections_to_process:
-        section_id = section["id"]
-        section_title = section["title"]
-        
-        print(f"\n===== {section_title} 섹션 처리 중 =====")
-        
-        # 1단계: 분석 프롬프트 생성 및 결과 가져오기
-        print(f"\n1단계: 기획서 분석 - {section_title}")
-        analysis = generate_analysis_prompt(section_id, business_idea)
-        
-        if not analysis:
-            print(f"{section_title} 섹션을 위한 분석 프롬프트를 생성할 수 없습니다.")
-            continue
-        
-        # 클립보드 상호작용 처리
-        analysis_result = handle_clipboard_interaction(analysis, "분석")
-        
-        # 에이전트를 통한 분석 결과 처리
-        analysis_result = process_section_with_agent(agent, section_id, section_title, business_idea, analysis_result, can_use_api)
-        
-        # 2단계: 사업계획서 섹션 생성 프롬프트 생성
-        print(f"\n2단계: 섹션 생성 - {section_title}")
-        generation_prompt = generate_section_prompt(section_id, business_idea, analysis_result)
-        
-        if not generation_prompt:
-            print(f"{section_title} 섹션을 위한 생성 프롬프트를 생성할 수 없습니다.")
-            continue
-        
-        # 클립보드 상호작용 처리
-        generation_result = handle_clipboard_interaction(generation_prompt, "생성")
-        
-        # 생성 결과에 API 데이터 통합
-        generation_result = integrate_api_data_into_generation(agent, section_id, generation_result, business_idea, can_use_api)
-        
-        # 사업계획서에 섹션 추가
-        business_plan.add_section(section_id, section_title, generation_result)
-        
-        # 섹션 결과 저장 (디버깅용)
-        section_output_path = os.path.join(output_dir, f"{section_id}_section_result.txt")
-        with open(section_output_path, "w", encoding="utf-8") as f:
-            f.write(generation_result)
-        
-        print(f"✅ {section_title} 섹션이 완료되었습니다.")
+        generation_result = section_results.get(section.id)
+        # 실패한 섹션은 스트리밍 중 받은 일부 내용을 비움
+        business_plan.add_section(section.id, section.title, generation_result or "")
     
-    # Word 문서 생성
-    output_file = os.path.join(output_dir, f"{file_base_name}_business_plan.docx")
-    doc_manager.create_word_document(business_plan, output_file)
+    if incremental_plan is not None:
+        incremental_plan.save()
+    
+    # Word 문서 생성 (PDF도 만들면 섹션을 한 번만 해석해 두 형식을 동시에 저장, 실제 저장 경로 사용)
+    formats = ("docx", "pdf") if create_pdf else ("docx",)
+    output_file = doc_manager.export_documents(business_plan, f"{file_base_name}_business_plan", formats).get("docx")
     print(f"\n📄 사업계획서 Word 문서가 생성되었습니다: {output_file}")
     
     return output_file
 
-def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, output_dir, selected_sections):
+def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, output_dir, selected_sections,
+                           processing_mode=None, create_pdf=None, orchestration="fanout", cache="off"):
     """Agent SDK를 사용한 처리"""
-    # OpenAI Agents SDK 기반 에이전트 시스템 사용
-    agent_system = BusinessPlanAgentSystem()
+    # OpenAI Agents SDK 기반 에이전트 시스템 사용 (프로세스에서 한 번만 생성하여 여러 파일 처리에 공유)
+    runtime = get_agent_runtime()
+    agent_system = runtime.system
     
     # 기획서 읽기
     business_idea = bp_service.load_business_idea(file_path)
@@ -374,21 +423,16 @@ def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, o
     print(f"\n🚀 OpenAI Agents SDK를 사용한 에이전트 시스템이 활성화되었습니다.")
     
     # 제안서 처리 방식 선택
-    processing_mode = input("""
-    기획서 처리 방식을 선택하세요:
-    1. 원본 내용 그대로 사용
-    2. Agent를 사용하여 요약 (핵심 내용 유지)
-    3. 섹션별 분석 및 개선 (기존 방식)
-    옵션을 선택하세요 (1, 2 또는 3, 기본값: 3): """).strip()
-
-    if processing_mode == "1":
-        mode = "raw"
+    if processing_mode is None:
+        processing_mode = select_processing_mode()
+    
+    mode = PROCESSING_MODES.get(processing_mode, processing_mode)
+    if mode == "raw":
         print("선택됨: 원본 내용 그대로 사용")
-    elif processing_mode == "2":
-        mode = "summarize"
+    elif mode == "summarize":
         print("선택됨: Agent를 사용하여 요약")
     else:
-        if not processing_mode or processing_mode != "3":
+        if mode != "analyze":
             print("기본값 '3. 섹션별 분석 및 개선'이 선택되었습니다.")
         else:
             print("선택됨: 섹션별 분석 및 개선")
@@ -397,7 +441,7 @@ def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, o
     # 에이전트 시스템을 통한 처리
     print("\n🔄 에이전트 시스템이 비즈니스 플랜을 처리하고 있습니다. 이 작업은 몇 분 정도 소요될 수 있습니다...")
     try:
-        result = agent_system.run_with_mode(business_idea, mode, selected_sections)
+        result = runtime.run(business_idea, mode, selected_sections, orchestration, cache)
     except Exception as e:
         print(f"\n❌ 에이전트 시스템 처리 중 오류가 발생했습니다: {str(e)}")
         return None
@@ -406,9 +450,13 @@ def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, o
         # 사업계획서 객체 생성 및 섹션 추가
         business_plan = BusinessPlan(f"{file_base_name}의 사업계획서")
         
-        for section_name, content in result["sections"].items():
-            section_id = section_name.lower().replace(' ', '_')
-            business_plan.add_section(section_id, content)
+        # 동시 실행 방식은 섹션 ID, 조율 에이전트 방식은 섹션 제목을 키로 반환
+        for section_key, content in result["sections"].items():
+            section = agent_system.section_config.get(section_key)
+            if section:
+                business_plan.add_section(section.id, section.title, content)
+            else:
+                business_plan.add_section(section_key.lower().replace(' ', '_'), section_key, content)
         
         # 문서 생성
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -419,9 +467,10 @@ def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, o
             print(f"\n✅ 사업계획서 문서가 생성되었습니다: {docx_path}")
             
             # PDF 변환 확인
-            create_pdf = input("\nPDF로 변환하시겠습니까? (y/n): ").strip().lower() == 'y'
+            if create_pdf is None:
+                create_pdf = input("\nPDF로 변환하시겠습니까? (y/n): ").strip().lower() == 'y'
             if create_pdf:
-                pdf_path = doc_manager.create_pdf_from_docx(docx_path)
+                pdf_path = doc_manager.create_pdf_document(business_plan, output_filename.replace(".docx", ".pdf"))
                 if pdf_path:
                     print(f"✅ PDF가 생성되었습니다: {pdf_path}")
         
@@ -430,11 +479,343 @@ def process_with_agent_sdk(file_path, file_base_name, bp_service, doc_manager, o
         print("\n❌ 에이전트 시스템 처리 중 오류가 발생했습니다.")
         return None
 
+def run_batch(files_to_process, output_dir, max_workers=None, process_fn=None, file_kwargs=None, **process_kwargs):
+    """
+    여러 기획서를 프로세스 풀에서 병렬 처리 (비대화형 처리 전용)
+    완료되는 순서대로 결과를 출력하며, 중단 후 다시 실행하면 완료된 파일은 건너뜁니다
+    process_fn을 지정하지 않으면 process_single_proposal(file_path, output_dir=..., **process_kwargs)를 호출합니다
+    file_kwargs(file_path)는 파일별로 추가할 process_fn 인자를 반환합니다 (BatchRunner 참고)
+    """
+    if process_fn is None:
+        process_fn = process_single_proposal
+        process_kwargs["output_dir"] = output_dir
+    
+    runner = BatchRunner(process_fn, output_dir, max_workers=max_workers, file_kwargs=file_kwargs)
+    completed = {}
+    failures = []
+    
+    for result in runner.run(files_to_process, **process_kwargs):
+        file_name = os.path.basename(result["file_path"])
+        if result["skipped"]:
+            print(f"⏭️  {file_name}: 이전 실행에서 완료됨 - {result['docx_path']}")
+            completed[result["file_path"]] = result["docx_path"]
+        elif result["error"]:
+            print(f"❌ {file_name}: 실패 ({result['elapsed']:.1f}초) - {result['error']}")
+            failures.append(result["file_path"])
+        else:
+            print(f"✅ {file_name}: 완료 ({result['elapsed']:.1f}초) - {result['docx_path']}")
+            completed[result["file_path"]] = result["docx_path"]
+    
+    if failures:
+        print(f"\n⚠️ {len(failures)}개 파일 처리에 실패했습니다. 다시 실행하면 실패한 파일만 처리합니다.")
+    
+    # 병합 순서가 완료 순서에 따라 달라지지 않도록 입력 파일 순서로 반환
+    return [completed[file_path] for file_path in files_to_process if file_path in completed]
+
+def find_proposal_files(directory, file_pattern="*.txt,*.md"):
+    """디렉토리에서 패턴(쉼표로 여러 개 지정 가능)과 일치하는 기획서 파일 목록 반환"""
+    files_to_process = []
+    
+    # 여러 패턴이 쉼표로 구분된 경우도 처리
+    patterns = [p.strip() for p in file_pattern.split(',') if p.strip()]
+    for pattern in patterns:
+        files_to_process.extend(glob.glob(os.path.join(directory, pattern)))
+    
+    # 중복 제거 및 정렬
+    return sorted(set(files_to_process))
+
+def merge_plan_documents(docx_paths, output_dir, create_pdf=False):
+    """여러 사업계획서 문서를 하나로 병합 (선택적으로 PDF 생성)"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    merged_path = os.path.join(output_dir, f"merged_business_plans_{timestamp}.docx")
+    
+    merge_docx_files(docx_paths, merged_path)
+    print(f"\n✅ 병합된 사업계획서가 생성되었습니다: {merged_path}")
+    
+    if create_pdf:
+        pdf_path = DocumentManager(output_dir).create_pdf_from_docx(merged_path)
+        if pdf_path:
+            print(f"✅ PDF가 생성되었습니다: {pdf_path}")
+    return merged_path
+
+class PlanJob:
+    """
+    비대화형(헤드리스) 사업계획서 작성 작업
+    
+    input()이나 클립보드 없이 기획서 한 개를 끝까지 처리합니다.
+    
+    예시:
+        job = PlanJob("data/proposals/business_idea.txt", backend="openai",
+                      backend_options={"model": "gpt-4o-mini"}, sections=["problem", "market"])
+        result = job.run()
+    """
+    # 작업 명세(JSON)에서 허용하는 항목
+    FIELDS = (
+        "file_path", "output_dir", "sections", "backend", "backend_options", "use_agent_sdk",
+        "processing_mode", "orchestration", "section_workers", "search_api", "integrate_data", "create_pdf",
+        "incremental", "cache", "context_tokens"
+    )
+    
+    def __init__(self, file_path, output_dir="output", sections=None, backend="openai", backend_options=None,
+                 use_agent_sdk=False, processing_mode="analyze", section_workers=1, search_api=True,
+                 integrate_data=True, create_pdf=False, orchestration="fanout", incremental=False, cache="off",
+                 context_tokens=CONTEXT_TOKEN_BUDGET):
+        self.file_path = file_path
+        self.output_dir = output_dir
+        self.sections = list(sections or [])
+        self.backend = backend
+        self.backend_options = dict(backend_options or {})
+        self.use_agent_sdk = use_agent_sdk
+        self.processing_mode = processing_mode
+        self.orchestration = orchestration
+        self.section_workers = section_workers
+        self.search_api = search_api
+        self.integrate_data = integrate_data
+        self.create_pdf = create_pdf
+        self.incremental = incremental
+        self.cache = cache
+        self.context_tokens = context_tokens
+        
+        if backend not in BACKENDS and not isinstance(backend, LLMBackend):
+            raise ValueError(f"알 수 없는 LLM 백엔드입니다: {backend} (사용 가능: {', '.join(BACKENDS)})")
+        if PROCESSING_MODES.get(processing_mode, processing_mode) not in PROCESSING_MODES.values():
+            raise ValueError(f"알 수 없는 처리 방식입니다: {processing_mode}")
+        if orchestration not in BusinessPlanAgentSystem.ORCHESTRATIONS:
+            raise ValueError(f"알 수 없는 에이전트 실행 방식입니다: {orchestration}")
+        if cache not in CACHE_MODES:
+            raise ValueError(f"알 수 없는 캐시 방식입니다: {cache} (사용 가능: {', '.join(CACHE_MODES)})")
+    
+    @classmethod
+    def from_dict(cls, spec, defaults=None):
+        """사전 형태의 작업 명세로부터 작업 생성 (defaults는 공통 기본값)"""
+        merged = dict(defaults or {})
+        merged.update(spec)
+        unknown = set(merged) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"알 수 없는 작업 항목입니다: {', '.join(sorted(unknown))}")
+        if "file_path" not in merged:
+            raise ValueError("작업 명세에 file_path가 필요합니다.")
+        return cls(**merged)
+    
+    def get_backend(self):
+        """작업에 사용할 LLM 백엔드 인스턴스 반환"""
+        if isinstance(self.backend, LLMBackend):
+            return self.backend
+        return get_backend(self.backend, self.backend_options)
+    
+    def run(self):
+        """
+        작업 실행
+        
+        Returns:
+            {"file_path", "docx_path", "elapsed", "error"} 형태의 결과
+        """
+        start_time = time.time()
+        try:
+            docx_path = process_single_proposal(
+                self.file_path,
+                self.output_dir,
+                self.sections,
+                use_agent_sdk=self.use_agent_sdk,
+                max_workers=self.section_workers,
+                processing_mode=self.processing_mode,
+                orchestration=self.orchestration,
+                incremental=self.incremental,
+                cache=self.cache,
+                context_tokens=self.context_tokens,
+                create_pdf=self.create_pdf,
+                backend=self.get_backend(),
+                confirm=FixedConfirm(self.search_api, self.integrate_data)
+            )
+            error = None if docx_path else "문서가 생성되지 않았습니다."
+        except Exception as e:
+            docx_path = None
+            error = f"{type(e).__name__}: {str(e)}"
+        
+        return {
+            "file_path": self.file_path,
+            "docx_path": docx_path,
+            "elapsed": round(time.time() - start_time, 3),
+            "error": error
+        }
+
+def load_job_file(job_path):
+    """
+    JSON 작업 명세 파일 로드
+    
+    형식:
+        {
+            "output_dir": "output", "workers": 4, "merge": false,
+            "defaults": {"backend": "openai", "backend_options": {"model": "gpt-4o-mini"}},
+            "jobs": [{"file_path": "data/proposals/business_idea.txt", "sections": ["problem"]}]
+        }
+    jobs 대신 "directory"와 "pattern"으로 처리할 파일을 지정하거나,
+    최상위에 file_path를 두어 단일 작업을 지정할 수도 있습니다.
+    
+    Returns:
+        (작업 목록, 일괄 처리 옵션 사전)
+    """
+    with open(job_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    
+    if "file_path" in spec:
+        spec = {"jobs": [spec]}
+    
+    defaults = dict(spec.get("defaults", {}))
+    if "output_dir" in spec:
+        defaults.setdefault("output_dir", spec["output_dir"])
+    
+    job_specs = list(spec.get("jobs", []))
+    if spec.get("directory"):
+        job_specs.extend({"file_path": path} for path in find_proposal_files(spec["directory"], spec.get("pattern", "*.txt,*.md")))
+    
+    jobs = [PlanJob.from_dict(job_spec, defaults) for job_spec in job_specs]
+    options = {
+        "workers": spec.get("workers", 1),
+        "merge": spec.get("merge", False),
+        "merge_pdf": spec.get("merge_pdf", False)
+    }
+    return jobs, options
+
+def _run_job_for_file(file_path, job):
+    """일괄 처리 작업자에서 파일에 해당하는 작업 실행"""
+    result = job.run()
+    if result["error"]:
+        raise RuntimeError(result["error"])
+    return result["docx_path"]
+
+def run_jobs(jobs, workers=1, merge=False, merge_pdf=False):
+    """
+    여러 작업을 실행하고 결과 목록을 반환
+    workers가 1보다 크면 프로세스 풀에서 병렬 처리합니다 (대화형 백엔드는 항상 순차 처리)
+    """
+    interactive = any(job.get_backend().interactive for job in jobs)
+    if interactive and workers > 1:
+        print("⚠️ 대화형 백엔드(clipboard)는 병렬 처리할 수 없어 순차 처리합니다.")
+        workers = 1
+    
+    if workers > 1 and len(jobs) > 1:
+        output_dir = jobs[0].output_dir
+        jobs_by_file = {job.file_path: job for job in jobs}
+        docx_paths = run_batch(
+            list(jobs_by_file), output_dir, max_workers=workers,
+            process_fn=_run_job_for_file, file_kwargs=lambda file_path: {"job": jobs_by_file[file_path]}
+        )
+    else:
+        docx_paths = []
+        for job in jobs:
+            result = job.run()
+            if result["error"]:
+                print(f"❌ {os.path.basename(job.file_path)}: 실패 ({result['elapsed']:.1f}초) - {result['error']}")
+            else:
+                print(f"✅ {os.path.basename(job.file_path)}: 완료 ({result['elapsed']:.1f}초) - {result['docx_path']}")
+                docx_paths.append(result["docx_path"])
+    
+    if merge and len(docx_paths) > 1:
+        merge_plan_documents(docx_paths, jobs[0].output_dir, merge_pdf)
+    
+    return docx_paths
+
+def parse_args(argv=None):
+    """명령행 인자 해석"""
+    parser = argparse.ArgumentParser(
+        description="비즈니스 플랜 작성 도구 (인자 없이 실행하면 대화형 모드)"
+    )
+    source = parser.add_argument_group("입력")
+    source.add_argument("--job", help="JSON 작업 명세 파일 경로")
+    source.add_argument("--file", action="append", default=[], help="처리할 기획서 파일 (여러 번 지정 가능)")
+    source.add_argument("--dir", help="기획서 파일이 있는 디렉토리")
+    source.add_argument("--pattern", default="*.txt,*.md", help="디렉토리에서 찾을 파일 패턴 (기본값: *.txt,*.md)")
+    
+    options = parser.add_argument_group("처리 옵션")
+    options.add_argument("--sections", default="", help="처리할 섹션 ID (쉼표로 구분, 기본값: 모든 섹션)")
+    options.add_argument("--output-dir", default="output", help="결과 저장 디렉토리 (기본값: output)")
+    options.add_argument("--backend", default="openai", choices=sorted(BACKENDS), help="LLM 백엔드 (기본값: openai)")
+    options.add_argument("--model", help="openai 백엔드 모델 이름")
+    options.add_argument("--command", help="command 백엔드에서 실행할 명령")
+    options.add_argument("--agent-sdk", action="store_true", help="OpenAI Agents SDK 기반 에이전트 시스템 사용")
+    options.add_argument("--mode", default="analyze", choices=sorted(PROCESSING_MODES.values()),
+                         help="Agent SDK 기획서 처리 방식 (기본값: analyze)")
+    options.add_argument("--orchestration", default="fanout", choices=BusinessPlanAgentSystem.ORCHESTRATIONS,
+                         help="Agent SDK 분석 모드 실행 방식: 섹션 에이전트 동시 실행(fanout) 또는 조율 에이전트(coordinator) (기본값: fanout)")
+    options.add_argument("--section-workers", type=int, default=1, help="동시에 처리할 섹션 수 (기본값: 1)")
+    options.add_argument("--workers", type=int, default=1, help="동시에 처리할 기획서 파일 수 (기본값: 1)")
+    options.add_argument("--no-search", action="store_true", help="에이전트의 외부 데이터 검색 사용 안 함")
+    options.add_argument("--no-integrate", action="store_true", help="검색한 데이터를 분석 결과에 통합하지 않음")
+    options.add_argument("--pdf", action="store_true", help="PDF 문서도 생성")
+    options.add_argument("--incremental", action="store_true",
+                         help="이전 실행 이후 기획서 내용이나 프롬프트가 바뀐 섹션만 다시 처리")
+    options.add_argument("--cache", default="off", choices=CACHE_MODES,
+                         help="LLM 결과 캐시: off(사용 안 함), read(조회만), readwrite(조회 및 저장) (기본값: off)")
+    options.add_argument("--context-tokens", type=int, default=CONTEXT_TOKEN_BUDGET,
+                         help=f"섹션 프롬프트에 넣을 기획서 문맥의 토큰 예산, 0이면 제한 없음 (기본값: {CONTEXT_TOKEN_BUDGET})")
+    options.add_argument("--merge", action="store_true", help="여러 사업계획서를 하나의 문서로 병합")
+    return parser.parse_args(argv)
+
+def run_cli(argv=None):
+    """비대화형 명령행 실행 (종료 코드 반환)"""
+    args = parse_args(argv)
+    
+    if args.job:
+        jobs, batch_options = load_job_file(args.job)
+    else:
+        files = list(args.file)
+        if args.dir:
+            files.extend(find_proposal_files(args.dir, args.pattern))
+        if not files:
+            print("오류: --job, --file 또는 --dir 중 하나를 지정하세요.")
+            return 2
+        
+        backend_options = {}
+        if args.model:
+            backend_options["model"] = args.model
+        if args.command:
+            backend_options["command"] = args.command
+        
+        defaults = {
+            "output_dir": args.output_dir,
+            "sections": [s.strip() for s in args.sections.split(",") if s.strip()],
+            "backend": args.backend,
+            "backend_options": backend_options,
+            "use_agent_sdk": args.agent_sdk,
+            "processing_mode": args.mode,
+            "orchestration": args.orchestration,
+            "section_workers": args.section_workers,
+            "search_api": not args.no_search,
+            "integrate_data": not args.no_integrate,
+            "create_pdf": args.pdf,
+            "incremental": args.incremental,
+            "cache": args.cache,
+            "context_tokens": args.context_tokens
+        }
+        jobs = [PlanJob.from_dict({"file_path": path}, defaults) for path in dict.fromkeys(files)]
+        batch_options = {"workers": args.workers, "merge": args.merge, "merge_pdf": args.pdf}
+    
+    if not jobs:
+        print("오류: 처리할 작업이 없습니다.")
+        return 2
+    
+    for job in jobs:
+        os.makedirs(job.output_dir, exist_ok=True)
+    
+    docx_paths = run_jobs(jobs, **batch_options)
+    print(f"\n✅ 총 {len(docx_paths)}/{len(jobs)}개의 사업계획서 작성이 완료되었습니다.")
+    return 0 if len(docx_paths) == len(jobs) else 1
+
+def select_processing_mode():
+    """Agent SDK 기획서 처리 방식 선택"""
+    return input("""
+    기획서 처리 방식을 선택하세요:
+    1. 원본 내용 그대로 사용
+    2. Agent를 사용하여 요약 (핵심 내용 유지)
+    3. 섹션별 분석 및 개선 (기존 방식)
+    옵션을 선택하세요 (1, 2 또는 3, 기본값: 3): """).strip()
+
 def select_sections():
     """처리할 섹션 선택"""
     # 섹션 설정 로드
     section_config = load_section_config()
-    sections = section_config.get("sections", [])
+    sections = list(section_config) if section_config else []
     
     if not sections:
         print("오류: 섹션 설정을 로드할 수 없습니다.")
@@ -442,8 +823,8 @@ def select_sections():
     
     print("\n처리할 섹션을 선택하세요:")
     for i, section in enumerate(sections, 1):
-        # load_section_config에서 이미 번호가 제거된 제목 사용
-        print(f"{i}. {section['title']} ({section['id']})")
+        # 섹션 설정의 title은 이미 번호가 제거된 제목
+        print(f"{i}. {section.title} ({section.id})")
     print(f"{len(sections) + 1}. 모든 섹션")
     
     try:
@@ -451,23 +832,23 @@ def select_sections():
         
         if not selected or selected == "0" or selected == str(len(sections) + 1):
             print("기본값: 모든 섹션을 처리합니다.")
-            return [section["id"] for section in sections]
+            return section_config.ids
         
         selected_indices = [int(idx.strip()) - 1 for idx in selected.split(",") if idx.strip().isdigit()]
         valid_indices = [idx for idx in selected_indices if 0 <= idx < len(sections)]
         
         if not valid_indices:
             print("유효한 섹션을 선택하지 않았습니다. 기본값: 모든 섹션을 처리합니다.")
-            return [section["id"] for section in sections]
+            return section_config.ids
         
-        selected_sections = [sections[idx]["id"] for idx in valid_indices]
+        selected_sections = [sections[idx].id for idx in valid_indices]
         print(f"선택한 섹션: {', '.join(selected_sections)}")
         return selected_sections
     
     except Exception as e:
         print(f"섹션 선택 중 오류 발생: {str(e)}")
         print("기본값: 모든 섹션을 처리합니다.")
-        return [section["id"] for section in sections]
+        return section_config.ids
 
 def main():
     """메인 함수"""
@@ -549,20 +930,7 @@ def main():
             print("기본값 '*.txt,*.md'가 선택되었습니다.")
         
         # 패턴에 따라 파일 찾기
-        import glob
-        files_to_process = []
-        
-        if ',' in file_pattern:
-            # 여러 패턴이 쉼표로 구분된 경우
-            patterns = [p.strip() for p in file_pattern.split(',')]
-            for pattern in patterns:
-                files_to_process.extend(glob.glob(os.path.join(directory, pattern)))
-        else:
-            # 단일 패턴
-            files_to_process = glob.glob(os.path.join(directory, file_pattern))
-        
-        # 중복 제거 및 정렬
-        files_to_process = sorted(list(set(files_to_process)))
+        files_to_process = find_proposal_files(directory, file_pattern)
         
         if not files_to_process:
             print(f"오류: 지정한 패턴과 일치하는 파일을 찾을 수 없습니다: {file_pattern}")
@@ -571,31 +939,36 @@ def main():
         print(f"\n{len(files_to_process)}개의 파일을 처리합니다...")
         docx_paths = []
         
-        for file_path in files_to_process:
-            docx_path = process_single_proposal(file_path, output_dir, selected_sections, use_agent_sdk)
-            if docx_path:
-                docx_paths.append(docx_path)
+        if use_agent_sdk:
+            # Agent SDK 모드는 비대화형으로 실행 가능하므로 프로세스 풀에서 병렬 처리
+            docx_paths = run_batch(
+                files_to_process,
+                output_dir,
+                selected_sections=selected_sections,
+                use_agent_sdk=True,
+                processing_mode=select_processing_mode(),
+                create_pdf=False
+            )
+        else:
+            # 클립보드 방식은 사용자 입력이 필요하므로 순차 처리
+            for file_path in files_to_process:
+                docx_path = process_single_proposal(file_path, output_dir, selected_sections, use_agent_sdk)
+                if docx_path:
+                    docx_paths.append(docx_path)
         
         if docx_paths:
             # 여러 문서 병합 여부 확인
             merge_option = input("\n모든 사업계획서를 하나의 문서로 병합하시겠습니까? (y/n): ").strip().lower()
             
             if merge_option == 'y' and len(docx_paths) > 1:
-                # 병합 파일명 설정
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                merged_filename = f"merged_business_plans_{timestamp}.docx"
-                merged_path = os.path.join(output_dir, merged_filename)
-                
                 # 문서 병합
                 try:
-                    merge_docx_files(docx_paths, merged_path)
-                    print(f"\n✅ 병합된 사업계획서가 생성되었습니다: {merged_path}")
+                    merged_path = merge_plan_documents(docx_paths, output_dir)
                     
                     # PDF 변환 확인
-                    doc_manager = DocumentManager(output_dir)
                     create_pdf = input("\n병합된 문서를 PDF로 변환하시겠습니까? (y/n): ").strip().lower() == 'y'
                     if create_pdf:
-                        pdf_path = doc_manager.create_pdf_from_docx(merged_path)
+                        pdf_path = DocumentManager(output_dir).create_pdf_from_docx(merged_path)
                         if pdf_path:
                             print(f"✅ PDF가 생성되었습니다: {pdf_path}")
                 except Exception as e:
@@ -606,4 +979,7 @@ def main():
         print("잘못된 옵션입니다. 1 또는 2를 선택하세요.")
 
 if __name__ == "__main__":
+    # 인자가 있으면 비대화형(헤드리스) 모드로 실행
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
\ No newline at end of file
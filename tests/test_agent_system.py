@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+"""
+에이전트 시스템 실행 방식 테스트 스크립트 (에이전트 실행은 가짜 함수로 대체)
+"""
+import os
+import sys
+import json
+import random
+import asyncio
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from utils.agent_system import BusinessPlanAgentSystem
+from utils.agent_runtime import AgentRuntime
+from utils.coverage import AhoCorasick, CoverageScorer, SECTION_KEYWORDS
+from utils.chunking import SectionContextBuilder, chunk_by_tokens, estimate_tokens
+from utils.retrieval import ProposalRetriever, analyze
+from utils import reference_index
+from utils.reference_index import ReferenceIndex
+from core.section_config import get_section_config
+
+
+def refresh_index(index_dir, source_dir):
+    """작업자 프로세스에서 색인 갱신 (동시 갱신 테스트용)"""
+    index = ReferenceIndex(index_dir, [source_dir])
+    try:
+        index.refresh()
+        return index.passage_count
+    finally:
+        index.close()
+
+
+class TestAgentSystem(unittest.TestCase):
+    """섹션 에이전트 동시 실행 테스트"""
+
+    def setUp(self):
+        self.system = BusinessPlanAgentSystem()
+        self.calls = []
+        # 동시에 실행 중인 에이전트 수와 최댓값 (시간 측정 대신 동시 실행 여부 확인에 사용)
+        self.running = 0
+        self.peak = 0
+        self.system._run_agent_streamed = self._fake_run
+
+    async def _fake_run(self, agent, input_text, max_turns, on_text=None, cache_mode="off"):
+        """에이전트 대신 0.2초 후 고정 응답 반환"""
+        self.calls.append((agent.name, max_turns))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            self.running -= 1
+        if agent is self.system.analyzer_agent:
+            return "분석 결과"
+        if agent is self.system.consistency_agent:
+            return "일관성 문제 없음"
+        if agent is self.system.summarizer_agent:
+            return "요약"
+        section_input = json.loads(input_text)
+        self.assertIsInstance(section_input["writing_guidance"], list)
+        if section_input["section_id"] == "team":
+            raise RuntimeError("모델 오류")
+        return f"{section_input['section_id']} 내용 ({section_input['analysis']})"
+
+    def test_fanout(self):
+        """분석은 한 번, 섹션 에이전트는 동시에 실행하고 실패한 섹션만 제외"""
+        sections = ["problem", "solution", "market", "team"]
+        result = self.system.run_with_mode("기획서 초안", "analyze", sections)
+
+        # 분석 → 섹션 에이전트 4개 동시 실행 → 일관성 검토
+        self.assertEqual(self.peak, len(sections))
+        self.assertEqual(self.calls[0][0], self.system.analyzer_agent.name)
+        self.assertEqual(list(result["sections"]), ["problem", "solution", "market"])
+        self.assertEqual(result["sections"]["market"], "market 내용 (분석 결과)")
+        self.assertEqual(result["consistency_notes"], "일관성 문제 없음")
+        self.assertEqual([name for name, _ in self.calls].count(self.system.analyzer_agent.name), 1)
+        self.assertEqual(self.calls[-1], (self.system.consistency_agent.name, 1))
+        self.assertIn("section:market", result["timings"])
+        self.assertIn("total", result["timings"])
+
+    def test_map_reduce_summary(self):
+        """긴 기획서는 부분별로 동시에 요약한 뒤 합친 요약을 다시 요약"""
+        result = self.system.run_with_mode("짧은 기획서", "summarize")
+        self.assertEqual(result["final_output"], "요약")
+        self.assertEqual(self.calls, [(self.system.summarizer_agent.name, 3)])
+
+        self.calls.clear()
+        long_text = "\n\n".join(f"{i}번째 문단: 시장 규모와 고객 문제를 설명합니다." * 30 for i in range(40))
+        self.peak = 0
+        result = self.system.run_with_mode(long_text, "summarize")
+        self.assertEqual(result["final_output"], "요약")
+        partial_count = len(chunk_by_tokens(long_text, 3000))
+        self.assertGreater(partial_count, 4)
+        self.assertEqual([turns for _, turns in self.calls].count(1), partial_count)
+        self.assertEqual(self.calls[-1][1], 3)
+        # 부분 요약은 동시에 실행 (최대 4개씩)
+        self.assertEqual(self.peak, 4)
+
+    def test_runtime_overlaps_plans(self):
+        """런타임은 에이전트 시스템을 한 번만 만들고 제출된 기획서들을 같은 루프에서 동시에 처리"""
+        runtime = AgentRuntime()
+        runtime._system = self.system
+        try:
+            futures = [runtime.submit(f"기획서 {i}", selected_sections=["problem", "solution"]) for i in range(3)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            runtime.close()
+
+        # 기획서 하나는 한 번에 최대 2개(섹션 에이전트)만 실행하므로 더 많으면 기획서들이 겹쳐 처리된 것
+        self.assertGreater(self.peak, 2)
+        self.assertTrue(all(list(result["sections"]) == ["problem", "solution"] for result in results))
+        self.assertIs(runtime.system, self.system)
+
+
+class TestCoverageScorer(unittest.TestCase):
+    """섹션 충족도 계산 테스트"""
+
+    @staticmethod
+    def naive_score(section_config, plan_text):
+        """기존 analyze_business_plan의 섹션별 (완성도, 누락 요소) 계산"""
+        scores = {}
+        for section in section_config:
+            keywords = SECTION_KEYWORDS.get(section.id, [])
+            if keywords:
+                completeness = min(1.0, sum(1 for k in keywords if k.lower() in plan_text.lower()) / len(keywords))
+            else:
+                completeness = 0.5
+            missing = [element for element in section.element_names
+                       if not any(len(k) > 3 and k in plan_text.lower() for k in element.lower().split())]
+            scores[section.id] = (completeness, missing)
+        return scores
+
+    def test_matches_naive_scoring(self):
+        """기존 계산 방식과 같은 결과"""
+        section_config = get_section_config()
+        scorer = CoverageScorer(section_config)
+        proposals_dir = os.path.join(parent_dir, "data", "proposals")
+        texts = ["", "시장 규모와 TAM, SAM", "경쟁사 차별점 rOi 매출"]
+        for name in sorted(os.listdir(proposals_dir)):
+            with open(os.path.join(proposals_dir, name), "r", encoding="utf-8") as f:
+                texts.append(f.read())
+
+        for text in texts:
+            analysis = scorer.score(text)
+            scores = {section_id: (result["completeness"], result["missing_elements"])
+                      for section_id, result in analysis["section_analysis"].items()}
+            self.assertEqual(scores, self.naive_score(section_config, text))
+
+    def test_overlapping_patterns(self):
+        """겹치거나 포함 관계인 패턴도 모두 검출"""
+        patterns = ["he", "she", "his", "hers", "시장", "시장 규모", "장 규"]
+        automaton = AhoCorasick(patterns)
+        rng = random.Random(0)
+        for _ in range(200):
+            text = "".join(rng.choice("hers시장 규모i") for _ in range(rng.randint(0, 30)))
+            expected = {i for i, pattern in enumerate(patterns) if pattern in text}
+            self.assertEqual(automaton.find(text), expected)
+
+
+class TestChunking(unittest.TestCase):
+    """토큰 예산 기반 분할 테스트"""
+
+    def test_chunks_within_budget(self):
+        """청크와 섹션 문맥은 예산 이하로 유지되고, 짧은 기획서는 그대로 사용"""
+        with open(os.path.join(parent_dir, "data", "proposals", "business_idea.txt"), "r", encoding="utf-8") as f:
+            text = f.read()
+
+        chunks = chunk_by_tokens(text * 5, 1000)
+        self.assertTrue(all(estimate_tokens(chunk) <= 1000 for chunk in chunks))
+        self.assertEqual(chunk_by_tokens("가" * 2500, 1000), ["가" * 1000, "가" * 1000, "가" * 500])
+
+        builder = SectionContextBuilder(list(get_section_config()), max_tokens=2000)
+        self.assertEqual(builder.build("짧은 기획서")["market"], "짧은 기획서")
+        for grow in (1, 5, 20):
+            contexts = builder.build(text * grow)
+            self.assertTrue(all(estimate_tokens(context) <= 2000 for context in contexts.values()))
+        # 첫 문단은 항상 포함되고, 섹션별로 관련 문단을 우선 선택
+        self.assertTrue(contexts["market"].startswith(text.split("\n\n")[0]))
+        self.assertIn("시장", contexts["market"])
+
+
+class TestRetrieval(unittest.TestCase):
+    """섹션별 관련 문단 검색 테스트"""
+
+    def test_ranks_section_paragraphs(self):
+        """섹션 질의와 관련된 문단이 먼저 나오고, 발췌문은 원래 문단 순서를 유지"""
+        self.assertEqual(analyze("시장규모를 분석"), ["시장규모", "시장", "장규", "규모", "분석"])
+
+        business_idea = "\n\n".join([
+            "AI 사업계획서 작성 도구",
+            "창업팀은 AI 엔지니어 2명과 개발자 1명으로 구성되어 있습니다.",
+            "국내 시장 규모는 3,000억 원이며 연평균 성장률은 15%입니다. 주요 경쟁사는 두 곳입니다.",
+            "초기 투자금 2억 원으로 손익분기점은 2년 차에 도달합니다."
+        ])
+        retriever = ProposalRetriever(business_idea, get_section_config())
+        self.assertIn("시장 규모", retriever.top_k("market", k=1)[0]["text"])
+        self.assertIn("창업팀", retriever.top_k("team", k=1)[0]["text"])
+        self.assertIn("투자금", retriever.top_k("financials", k=1)[0]["text"])
+
+        excerpt = retriever.excerpt("market", k=2)
+        self.assertLessEqual(len(excerpt.split("\n\n")), 2)
+        self.assertIn("시장 규모", excerpt)
+        self.assertEqual(retriever.excerpt("market", k=2, max_chars=20), excerpt[:20])
+
+
+class TestReferenceIndex(unittest.TestCase):
+    """참고 자료 디스크 색인 테스트"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "references")
+        self.index_dir = os.path.join(self.temp_dir, "index")
+        os.makedirs(self.source_dir)
+        self.write("market.md", "## 시장 분석\n\n시장 규모와 성장률은 공신력 있는 통계로 제시합니다.")
+        self.write("team.txt", "팀 구성원의 경력과 역량을 구체적으로 적습니다.")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name, text):
+        path = os.path.join(self.source_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # 같은 초 안에 다시 써도 변경으로 인식되도록 수정 시각을 앞당김
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + len(text)))
+
+    def open_index(self):
+        return ReferenceIndex(self.index_dir, [self.source_dir], get_section_config())
+
+    def test_incremental_update(self):
+        """바뀐 파일만 다시 색인하고, 다시 열어도 같은 결과를 반환"""
+        index = self.open_index()
+        self.assertEqual(index.refresh()["added"], 2)
+        self.assertEqual(index.refresh(), {"added": 0, "updated": 0, "removed": 0, "passages": 3})
+        self.assertTrue(index.section_passages("market", k=1)[0]["source"].endswith("market.md"))
+        self.assertTrue(index.section_passages("team", k=1)[0]["source"].endswith("team.txt"))
+
+        self.write("team.txt", "창업 멤버는 투자 유치 경험이 있습니다.")
+        os.remove(os.path.join(self.source_dir, "market.md"))
+        self.assertEqual(index.refresh(), {"added": 0, "updated": 1, "removed": 1, "passages": 1})
+        self.assertEqual(index.search("시장 규모"), [])
+        self.assertIn("투자 유치", index.search("투자 유치 경험")[0]["text"])
+        index.close()
+
+        reopened = self.open_index()
+        self.assertEqual(reopened.refresh()["passages"], 1)
+        self.assertIn("투자 유치", reopened.search("투자 유치 경험")[0]["text"])
+        reopened.close()
+
+    def test_concurrent_refresh(self):
+        """여러 프로세스가 같은 색인을 동시에 갱신해도 한 번만 색인하고 모두 같은 결과를 봄"""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            counts = list(executor.map(refresh_index, [self.index_dir] * 4, [self.source_dir] * 4))
+        self.assertEqual(counts, [3] * 4)
+
+        index = self.open_index()
+        self.assertEqual(len(index._manifest["segments"]), 1)
+        self.assertEqual(index.refresh()["added"], 0)
+        index.close()
+
+    def test_compaction(self):
+        """세그먼트가 많아지면 삭제되지 않은 구절만 모아 하나로 합침"""
+        index = self.open_index()
+        index.refresh()
+        original_max = reference_index.MAX_SEGMENTS
+        reference_index.MAX_SEGMENTS = 2
+        try:
+            for version in range(3):
+                self.write("team.txt", f"팀 구성원 {version}번째 수정본입니다.")
+                index.refresh()
+        finally:
+            reference_index.MAX_SEGMENTS = original_max
+
+        self.assertLessEqual(len(index._manifest["segments"]), 2)
+        self.assertEqual(index.passage_count, 3)
+        self.assertEqual([p["text"] for p in index.search("수정본")], ["팀 구성원 2번째 수정본입니다."])
+        segment_dirs = [name for name in os.listdir(self.index_dir) if name.startswith("seg_")]
+        self.assertEqual(sorted(segment_dirs), sorted(index._manifest["segments"]))
+        index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
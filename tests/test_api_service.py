@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""
+API 서비스 비동기 검색 테스트 스크립트 (로컬 스텁 서버 사용)
+"""
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from utils.api_service import APIService
+from utils.http_transport import AsyncHTTPTransport
+from utils.response_cache import ResponseCache
+from utils.provider_registry import ProviderRegistry
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """KOSIS/ECOS/KISTI/공공데이터 포털을 대신하는 스텁 API"""
+    # 경로 → (지연 시간, 응답 데이터 개수)
+    routes = {
+        "/kosis": (0.05, 2),
+        "/public": (0.05, 1),
+        "/kisti": (3.0, 5),
+        "/ecos": (0.0, 1),
+        "/down": (0.0, 0)
+    }
+    hits = {}
+    fail_first = set()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        StubHandler.hits[path] = StubHandler.hits.get(path, 0) + 1
+
+        if path == "/down" or (path in StubHandler.fail_first and StubHandler.hits[path] == 1):
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        delay, count = self.routes[path]
+        time.sleep(delay)
+        body = json.dumps({"data": [{"title": f"{path} {i}"} for i in range(count)]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAPIService(unittest.TestCase):
+    """비동기 API 검색 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubHandler.hits = {}
+        StubHandler.fail_first = set()
+        self.cache = ResponseCache(":memory:", stale_ttl=3600)
+        self.service = APIService(transport=AsyncHTTPTransport(backoff=0.01), cache=self.cache)
+
+    def _configure(self, **paths):
+        self.service.config = {
+            name: {"api_key": "test", "base_url": self.base_url, "search_path": path}
+            for name, path in paths.items()
+        }
+
+    def test_concurrent_fan_out_with_early_stop(self):
+        """동시 조회 후 충분한 데이터가 모이면 느린 API 요청 취소"""
+        self._configure(kosis="/kosis", public_data_portal="/public", kisti="/kisti")
+
+        start = time.monotonic()
+        results = self.service.search_section_data("market", ["AI"])
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual([d["title"] for d in results["data"]], ["/kosis 0", "/kosis 1", "/public 0"])
+        self.assertEqual(results["sources"], ["통계청 KOSIS", "공공데이터 포털"])
+
+    def test_retry_on_server_error(self):
+        """일시적인 서버 오류는 재시도"""
+        self._configure(ecos="/ecos")
+        StubHandler.fail_first = {"/ecos"}
+
+        results = self.service.search_section_data("financials", ["금리"])
+        self.assertEqual(results["sources"], ["한국은행 ECOS"])
+        self.assertEqual(StubHandler.hits["/ecos"], 2)
+
+    def test_response_cache(self):
+        """같은 키워드 집합은 캐시에서 응답하고, 만료된 항목은 백그라운드에서 갱신"""
+        self._configure(ecos="/ecos")
+        self.service.search_section_data("financials", ["금리", "GDP"])
+        self.service.search_section_data("financials", [" gdp ", "금리"])
+        self.assertEqual(StubHandler.hits["/ecos"], 1)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+        # 유효 기간이 지나면 만료 데이터를 먼저 반환하고 다시 조회
+        self.cache.set_ttl("ecos", -1)
+        results = self.service.search_section_data("financials", ["금리", "GDP"])
+        self.assertEqual(results["sources"], ["한국은행 ECOS"])
+        self.assertEqual(self.cache.stats()["stale_hits"], 1)
+        for _ in range(50):
+            if StubHandler.hits["/ecos"] == 2:
+                break
+            time.sleep(0.05)
+        self.assertEqual(StubHandler.hits["/ecos"], 2)
+
+    def test_batch_search(self):
+        """여러 요청을 API별 한 번의 조회로 묶고 결과를 요청별로 분배"""
+        self._configure(kosis="/kosis", public_data_portal="/public", kisti="/kisti")
+        StubHandler.routes = dict(StubHandler.routes, **{"/kisti": (0.0, 1)})
+        try:
+            results = self.service.search_batch([
+                {"kind": "market", "keywords": ["시장", "AI"]},
+                {"kind": "market", "keywords": ["AI", "성장률"]},
+                {"kind": "competitors", "keywords": ["경쟁사"]},
+                {"kind": "section", "keywords": ["시장"], "section_id": "market"}
+            ])
+        finally:
+            StubHandler.routes = dict(StubHandler.routes, **{"/kisti": (3.0, 5)})
+
+        self.assertEqual(StubHandler.hits, {"/kosis": 1, "/public": 1, "/kisti": 2})
+        self.assertEqual(len(results[0]["data"]), 3)
+        self.assertEqual(results[2]["sources"], ["KISTI"])
+        self.assertEqual(results[3]["sources"], ["통계청 KOSIS", "공공데이터 포털", "KISTI"])
+
+        # 키워드가 표시된 응답 항목은 해당 키워드를 요청한 항목에만 분배
+        data = [{"title": "a", "keyword": "AI"}, {"title": "b", "keyword": "성장률"}, {"title": "c"}]
+        self.assertEqual([d["title"] for d in self.service._scatter(data, ["시장", "AI"])], ["a", "c"])
+
+    def test_circuit_breaker(self):
+        """연속으로 실패한 API는 서킷을 열고 요청하지 않음"""
+        self._configure(kosis="/down", public_data_portal="/public")
+        self.service.config["kosis"]["retries"] = 0
+
+        for _ in range(3):
+            self.service.search_section_data("market", ["AI"])
+        self.assertEqual(StubHandler.hits["/down"], 3)
+        self.assertEqual(self.service.get_provider_health()["kosis"]["state"], "open")
+
+        results = self.service.search_section_data("market", ["AI"])
+        self.assertEqual(StubHandler.hits["/down"], 3)
+        self.assertEqual(results["sources"], ["공공데이터 포털"])
+
+    def test_route_demotes_degraded_provider(self):
+        """응답이 느린 API는 우선순위 목록에서 뒤로 이동"""
+        registry = ProviderRegistry({"kosis": {"api_key": "k"}, "kisti": {"api_key": "k"}, "ecos": {}}, slow_threshold=1.0)
+        registry.health("kosis").record_success(3.0)
+        registry.health("kisti").record_success(0.1)
+        self.assertEqual(registry.route(["kosis", "ecos", "kisti"]), ["kisti", "kosis"])
+
+    def test_cache_lru_bound(self):
+        """항목 수 제한을 넘으면 가장 오래 사용되지 않은 항목 삭제"""
+        cache = ResponseCache(":memory:", max_entries=2)
+        cache.set("kosis", ["a"], {"data": [1]})
+        cache.set("kosis", ["b"], {"data": [2]})
+        time.sleep(0.01)
+        cache.get("kosis", ["a"])
+        cache.set("kosis", ["c"], {"data": [3]})
+        self.assertEqual(cache.get("kosis", ["b"]), (None, None))
+        self.assertEqual(cache.get("kosis", ["a"])[1], ResponseCache.FRESH)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
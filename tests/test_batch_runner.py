@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+일괄 처리 엔진 테스트 스크립트
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from core.batch_runner import BatchRunner
+
+
+def fake_process(file_path, output_dir, selected_sections=None):
+    """테스트용 처리 함수 - 입력 내용을 결과 파일로 복사"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    if "실패" in content:
+        raise RuntimeError("처리 실패")
+
+    output_path = os.path.join(output_dir, os.path.basename(file_path) + ".docx")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return output_path
+
+
+class TestBatchRunner(unittest.TestCase):
+    """일괄 처리 엔진 테스트"""
+
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.test_dir = tempfile.mkdtemp()
+
+        self.files = []
+        for name, content in [("a.txt", "기획서 A"), ("b.txt", "기획서 B"), ("c.txt", "실패 기획서")]:
+            path = os.path.join(self.test_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_results_and_resume(self):
+        """결과 스트리밍 및 재실행 시 완료 파일 건너뛰기"""
+        runner = BatchRunner(fake_process, self.test_dir, max_workers=2)
+        results = {r["file_path"]: r for r in runner.run(self.files, output_dir=self.test_dir)}
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(os.path.exists(results[self.files[0]]["docx_path"]))
+        self.assertIn("처리 실패", results[self.files[2]]["error"])
+
+        # 재실행: 성공한 파일은 건너뛰고 실패한 파일만 다시 처리
+        self.assertEqual(runner.pending_files(self.files, output_dir=self.test_dir), [self.files[2]])
+        rerun = {r["file_path"]: r for r in runner.run(self.files, output_dir=self.test_dir)}
+        self.assertTrue(rerun[self.files[0]]["skipped"])
+        self.assertFalse(rerun[self.files[2]]["skipped"])
+
+        # 입력 파일이 변경되면 다시 처리
+        with open(self.files[1], "a", encoding="utf-8") as f:
+            f.write(" 수정")
+        self.assertEqual(runner.pending_files(self.files, output_dir=self.test_dir), [self.files[1], self.files[2]])
+
+    def test_resume_with_different_options(self):
+        """처리 옵션(선택 섹션)이 바뀌면 완료된 파일도 다시 처리"""
+        runner = BatchRunner(fake_process, self.test_dir, max_workers=1)
+        files = self.files[:1]
+        list(runner.run(files, output_dir=self.test_dir, selected_sections=["problem"]))
+
+        same = list(runner.run(files, output_dir=self.test_dir, selected_sections=["problem"]))
+        self.assertTrue(same[0]["skipped"])
+
+        changed = list(runner.run(files, output_dir=self.test_dir, selected_sections=["problem", "market"]))
+        self.assertFalse(changed[0]["skipped"])
+        self.assertIsNone(changed[0]["error"])
+
+    def test_resume_with_file_options(self):
+        """파일별 옵션(file_kwargs)은 해당 파일의 재처리 여부에만 영향"""
+        files = self.files[:2]
+        sections = {files[0]: ["problem"], files[1]: ["problem"]}
+        runner = BatchRunner(fake_process, self.test_dir, max_workers=1,
+                             file_kwargs=lambda file_path: {"selected_sections": sections[file_path]})
+        list(runner.run(files, output_dir=self.test_dir))
+
+        sections[files[1]] = ["market"]
+        self.assertEqual(runner.pending_files(files, output_dir=self.test_dir), [files[1]])
+        # 목록에서 다른 파일을 빼도 완료된 파일은 그대로 건너뜀
+        self.assertEqual(runner.pending_files(files[:1], output_dir=self.test_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,18 @@ sys.path.append(parent_dir)
 from core.business_plan import BusinessPlanService, BusinessPlan
 from core.document_manager import DocumentManager
 from utils.prompt_utils import load_prompt_template
+from utils.streaming import PLACEHOLDER_PATTERN, PlaceholderScanner
+from utils.docx_stream import StreamingDocxWriter
+from utils.document_ast import parse_document, parse_section, sections_to_blocks
+from utils.document_export import export_document
+from utils.pdf_utils import (
+    create_docx_with_sections, docx_to_blocks, fill_pdf_template, merge_docx_files, register_korean_font, wrap_text
+)
+from utils.pdf_template import get_pdf_template
+from PyPDF2 import PdfReader
+from docx import Document
+from docx.shared import Pt
+from reportlab.pdfbase import pdfmetrics
 
 
 class TestBusinessPlanFlow(unittest.TestCase):
@@ -37,6 +49,20 @@ class TestBusinessPlanFlow(unittest.TestCase):
         self.assertEqual(bp.business_idea, "테스트 내용")
         self.assertEqual(len(bp.sections), 8)  # 8개 섹션 확인
     
+    def test_streaming_section(self):
+        """스트리밍 섹션 조립 및 필요 정보 표시 증분 검출 테스트"""
+        text = "시장 [필요 정보: 시장 규모] 성장 [참고] [필요 정보: 성장률] 끝 [필요"
+        bp = BusinessPlan("테스트 사업계획서")
+        scanner = PlaceholderScanner()
+        for i in range(0, len(text), 3):
+            bp.append_section_content("market", text[i:i + 3])
+            scanner.feed(text[i:i + 3])
+        
+        self.assertEqual(bp.get_section_content("market"), text)
+        self.assertEqual(scanner.found, PLACEHOLDER_PATTERN.findall(text))
+        bp.finish_section("market")
+        self.assertEqual(bp.sections["market"], text)
+    
     def test_prompt_templates(self):
         """프롬프트 템플릿 로드 테스트"""
         # 분석 프롬프트 템플릿
@@ -78,6 +104,160 @@ class TestBusinessPlanFlow(unittest.TestCase):
         # 파일 생성 확인
         self.assertTrue(os.path.exists(output_path))
         self.assertGreater(os.path.getsize(output_path), 0)
+    
+    def test_pdf_template_filling(self):
+        """PDF 템플릿의 섹션 위치에 한 번에 채우고, 넘친 내용은 해당 페이지 바로 뒤에 추가"""
+        font_name = register_korean_font()
+        lines = wrap_text("시장 규모는 " + "가" * 200 + " 입니다\n\n끝", font_name, 10, 200)
+        self.assertTrue(all(pdfmetrics.stringWidth(line, font_name, 10) <= 200 for line in lines))
+        self.assertEqual("".join(lines[:-3]).replace(" ", ""), "시장규모는" + "가" * 200)
+        self.assertEqual(lines[-2:], ["", "끝"])
+        
+        bp_service = BusinessPlanService()
+        business_plan = bp_service.create_plan("테스트 계획", "테스트 아이디어")
+        business_plan.add_section_content("problem", "◦ 문제 인식\n- 첫 번째 문제점")
+        business_plan.add_section_content("market", "\n".join(f"- 시장 분석 {i}번째 줄" for i in range(80)))
+        
+        doc_manager = DocumentManager(self.test_output_dir)
+        output_path = doc_manager.create_pdf_from_template(business_plan, "test_template.pdf")
+        
+        reader = PdfReader(output_path)
+        template_pages = len(PdfReader(os.path.join(parent_dir, "data", "templates", "template.pdf")).pages)
+        # market(3번째 페이지, y=700부터 80줄)만 한 페이지 넘침
+        self.assertEqual(len(reader.pages), template_pages + 1)
+        overlay_pages = [i for i, page in enumerate(reader.pages)
+                         if "/TextOverlay" in page["/Resources"].get("/XObject", {})]
+        self.assertEqual(overlay_pages, [0, 2])
+    
+    def test_pdf_document_rendering(self):
+        """사업계획서를 Word 문서 없이 PDF로 직접 생성하고, Word 문서 변환도 같은 블록 구조를 사용"""
+        bp_service = BusinessPlanService()
+        business_plan = bp_service.create_plan("테스트 계획", "테스트 아이디어")
+        business_plan.add_section_content("problem", "◦ 문제 인식\n- 첫 번째 문제점\n\n일반 설명 " * 3)
+        business_plan.add_section_content("market", "\n".join(f"- 시장 분석 {i}번째 줄" for i in range(80)))
+        
+        doc_manager = DocumentManager(self.test_output_dir)
+        pdf_path = doc_manager.create_pdf_document(business_plan, "test_direct.pdf")
+        self.assertTrue(os.path.exists(pdf_path))
+        # 80줄 목록은 한 페이지에 들어가지 않음
+        self.assertGreaterEqual(len(PdfReader(pdf_path).pages), 2)
+        
+        docx_path = doc_manager.create_word_document(business_plan, "test_direct.docx")
+        blocks = sections_to_blocks(doc_manager._completed_sections(business_plan))
+        self.assertEqual(docx_to_blocks(docx_path), blocks)
+        self.assertEqual([kind for kind, _ in blocks[:4]], ["heading", "item", "bullet", "text"])
+        
+        converted = doc_manager.create_pdf_from_docx(docx_path)
+        self.assertEqual(len(PdfReader(converted).pages), len(PdfReader(pdf_path).pages))
+        self.assertIsNone(doc_manager.create_pdf_from_docx(os.path.join(self.test_output_dir, "missing.docx")))
+    
+    def test_streaming_docx_writer(self):
+        """블록을 받는 대로 기록한 Word 문서를 python-docx로 다시 읽으면 같은 단락과 서식"""
+        output_path = os.path.join(self.test_output_dir, "test_stream.docx")
+        sections = {f"Section {i}": "◦ 핵심 항목\n- 목록 & <태그>\t탭\n일반\x01 텍스트\n" for i in range(200)}
+        create_docx_with_sections(output_path, sections)
+        
+        document = Document(output_path)
+        self.assertEqual(len(document.paragraphs), 200 * 4 + 199)
+        heading, item, bullet, text = document.paragraphs[:4]
+        self.assertEqual((heading.style.name, heading.text), ("Heading 1", "Section 0"))
+        self.assertTrue(item.runs[0].bold)
+        self.assertEqual((bullet.style.name, bullet.text), ("List Bullet", "- 목록 & <태그>\t탭"))
+        self.assertEqual(text.text, "일반 텍스트")
+        # XML에 쓸 수 없는 제어 문자만 빠짐
+        expected = [(kind, text.replace("\x01", "")) for kind, text in sections_to_blocks(sections)]
+        self.assertEqual(docx_to_blocks(output_path), expected)
+        
+        # 작성 중 오류가 나면 불완전한 파일을 남기지 않음
+        broken_path = os.path.join(self.test_output_dir, "test_stream_broken.docx")
+        with self.assertRaises(ValueError):
+            with StreamingDocxWriter(broken_path) as writer:
+                writer.write("heading", "제목")
+                raise ValueError("중단")
+        self.assertFalse(os.path.exists(broken_path))
+    
+    def test_merge_docx_files(self):
+        """병합한 문서에 표, 굵게, 목록 번호가 유지되고, 정의가 다른 같은 ID의 스타일은 새 ID로 추가"""
+        plan_path = create_docx_with_sections(os.path.join(self.test_output_dir, "merge_plan.docx"),
+                                              {"Problem": "◦ 문제 인식\n- 첫 번째 문제점"})
+        document = Document()
+        document.styles["Heading 1"].font.size = Pt(30)
+        document.add_heading("표 문서", level=1)
+        document.add_table(rows=2, cols=2).cell(0, 0).text = "셀"
+        document.add_paragraph().add_run("굵게").bold = True
+        document.add_paragraph("번호", style="List Number")
+        table_path = os.path.join(self.test_output_dir, "merge_table.docx")
+        document.save(table_path)
+        
+        output_path = merge_docx_files([plan_path, table_path, table_path],
+                                       os.path.join(self.test_output_dir, "merged.docx"))
+        merged = Document(output_path)
+        self.assertEqual(len(merged.tables), 2)
+        self.assertEqual([kind for kind, _ in docx_to_blocks(output_path)].count("page_break"), 2)
+        paragraphs = {paragraph.text: paragraph for paragraph in merged.paragraphs}
+        self.assertTrue(paragraphs["◦ 문제 인식"].runs[0].bold)
+        self.assertTrue(paragraphs["굵게"].runs[0].bold)
+        self.assertEqual(paragraphs["번호"].style.name, "List Number")
+        # 기준 문서의 제목 스타일은 그대로, 두 번째 문서의 제목 스타일은 한 번만 추가
+        self.assertEqual(paragraphs["Problem"].style.font.size, Pt(14))
+        self.assertNotEqual(paragraphs["표 문서"].style.style_id, "Heading1")
+        self.assertEqual(paragraphs["표 문서"].style.font.size, Pt(30))
+        self.assertEqual(len({p.style.style_id for p in merged.paragraphs if p.text == "표 문서"}), 1)
+    
+    def test_document_export(self):
+        """섹션은 한 번만 블록으로 변환하고, 같은 블록으로 여러 형식을 동시에 저장"""
+        content = "◦ 시장 현황\n- 국내 시장 <성장>\n1. 일반 설명\n[필요 정보: 시장 규모]\n"
+        self.assertIs(parse_section(content), parse_section(content))
+        sections = {"Market": content, "Team": "- 대표 이력"}
+        blocks = parse_document(sections)
+        self.assertEqual([block.kind for block in blocks],
+                         ["heading", "item", "bullet", "text", "placeholder", "blank", "heading", "bullet"])
+        
+        output_base = os.path.join(self.test_output_dir, "test_export")
+        outputs = export_document(sections, output_base, formats=["docx", "pdf", "markdown", "html"])
+        self.assertEqual(set(outputs), {"docx", "pdf", "markdown", "html"})
+        self.assertTrue(all(os.path.exists(path) for path in outputs.values()))
+        self.assertEqual(docx_to_blocks(outputs["docx"]), list(blocks))
+        
+        with open(outputs["markdown"], encoding="utf-8") as f:
+            markdown = f.read()
+        self.assertIn("# Market\n\n**◦ 시장 현황**\n\n- 국내 시장 <성장>\n\n1\\. 일반 설명", markdown)
+        self.assertIn("*[필요 정보: 시장 규모]*", markdown)
+        with open(outputs["html"], encoding="utf-8") as f:
+            document = f.read()
+        self.assertIn("<ul>\n<li>국내 시장 &lt;성장&gt;</li>\n</ul>", document)
+        self.assertIn("<mark>[필요 정보: 시장 규모]</mark>", document)
+        
+        with self.assertRaises(ValueError):
+            export_document(sections, output_base, formats=["odt"])
+    
+    def test_pdf_template_cache(self):
+        """템플릿은 한 번만 읽어 재사용하고, 결과는 원본 바이트 뒤에 바뀐 페이지만 덧붙임"""
+        template_path = os.path.join(parent_dir, "data", "templates", "template.pdf")
+        template = get_pdf_template(template_path)
+        self.assertIs(get_pdf_template(template_path), template)
+        self.assertTrue(template.incremental)
+        
+        placements = [("첫 번째 섹션", (0, 60, 700)), ("세 번째 섹션 " * 400, (2, 60, 700))]
+        outputs = []
+        for name in ("cache_a.pdf", "cache_b.pdf"):
+            output_path = os.path.join(self.test_output_dir, name)
+            fill_pdf_template(template_path, output_path, placements)
+            with open(output_path, "rb") as f:
+                outputs.append(f.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertTrue(outputs[0].startswith(template.data))
+        # 덧붙인 부분은 오버레이 내용과 바뀐 페이지뿐 (템플릿 전체보다 훨씬 작음)
+        self.assertLess(len(outputs[0]) - len(template.data), len(template.data) // 4)
+        
+        reader = PdfReader(os.path.join(self.test_output_dir, "cache_a.pdf"), strict=True)
+        self.assertEqual(len(reader.pages), template.page_count + 1)
+        overlay_pages = [i for i, page in enumerate(reader.pages)
+                         if "/TextOverlay" in page["/Resources"].get("/XObject", {})]
+        self.assertEqual(overlay_pages, [0, 2])
+        # 템플릿 페이지 트리와 리소스는 수정되지 않음
+        self.assertNotIn("/TextOverlay", template.pages[0]["resources"].get("/XObject", {}))
+        self.assertEqual(len(template.reader.pages), template.page_count)
 
 
 def run_tests():
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+프롬프트 레지스트리 테스트 스크립트
+"""
+import os
+import sys
+import shutil
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from utils.prompt_registry import CompiledTemplate, PromptRegistry
+
+
+class TestPromptRegistry(unittest.TestCase):
+    """프롬프트 레지스트리 테스트"""
+
+    def setUp(self):
+        """테스트용 프롬프트 디렉토리 생성"""
+        self.base_dir = os.path.join(current_dir, "test_output", "prompts")
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+        os.makedirs(os.path.join(self.base_dir, "analysis_prompts"))
+        self._write("analysis_prompts/problem_analysis.txt", "문제 분석:\n{business_idea}")
+        self._write("analysis_prompt.txt", "통합 분석:\n{business_idea}")
+        self._write("generation_prompt.txt", "기획:\n{business_idea}\n분석:\n{analysis}\n{unknown}")
+
+    def _write(self, relative_path, content):
+        with open(os.path.join(self.base_dir, relative_path), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_compiled_template(self):
+        """슬롯 렌더링 - 값 안의 슬롯 표기는 다시 치환되지 않음"""
+        template = CompiledTemplate("A {business_idea} B {analysis} C {business_idea}")
+        self.assertEqual(template.slots, ["business_idea", "analysis"])
+        self.assertEqual(
+            template.render(business_idea="{analysis}", analysis="분석"),
+            "A {analysis} B 분석 C {analysis}"
+        )
+
+    def test_section_resolution(self):
+        """섹션 전용 템플릿 우선, 없으면 통합 템플릿 사용"""
+        registry = PromptRegistry(self.base_dir, legacy_dir=os.path.join(self.base_dir, "legacy"))
+        self.assertEqual(registry.render_analysis("problem", "아이디어"), "문제 분석:\n아이디어")
+        self.assertEqual(registry.render_analysis("team", "아이디어"), "통합 분석:\n아이디어")
+        self.assertEqual(
+            registry.render_generation("team", "아이디어", "결과"),
+            "기획:\n아이디어\n분석:\n결과\n{unknown}"
+        )
+
+    def test_reload_on_change(self):
+        """파일 변경 시 다시 읽기 (check_interval=0이면 매번 확인)"""
+        registry = PromptRegistry(self.base_dir, legacy_dir=os.path.join(self.base_dir, "legacy"), check_interval=0)
+        self.assertEqual(registry.render_analysis("team", "X"), "통합 분석:\nX")
+
+        # 섹션 전용 템플릿이 새로 추가되면 우선 사용
+        self._write("analysis_prompts/team_analysis.txt", "팀 분석: {business_idea}")
+        self.assertEqual(registry.render_analysis("team", "X"), "팀 분석: X")
+
+        path = os.path.join(self.base_dir, "analysis_prompts", "team_analysis.txt")
+        self._write("analysis_prompts/team_analysis.txt", "수정된 팀 분석: {business_idea}")
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(registry.render_analysis("team", "X"), "수정된 팀 분석: X")
+
+
+if __name__ == "__main__":
+    unittest.main()
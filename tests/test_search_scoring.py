@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+검색 결과 평가 색인 테스트 (이전 중첩 반복 구현과 결과 비교)
+"""
+import os
+import sys
+import random
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from utils.agent import BusinessPlanAgent
+from utils.search_scoring import SearchResultIndex
+
+
+def legacy_relevance(data, missing_items):
+    """이전 BusinessPlanAgent._calculate_relevance 구현"""
+    if not data or not missing_items:
+        return 0.0
+    score = 0.0
+    for item in missing_items:
+        for result in data:
+            if item["item"].lower() in result.get("title", "").lower():
+                score += 1.0
+                break
+            value = str(result.get("value", "")).lower()
+            if any(need.lower() in value for need in item["specific_needs"]):
+                score += 0.5
+                break
+    return score / len(missing_items)
+
+
+def legacy_completeness(data, missing_items):
+    """이전 BusinessPlanAgent._calculate_completeness 구현"""
+    if not data or not missing_items:
+        return 0.0
+    addressed = set()
+    for item in missing_items:
+        for result in data:
+            title = result.get("title", "").lower()
+            if item["item"].lower() in title or any(need.lower() in title for need in item["specific_needs"]):
+                addressed.add(item["item"])
+                break
+    return len(addressed) / len(missing_items)
+
+
+class TestSearchScoring(unittest.TestCase):
+    """검색 결과 평가 색인 테스트"""
+
+    WORDS = ["시장", "규모", "성장률", "경쟁사", "SaaS", "AI", "매출", "2023", "구독", "a", ""]
+
+    def random_text(self, rng, count):
+        return " ".join(rng.choice(self.WORDS) for _ in range(count))
+
+    def test_matches_legacy_scoring(self):
+        """관련성/완전성 점수는 이전 중첩 반복 구현과 같음"""
+        rng = random.Random(7)
+        for _ in range(200):
+            data = [{"title": self.random_text(rng, 3), "value": rng.choice([self.random_text(rng, 2), 120, ""])}
+                    for _ in range(rng.randint(0, 8))]
+            missing_items = [{"item": self.random_text(rng, rng.randint(1, 2)),
+                              "specific_needs": [self.random_text(rng, 1) for _ in range(rng.randint(0, 2))]}
+                             for _ in range(rng.randint(0, 4))]
+            index = SearchResultIndex(data)
+            self.assertEqual(index.relevance(missing_items), legacy_relevance(data, missing_items))
+            self.assertEqual(index.completeness(missing_items), legacy_completeness(data, missing_items))
+
+    def test_batch_evaluation(self):
+        """여러 섹션을 한 번에 평가해도 섹션별 평가와 같음 (공유 결과는 한 번만 색인)"""
+        agent = BusinessPlanAgent()
+        shared = {"title": "국내 SaaS 시장 규모", "value": "3조 원", "year": "2023"}
+        market = {"success": True, "data": [shared, {"title": "성장률", "value": "12%", "year": "2022"}]}
+        competition = {"success": True, "data": [{"title": "경쟁사 A 매출", "value": "", "year": "2021"}, shared]}
+        empty = {"success": False, "data": []}
+        items = [{"item": "시장 규모", "specific_needs": ["12%"]}, {"item": "경쟁사", "specific_needs": ["3조"]}]
+
+        batch = agent.evaluate_search_results_batch({
+            "market": (market, items), "competition": (competition, items), "team": (empty, items)
+        })
+        self.assertEqual(list(batch), ["market", "competition", "team"])
+        for section_id, results in (("market", market), ("competition", competition), ("team", empty)):
+            self.assertEqual(batch[section_id], agent.evaluate_search_results(results, items, section_id))
+        self.assertEqual(batch["competition"]["completeness"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+섹션 설정 모델 테스트 스크립트
+"""
+import os
+import sys
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from core.section_config import SectionConfig, get_section_config
+
+
+class TestSectionConfig(unittest.TestCase):
+    """섹션 설정 테스트"""
+
+    def test_both_schemas(self):
+        """두 설정 파일 형식 모두 같은 형태로 정규화"""
+        config = get_section_config(os.path.join(parent_dir, "data", "prompts", "section_config.json"))
+        problem = config.get("problem")
+        self.assertEqual(problem.title, "문제 인식 (Problem)_창업 아이템의 필요성")
+        self.assertTrue(problem.original_title.startswith("1. "))
+        self.assertIs(config.by_pdf_position([0, 50, 700]), problem)
+        self.assertTrue(problem.element_names)
+
+        legacy = get_section_config(os.path.join(parent_dir, "data", "section_config.json"))
+        self.assertIs(legacy.by_pdf_position("A"), legacy.get("problem"))
+        self.assertIn("시장 규모", legacy.get("problem").element_names)
+
+        # 같은 경로는 한 번만 로드
+        self.assertIs(get_section_config(os.path.join(parent_dir, "data", "section_config.json")), legacy)
+
+    def test_immutable_and_validated(self):
+        """설정 객체는 변경할 수 없고, 잘못된 설정은 로드 시 거부"""
+        config = SectionConfig.from_dict({"sections": [
+            {"id": "a", "title": "1. 가", "required_elements": [{"name": "요소", "description": "설명"}]},
+            {"id": "b", "title": "나", "depends_on": ["a"]}
+        ]})
+        self.assertEqual(config.select(["b", "a"]), list(config.sections))
+        self.assertEqual(config.get("b")["depends_on"], ["a"])
+        with self.assertRaises(AttributeError):
+            config.get("a").title = "변경"
+
+        with self.assertRaises(ValueError):
+            SectionConfig.from_dict({"sections": [{"id": "a"}, {"id": "a"}]})
+        with self.assertRaises(ValueError):
+            SectionConfig.from_dict({"sections": [{"id": "a", "depends_on": ["x"]}]})
+        with self.assertRaises(ValueError):
+            SectionConfig.from_dict({"sections": [{"id": "a", "required_elements": [{"description": "이름 없음"}]}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+섹션 처리 파이프라인 테스트 스크립트
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from core.section_pipeline import SectionPipeline
+
+
+class TestSectionPipeline(unittest.TestCase):
+    """섹션 파이프라인 테스트"""
+
+    def setUp(self):
+        """테스트 환경 설정"""
+        self.sections = [
+            {"id": "problem", "title": "문제 인식"},
+            {"id": "solution", "title": "해결 방안"},
+            {"id": "market", "title": "시장 분석"},
+            {"id": "scale_up", "title": "성장 전략", "depends_on": ["market", "solution"]},
+        ]
+
+    def test_results_keep_section_order(self):
+        """완료 순서와 관계없이 섹션 순서대로 결과 반환"""
+        delays = {"problem": 0.05, "solution": 0.0, "market": 0.02, "scale_up": 0.0}
+
+        def task(section, dependency_results):
+            time.sleep(delays[section["id"]])
+            return section["id"].upper()
+
+        results = SectionPipeline(max_workers=4).run(self.sections, task)
+        self.assertEqual(list(results.keys()), ["problem", "solution", "market", "scale_up"])
+        self.assertEqual(results["market"], "MARKET")
+
+    def test_independent_sections_run_concurrently(self):
+        """독립적인 섹션은 동시에 처리되고 의존 섹션은 의존성 완료 후 처리"""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def task(section, dependency_results):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            return sorted(dependency_results.items())
+
+        results = SectionPipeline(max_workers=3).run(self.sections, task)
+        self.assertEqual(state["peak"], 3)
+        self.assertEqual(results["scale_up"], [("market", []), ("solution", [])])
+
+    def test_failed_section_returns_none(self):
+        """섹션 처리 실패 시 None 반환"""
+        def task(section, dependency_results):
+            if section["id"] == "market":
+                raise RuntimeError("테스트 오류")
+            return section["id"]
+
+        results = SectionPipeline(max_workers=2).run(self.sections, task)
+        self.assertIsNone(results["market"])
+        self.assertEqual(results["scale_up"], "scale_up")
+
+    def test_cyclic_dependency(self):
+        """순환 의존성 검출"""
+        sections = [
+            {"id": "a", "depends_on": ["b"]},
+            {"id": "b", "depends_on": ["a"]},
+        ]
+        with self.assertRaises(ValueError):
+            SectionPipeline().build_graph(sections)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+텍스트 처리 도구와 에이전트 키워드/필요 정보 추출 테스트 (이전 구현과 결과 비교)
+"""
+import os
+import re
+import sys
+import unittest
+
+# 상위 디렉토리를 import 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from utils.agent import BusinessPlanAgent
+from utils.text_processing import STOP_WORDS, extract_needs, tokenize, top_words, word_frequencies
+
+
+def legacy_extract_specific_needs(explanation):
+    """이전 BusinessPlanAgent._extract_specific_needs 구현"""
+    needs = []
+    patterns = [
+        r"([^,\.]+)(필요|제공|포함|추가)[^,\.]*",
+        r"([^,\.]+)(데이터|정보|수치|통계)[^,\.]*",
+        r"([^,\.]+)(구체적|자세한|명확한)[^,\.]*"
+    ]
+    for pattern in patterns:
+        for match in re.findall(pattern, explanation):
+            if match[0].strip():
+                needs.append(match[0].strip())
+    return needs if needs else [explanation]
+
+
+def legacy_generate_search_keywords(section_keywords, item, business_context, section_id):
+    """이전 BusinessPlanAgent._generate_search_keywords 구현"""
+    keywords = [k for k in re.split(r'[^a-zA-Z가-힣0-9]', item["item"]) if len(k) > 1]
+    for kw in section_keywords.get(section_id, []):
+        if kw not in keywords:
+            keywords.append(kw)
+
+    context_words = [w for w in re.split(r'[^a-zA-Z가-힣0-9]', business_context) if len(w) > 1]
+    word_freq = {}
+    for word in context_words:
+        if word not in word_freq:
+            word_freq[word] = 1
+        else:
+            word_freq[word] += 1
+    for word, _ in sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:3]:
+        if word not in keywords and len(word) > 1:
+            keywords.append(word)
+
+    for need in item["specific_needs"]:
+        for word in [w for w in re.split(r'[^a-zA-Z가-힣0-9]', need) if len(w) > 1]:
+            if word not in keywords and len(word) > 1:
+                keywords.append(word)
+    return keywords[:5]
+
+
+EXPLANATIONS = [
+    "국내외 시장 규모와 성장률 데이터가 필요합니다",
+    "주요 경쟁사의 제품 특징과 한계점에 대한 구체적인 비교 정보를 제공해야 합니다, 점유율 수치도 추가",
+    "목표 고객층이 명확하지 않음",
+    "",
+    "AI기반 SaaS 가격 정책. 월 구독료 통계와 자세한 비용 구조 포함"
+]
+
+
+class TestTextProcessing(unittest.TestCase):
+    """텍스트 처리 도구 테스트"""
+
+    def test_tokenize_offsets(self):
+        """단어 위치는 원문과 일치하고, split_scripts이면 한글과 영문을 나눔"""
+        text = "AI기반 서비스, 시장 규모 3,000억"
+        tokens = list(tokenize(text))
+        self.assertEqual([token.word for token in tokens], ["AI기반", "서비스", "시장", "규모", "3", "000억"])
+        self.assertTrue(all(text[token.start:token.end] == token.word for token in tokens))
+        self.assertEqual([token.word for token in tokenize(text, min_length=2, split_scripts=True)],
+                         ["AI", "기반", "서비스", "시장", "규모", "000"])
+        self.assertTrue(tokens[1].is_hangul)
+
+    def test_frequencies_skip_stop_words(self):
+        """불용어는 빈도 계산에서 제외하고, 같은 빈도는 먼저 나온 단어 우선"""
+        text = "시장 및 고객 및 시장 및 고객 및 규모"
+        self.assertIn("및", STOP_WORDS)
+        self.assertEqual(word_frequencies(text, min_length=1)["및"], 0)
+        self.assertEqual(top_words(text, 2, min_length=1), ["시장", "고객"])
+        self.assertEqual(top_words(text, 1, min_length=1, stop_words=None), ["및"])
+
+    def test_matches_legacy_implementation(self):
+        """키워드/필요 정보 추출 결과는 이전 구현과 같음"""
+        agent = BusinessPlanAgent()
+        for explanation in EXPLANATIONS:
+            self.assertEqual(extract_needs(explanation), legacy_extract_specific_needs(explanation))
+
+        sections = list(agent.section_keywords) + ["unknown"]
+        for section_id in sections:
+            for explanation in EXPLANATIONS:
+                item = {"item": "시장 규모", "specific_needs": legacy_extract_specific_needs(explanation)}
+                # 불용어가 없는 문맥에서는 결과가 같음
+                context = "클라우드 클라우드 클라우드 구독 구독 요금"
+                self.assertEqual(
+                    agent._generate_search_keywords(item, context, section_id),
+                    legacy_generate_search_keywords(agent.section_keywords, item, context, section_id)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,14 @@
-import re
 import logging
 from typing import Dict, List, Tuple, Any, Optional
 import json
+import threading
 
+from core.section_config import get_section_config
 from utils.api_service import APIService
 from utils.data_integration import DataIntegration
+from utils.retrieval import ProposalRetriever
+from utils.search_scoring import SearchResultIndex, build_batch_index
+from utils.text_processing import extract_needs, top_words, words
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -32,14 +36,18 @@ class BusinessPlanAgent:
             "scale_up": ["성장", "확장", "전략", "로드맵", "계획", "미래", "비전"]
         }
         
-        # 정보 유형별 검색 전략
+        # 정보 유형별 검색 종류 (APIService.search_batch의 kind, 그 외는 섹션별 검색)
         self.search_strategies = {
-            "시장 규모": self._market_size_strategy,
-            "시장 트렌드": self._market_trend_strategy,
-            "경쟁사": self._competitors_strategy,
-            "성장률": self._growth_rate_strategy,
-            "수익 모델": self._revenue_model_strategy
+            "시장 규모": "market",
+            "시장 트렌드": "market",
+            "경쟁사": "competitors",
+            "성장률": "market",
+            "수익 모델": "section"
         }
+        
+        # 기획서별 검색 색인 (같은 기획서의 여러 섹션에서 재사용)
+        self._retrievers: Dict[str, ProposalRetriever] = {}
+        self._retriever_lock = threading.Lock()
     
     def analyze_missing_info(self, analysis_result: str, business_idea: str, section_id: str) -> Tuple[List[Dict], str]:
         """
@@ -55,7 +63,7 @@ class BusinessPlanAgent:
             context: 기획서에서 추출한 관련 컨텍스트
         """
         missing_items = []
-        business_context = self._extract_business_context(business_idea)
+        business_context = self._extract_business_context(business_idea, section_id)
         
         # 분석 결과에서 부족한 정보 추출
         for line in analysis_result.split('\n'):
@@ -106,31 +114,21 @@ class BusinessPlanAgent:
         # 검색 결과 저장
         search_results = {"success": True, "message": "", "data": [], "sources": []}
         
-        for item in missing_items:
-            # 키워드 생성
-            keywords = self._generate_search_keywords(item, business_context, section_id)
-            
-            if not keywords:
-                continue
-                
-            logger.info(f"'{item['item']}'에 대한 검색 키워드: {', '.join(keywords)}")
-            
-            # 정보 유형에 맞는 검색 전략 선택
-            strategy = self._select_search_strategy(item["item"])
-            
-            # 검색 수행
-            try:
-                result = strategy(keywords, section_id, business_context)
-                
-                # 검색 결과가 있으면 추가
-                if result["data"]:
-                    search_results["data"].extend(result["data"])
-                    for source in result["sources"]:
-                        if source not in search_results["sources"]:
-                            search_results["sources"].append(source)
-            except Exception as e:
-                logger.error(f"검색 중 오류 발생: {str(e)}")
-                continue
+        # 모든 항목의 검색 요청을 모아 API별로 한 번씩만 조회
+        queries = self.build_search_queries(missing_items, business_context, section_id)
+        try:
+            batch_results = self.api_service.search_batch(queries)
+        except Exception as e:
+            logger.error(f"검색 중 오류 발생: {str(e)}")
+            batch_results = []
+        
+        for result in batch_results:
+            # 검색 결과가 있으면 추가
+            if result["data"]:
+                search_results["data"].extend(result["data"])
+                for source in result["sources"]:
+                    if source not in search_results["sources"]:
+                        search_results["sources"].append(source)
         
         # 중복 데이터 제거 및 최적화
         search_results["data"] = self._optimize_search_results(search_results["data"])
@@ -144,6 +142,29 @@ class BusinessPlanAgent:
             
         return search_results
     
+    def build_search_queries(self, missing_items: List[Dict], business_context: str, section_id: str) -> List[Dict]:
+        """
+        부족한 정보 항목별 검색 요청 생성 (APIService.search_batch 형식)
+        여러 섹션의 요청을 모아 한 번에 search_batch로 전달할 수도 있습니다
+        """
+        queries = []
+        for item in missing_items:
+            # 키워드 생성
+            keywords = self._generate_search_keywords(item, business_context, section_id)
+            
+            if not keywords:
+                continue
+                
+            logger.info(f"'{item['item']}'에 대한 검색 키워드: {', '.join(keywords)}")
+            
+            # 정보 유형에 맞는 검색 종류 선택
+            queries.append({
+                "kind": self._select_search_strategy(item["item"]),
+                "keywords": keywords,
+                "section_id": section_id
+            })
+        return queries
+    
     def evaluate_search_results(self, search_results: Dict, missing_items: List[Dict], section_id: str) -> Dict:
         """
         검색 결과의 관련성 및 품질 평가
@@ -159,14 +180,46 @@ class BusinessPlanAgent:
         if not search_results["success"] or not search_results["data"]:
             return {"relevance": 0, "quality": 0, "completeness": 0}
         
+        # 결과 제목/값 색인은 한 번만 만들어 관련성과 완전성 평가에 함께 사용
+        index = SearchResultIndex(search_results["data"])
+        return self._evaluate(index, search_results["data"], missing_items)
+    
+    def evaluate_search_results_batch(self, batch: Dict[str, Tuple[Dict, List[Dict]]]) -> Dict[str, Dict]:
+        """
+        여러 섹션의 검색 결과를 한 번에 평가 (모든 섹션의 결과를 하나의 색인으로 구성)
+        
+        Args:
+            batch: 섹션 ID → (검색 결과, 부족한 정보 항목 목록)
+            
+        Returns:
+            섹션 ID → 평가 결과 (evaluate_search_results와 같은 형식)
+        """
+        evaluations = {}
+        usable = {}
+        for section_id, (search_results, missing_items) in batch.items():
+            if not search_results["success"] or not search_results["data"]:
+                evaluations[section_id] = {"relevance": 0, "quality": 0, "completeness": 0}
+            else:
+                usable[section_id] = (search_results["data"], missing_items)
+        
+        if usable:
+            index, id_lists = build_batch_index(data for data, _ in usable.values())
+            for (section_id, (data, missing_items)), result_ids in zip(usable.items(), id_lists):
+                evaluations[section_id] = self._evaluate(index, data, missing_items, result_ids)
+        
+        return {section_id: evaluations[section_id] for section_id in batch}
+    
+    def _evaluate(self, index: SearchResultIndex, data: List[Dict], missing_items: List[Dict],
+                  result_ids: Optional[List[int]] = None) -> Dict:
+        """색인을 사용한 관련성/품질/완전성 평가"""
         # 관련성 평가
-        relevance_score = self._calculate_relevance(search_results["data"], missing_items, section_id)
+        relevance_score = index.relevance(missing_items, result_ids)
         
         # 품질 평가
-        quality_score = self._calculate_quality(search_results["data"])
+        quality_score = self._calculate_quality(data)
         
         # 완전성 평가 (누락된 정보 중 얼마나 해결했는지)
-        completeness_score = self._calculate_completeness(search_results["data"], missing_items)
+        completeness_score = index.completeness(missing_items, result_ids)
         
         return {
             "relevance": relevance_score,
@@ -203,31 +256,33 @@ class BusinessPlanAgent:
         
         return recommendation
     
-    def _extract_business_context(self, business_idea: str) -> str:
-        """기획서에서 비즈니스 컨텍스트 추출"""
-        # 실제로는 더 정교한 알고리즘 사용 가능
-        # 현재는 첫 300자를 가져오는 단순한 방식 사용
-        max_length = min(300, len(business_idea))
-        return business_idea[:max_length]
+    def _get_retriever(self, business_idea: str) -> ProposalRetriever:
+        """기획서 검색 색인 반환 (기획서 내용이 같으면 재사용)"""
+        with self._retriever_lock:
+            retriever = self._retrievers.get(business_idea)
+            if retriever is None:
+                # 섹션별 문맥이 다를 수 있으므로 최근 색인 몇 개만 유지
+                if len(self._retrievers) >= 16:
+                    self._retrievers.pop(next(iter(self._retrievers)))
+                retriever = ProposalRetriever(business_idea, get_section_config())
+                self._retrievers[business_idea] = retriever
+            return retriever
+    
+    def _extract_business_context(self, business_idea: str, section_id: Optional[str] = None,
+                                  max_length: int = 600) -> str:
+        """
+        기획서에서 비즈니스 컨텍스트 추출
+        섹션이 주어지면 섹션과 관련도가 높은 문단을 원래 순서로 발췌하고, 없으면 앞부분을 사용
+        """
+        if section_id:
+            excerpt = self._get_retriever(business_idea).excerpt(section_id, k=3, max_chars=max_length)
+            if excerpt:
+                return excerpt
+        return business_idea[:min(300, len(business_idea))]
     
     def _extract_specific_needs(self, explanation: str) -> List[str]:
-        """설명에서 구체적인 필요 정보 추출"""
-        needs = []
-        
-        # "필요합니다", "필요한", "제공해야" 등의 패턴 검색
-        patterns = [
-            r"([^,\.]+)(필요|제공|포함|추가)[^,\.]*",
-            r"([^,\.]+)(데이터|정보|수치|통계)[^,\.]*",
-            r"([^,\.]+)(구체적|자세한|명확한)[^,\.]*"
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, explanation)
-            for match in matches:
-                if match[0].strip():
-                    needs.append(match[0].strip())
-        
-        return needs if needs else [explanation]
+        """설명에서 구체적인 필요 정보 추출 ("필요합니다", "데이터", "구체적" 등의 패턴 검색)"""
+        return extract_needs(explanation)
     
     def _determine_priority(self, item_name: str, section_id: str) -> int:
         """정보 항목의 우선순위 결정"""
@@ -251,83 +306,44 @@ class BusinessPlanAgent:
         
         return 0
     
-    def _generate_search_keywords(self, item: Dict, business_context: str, section_id: str) -> List[str]:
-        """검색 키워드 생성"""
-        keywords = []
-        
+    def _generate_search_keywords(self, item: Dict, business_context: str, section_id: str,
+                                  max_keywords: int = 5) -> List[str]:
+        """
+        검색 키워드 생성 (너무 많은 키워드는 검색 효과를 떨어뜨릴 수 있으므로 max_keywords개까지)
+        아이템명 → 섹션 주요 키워드 → 기획서 컨텍스트 빈도 상위 단어 → 필요 정보 단어 순서로 채우고,
+        키워드가 다 차면 나머지 단계는 건너뜀
+        """
         # 아이템명에서 키워드 추출
-        item_keywords = [k for k in re.split(r'[^a-zA-Z가-힣0-9]', item["item"]) if len(k) > 1]
-        keywords.extend(item_keywords)
-        
-        # 섹션별 주요 키워드 추가
-        section_kw = self.section_keywords.get(section_id, [])
-        for kw in section_kw:
-            if kw not in keywords:
-                keywords.append(kw)
-        
-        # 기획서 컨텍스트에서 주요 단어 추출 (간단 구현)
-        context_words = [w for w in re.split(r'[^a-zA-Z가-힣0-9]', business_context) if len(w) > 1]
-        word_freq = {}
-        
-        for word in context_words:
-            if word not in word_freq:
-                word_freq[word] = 1
-            else:
-                word_freq[word] += 1
-        
-        # 빈도 기준 상위 단어 추가
-        top_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:3]
-        for word, _ in top_words:
-            if word not in keywords and len(word) > 1:
-                keywords.append(word)
+        keywords = words(item["item"])
+        seen = set(keywords)
+        
+        def add(candidates):
+            for word in candidates:
+                if len(keywords) >= max_keywords:
+                    return
+                if word not in seen:
+                    seen.add(word)
+                    keywords.append(word)
         
-        # 필요한 경우 특정 정보 요구사항에서 키워드 추출
+        # 섹션별 주요 키워드, 기획서 컨텍스트의 빈도 상위 단어(불용어 제외), 필요 정보 단어 순서로 추가
+        add(self.section_keywords.get(section_id, []))
+        if len(keywords) < max_keywords:
+            add(top_words(business_context, 3))
         for need in item["specific_needs"]:
-            need_words = [w for w in re.split(r'[^a-zA-Z가-힣0-9]', need) if len(w) > 1]
-            for word in need_words:
-                if word not in keywords and len(word) > 1:
-                    keywords.append(word)
+            if len(keywords) >= max_keywords:
+                break
+            add(words(need))
         
-        return keywords[:5]  # 너무 많은 키워드는 검색 효과를 떨어뜨릴 수 있음
+        return keywords[:max_keywords]
     
-    def _select_search_strategy(self, item_name: str):
-        """아이템 이름에 따른 적절한 검색 전략 선택"""
-        for key, strategy in self.search_strategies.items():
+    def _select_search_strategy(self, item_name: str) -> str:
+        """아이템 이름에 따른 적절한 검색 종류 선택"""
+        for key, kind in self.search_strategies.items():
             if key in item_name:
-                return strategy
+                return kind
         
-        # 기본 전략
-        return self._default_search_strategy
-    
-    def _default_search_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """기본 검색 전략"""
-        return self.api_service.search_section_data(section_id, keywords)
-    
-    def _market_size_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """시장 규모 검색 전략"""
-        # 시장 규모에 특화된 검색
-        return self.api_service.search_market_data(keywords)
-    
-    def _market_trend_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """시장 트렌드 검색 전략"""
-        # 트렌드에 특화된 검색
-        result = self.api_service.search_market_data(keywords)
-        # 추가 소스 검색 가능
-        return result
-    
-    def _competitors_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """경쟁사 정보 검색 전략"""
-        return self.api_service.search_competitors(keywords)
-    
-    def _growth_rate_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """성장률 검색 전략"""
-        return self.api_service.search_market_data(keywords)
-    
-    def _revenue_model_strategy(self, keywords: List[str], section_id: str, context: str) -> Dict:
-        """수익 모델 검색 전략"""
-        # 비즈니스 모델 관련 정보 검색
-        result = self._default_search_strategy(keywords, section_id, context)
-        return result
+        # 기본 전략: 섹션별 우선순위 API 검색
+        return "section"
     
     def _optimize_search_results(self, data: List[Dict]) -> List[Dict]:
         """검색 결과 최적화 (중복 제거 및 정렬)"""
@@ -341,41 +357,20 @@ class BusinessPlanAgent:
             if title and title not in unique_data:
                 unique_data[title] = item
         
-        # 정렬: 데이터가 있는 항목 우선, 최신 년도 우선
-        return sorted(
-            list(unique_data.values()),
-            key=lambda x: (
-                1 if x.get("value", "") else 0,
-                int(x.get("year", "0")) if x.get("year", "0").isdigit() else 0
-            ),
-            reverse=True
-        )
+        # 정렬: 데이터가 있는 항목 우선, 최신 년도 우선 (정렬 키는 항목마다 한 번만 계산)
+        keyed = []
+        for item in unique_data.values():
+            year = str(item.get("year", "0"))
+            keyed.append(((1 if item.get("value", "") else 0, int(year) if year.isdigit() else 0), item))
+        keyed.sort(key=lambda pair: pair[0], reverse=True)
+        return [item for _, item in keyed]
     
     def _calculate_relevance(self, data: List[Dict], missing_items: List[Dict], section_id: str) -> float:
-        """검색 결과의 관련성 점수 계산"""
-        # 단순 구현 - 실제로는 더 복잡한 알고리즘 사용 가능
-        if not data or not missing_items:
-            return 0.0
-            
-        relevance_score = 0.0
-        max_score = len(missing_items)
-        
-        # 각 검색 결과가 누락된 정보와 얼마나 관련 있는지 확인
-        for item in missing_items:
-            for result in data:
-                # 제목 관련성
-                title = result.get("title", "").lower()
-                if item["item"].lower() in title:
-                    relevance_score += 1.0
-                    break
-                    
-                # 데이터 값 관련성
-                value = str(result.get("value", "")).lower()
-                if any(need.lower() in value for need in item["specific_needs"]):
-                    relevance_score += 0.5
-                    break
-        
-        return relevance_score / max_score if max_score > 0 else 0.0
+        """
+        검색 결과의 관련성 점수 계산
+        항목별로 처음 관련된 결과가 제목에 항목 이름을 포함하면 1점, 값에 세부 요구사항을 포함하면 0.5점
+        """
+        return SearchResultIndex(data).relevance(missing_items)
     
     def _calculate_quality(self, data: List[Dict]) -> float:
         """검색 결과의 품질 점수 계산"""
@@ -416,16 +411,4 @@ class BusinessPlanAgent:
     
     def _calculate_completeness(self, data: List[Dict], missing_items: List[Dict]) -> float:
         """누락된 정보 중 얼마나 해결했는지 계산"""
-        if not data or not missing_items:
-            return 0.0
-            
-        addressed_items = set()
-        
-        for item in missing_items:
-            for result in data:
-                title = result.get("title", "").lower()
-                if item["item"].lower() in title or any(need.lower() in title for need in item["specific_needs"]):
-                    addressed_items.add(item["item"])
-                    break
-        
-        return len(addressed_items) / len(missing_items) 
\ No newline at end of file
+        return SearchResultIndex(data).completeness(missing_items)
\ No newline at end of file
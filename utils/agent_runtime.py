@@ -0,0 +1,104 @@
+"""
+장기 실행 에이전트 런타임 - 하나의 백그라운드 이벤트 루프와 한 번만 만든 에이전트를 여러 기획서 처리에 공유
+"""
+import os
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from utils.agent_system import BusinessPlanAgentSystem
+
+
+class AgentRuntime:
+    """
+    BusinessPlanAgentSystem을 한 번만 만들고, 백그라운드 스레드의 이벤트 루프에서 요청을 처리
+
+    프롬프트 파일 읽기와 Agent 생성은 첫 요청 때 한 번만 수행되며,
+    submit()으로 제출한 여러 기획서는 같은 루프에서 동시에 처리됩니다.
+
+    예시:
+        runtime = get_agent_runtime()
+        futures = [runtime.submit(text, selected_sections=["problem"]) for text in texts]
+        results = [future.result() for future in futures]
+    """
+    def __init__(self, config_path: str = "data/prompts/section_config.json", max_concurrency: int = 4):
+        self.config_path = config_path
+        self.max_concurrency = max_concurrency
+        self._system: Optional[BusinessPlanAgentSystem] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def system(self) -> BusinessPlanAgentSystem:
+        """공유 에이전트 시스템 (처음 사용할 때 생성)"""
+        if self._system is None:
+            with self._lock:
+                if self._system is None:
+                    self._system = BusinessPlanAgentSystem(self.config_path, self.max_concurrency)
+        return self._system
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """백그라운드 이벤트 루프 (처음 사용할 때 시작)"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="agent-runtime", daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def submit(self, input_text: str, mode: str = "analyze", selected_sections: Optional[List[str]] = None,
+               orchestration: str = "fanout", cache_mode: str = "off") -> Future:
+        """
+        기획서 처리 요청 제출
+
+        Returns:
+            BusinessPlanAgentSystem.run_with_mode와 같은 결과를 담을 concurrent.futures.Future
+            (코루틴에서는 asyncio.wrap_future로 기다릴 수 있음)
+        """
+        system = self.system
+        return asyncio.run_coroutine_threadsafe(
+            system.process(input_text, mode, selected_sections, orchestration, cache_mode), self.loop
+        )
+
+    def run(self, input_text: str, mode: str = "analyze", selected_sections: Optional[List[str]] = None,
+            orchestration: str = "fanout", cache_mode: str = "off") -> Dict[str, Any]:
+        """요청을 제출하고 결과를 기다림"""
+        return self.submit(input_text, mode, selected_sections, orchestration, cache_mode).result()
+
+    def close(self):
+        """이벤트 루프 종료 (진행 중인 요청은 취소)"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop)
+        thread.join()
+        loop.close()
+
+
+_runtime = None
+_runtime_pid = None
+_runtime_lock = threading.Lock()
+
+
+def get_agent_runtime() -> AgentRuntime:
+    """프로세스 전체에서 공유하는 에이전트 런타임 반환 (fork된 작업자 프로세스는 새 런타임 사용)"""
+    global _runtime, _runtime_pid
+    if _runtime is None or _runtime_pid != os.getpid():
+        with _runtime_lock:
+            if _runtime is None or _runtime_pid != os.getpid():
+                _runtime = AgentRuntime()
+                _runtime_pid = os.getpid()
+    return _runtime
@@ -3,44 +3,63 @@ OpenAI Agents SDK를 사용한 비즈니스 플랜 작성 시스템
 """
 import os
 import json
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
+import weakref
+from typing import Callable, List, Dict, Any, Optional
 
 from agents import Agent, Runner, function_tool
 from utils.api_service import APIService
+from utils.prompt_registry import get_prompt_registry
+from utils.streaming import PlaceholderScanner
+from utils.coverage import CoverageScorer
+from utils.chunking import CONTEXT_TOKEN_BUDGET, SUMMARY_CHUNK_TOKENS, SectionContextBuilder, chunk_by_tokens, estimate_tokens
+from utils.llm_cache import CACHE_MODES, get_llm_cache
+from utils.reference_index import get_reference_index
+from core.section_config import get_section_config
 
 class BusinessPlanAgentSystem:
     """
     OpenAI Agents SDK를 활용한 비즈니스 플랜 에이전트 시스템
     """
-    def __init__(self, config_path="data/prompts/section_config.json"):
+    # 처리 방식: "fanout"(분석 후 섹션 에이전트 동시 실행) 또는 "coordinator"(조율 에이전트의 순차 핸드오프)
+    ORCHESTRATIONS = ("fanout", "coordinator")
+    
+    # 섹션 에이전트에 함께 전달할 작성 가이드 구절 수와 구절별 최대 글자 수
+    GUIDANCE_PASSAGES = 2
+    GUIDANCE_CHARS = 500
+    
+    def __init__(self, config_path="data/prompts/section_config.json", max_concurrency: int = 4,
+                 context_tokens: Optional[int] = CONTEXT_TOKEN_BUDGET):
         self.api_service = APIService()
+        self.max_concurrency = max_concurrency
+        # 같은 이벤트 루프에서 동시에 처리되는 기획서들이 공유하는 섹션 에이전트 동시 실행 제한
+        self._semaphores = weakref.WeakKeyDictionary()
         self.config_path = config_path
-        self.sections_config = self._load_sections_config()
+        self.section_config = get_section_config(config_path)
+        # 섹션 에이전트에 전달할 기획서 문맥 (토큰 예산을 넘으면 관련 문단만 선택)
+        self.context_builder = SectionContextBuilder(list(self.section_config), context_tokens)
         
         # 에이전트 초기화
         self.analyzer_agent = self._create_analyzer_agent()
         self.search_agent = self._create_search_agent()
         self.section_agents = self._create_section_agents()
         self.coordinator_agent = self._create_coordinator_agent()
-    
-    def _load_sections_config(self) -> Dict[str, Any]:
-        """섹션 설정 파일 로드"""
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.consistency_agent = self._create_consistency_agent()
+        self.summarizer_agent = self._create_summarizer_agent()
     
     def _load_prompt_from_file(self, filename: str) -> str:
-        """프롬프트 파일 로드"""
+        """프롬프트 파일 로드 (프롬프트 레지스트리에 캐시된 템플릿 사용)"""
         prompt_path = f"data/prompts/{filename}"
-        if not os.path.exists(prompt_path):
+        template = get_prompt_registry().get(prompt_path)
+        if template is None:
             if filename.startswith("generation_prompts/"):
                 os.makedirs("data/prompts/generation_prompts", exist_ok=True)
             elif filename.startswith("analysis_prompts/"):
                 os.makedirs("data/prompts/analysis_prompts", exist_ok=True)
             return ""  # 파일이 없으면 빈 문자열 반환
         
-        with open(prompt_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return template.text
     
     def _create_analyzer_agent(self) -> Agent:
         """분석 에이전트 생성"""
@@ -57,79 +76,15 @@ class BusinessPlanAgentSystem:
             분석 결과는 구체적이고 실행 가능한 제안으로 제공하세요.
             """
         
+        # 섹션 키워드와 필수 요소 검색기는 한 번만 만들어 재사용
+        scorer = CoverageScorer(self.section_config)
+        
         @function_tool
         def analyze_business_plan(plan_text: str) -> Dict[str, Any]:
             """
             비즈니스 플랜을 분석하여 누락된 정보와 개선점 식별
             """
-            analysis = {
-                "missing_info": [],
-                "improvements": [],
-                "section_analysis": {}
-            }
-            
-            # 각 섹션별 키워드 정의
-            section_keywords = {
-                "problem": ["문제", "고객 페인 포인트", "필요성", "시장 현황"],
-                "solution": ["제품", "서비스", "해결 방안", "기술", "특징"],
-                "market": ["시장 규모", "TAM", "SAM", "SOM", "성장률", "타겟 시장"],
-                "business_model": ["수익 모델", "가격", "비용 구조", "마진", "수익성"],
-                "competition": ["경쟁사", "차별점", "경쟁 우위", "진입 장벽"],
-                "team": ["팀원", "역량", "경험", "전문성"],
-                "financials": ["매출", "비용", "손익", "투자", "ROI"],
-                "scale_up": ["성장 전략", "확장성", "로드맵"]
-            }
-            
-            for section in self.sections_config.get("sections", []):
-                section_id = section.get("id")
-                section_title = section.get("title")
-                required_elements = section.get("required_elements", [])
-                
-                if isinstance(required_elements[0], dict) if required_elements else False:
-                    element_names = [element.get('name', '') for element in required_elements]
-                else:
-                    element_names = required_elements
-                
-                # 섹션별 키워드 검출 및 점수 계산
-                keyword_count = 0
-                total_keywords = len(section_keywords.get(section_id, []))
-                if total_keywords > 0:
-                    for keyword in section_keywords.get(section_id, []):
-                        if keyword.lower() in plan_text.lower():
-                            keyword_count += 1
-                    
-                    completeness = min(1.0, keyword_count / total_keywords)
-                else:
-                    completeness = 0.5  # 기본값
-                
-                # 누락된 요소 식별
-                missing = []
-                for element in element_names:
-                    element_keywords = element.lower().split()
-                    found = False
-                    for keyword in element_keywords:
-                        if len(keyword) > 3 and keyword in plan_text.lower():
-                            found = True
-                            break
-                    
-                    if not found:
-                        missing.append(element)
-                
-                # 섹션 분석 저장
-                analysis["section_analysis"][section_id] = {
-                    "title": section_title,
-                    "completeness": completeness,
-                    "missing_elements": missing,
-                    "suggestions": [
-                        f"{element}에 대한 구체적인 정보 추가 필요" for element in missing
-                    ] if missing else ["섹션 완성도 높음"]
-                }
-                
-                # 전체 분석에 추가
-                if missing:
-                    analysis["missing_info"].append(f"{section_title}에서 {', '.join(missing)}에 대한 정보 필요")
-            
-            return analysis
+            return scorer.score(plan_text)
         
         return Agent(
             name="비즈니스 플랜 분석가",
@@ -175,21 +130,14 @@ class BusinessPlanAgentSystem:
         """각 섹션별 작성 에이전트 생성"""
         section_agents = {}
         
-        for section in self.sections_config.get("sections", []):
-            section_id = section.get("id")
-            section_title = section.get("title")
+        for section in self.section_config:
+            section_id = section.id
+            section_title = section.original_title
             prompt_file = f"generation_prompts/{section_id}_agent.txt"
             instructions = self._load_prompt_from_file(prompt_file)
             
             if not instructions:
-                # required_elements가 딕셔너리 목록인 경우 name 필드만 추출
-                required_elements = section.get('required_elements', [])
-                element_names = []
-                
-                if required_elements and isinstance(required_elements[0], dict):
-                    element_names = [element.get('name', '') for element in required_elements]
-                else:
-                    element_names = required_elements
+                element_names = section.element_names
                 
                 instructions = f"""
                 당신은 비즈니스 플랜의 {section_title} 섹션 작성 전문가입니다.
@@ -200,6 +148,7 @@ class BusinessPlanAgentSystem:
                 3. 이 섹션의 목적: {section.get('purpose', '목적 정보 없음')}
                 
                 분석 결과와 검색 데이터를 활용하여 완성도 높은 섹션을 작성하세요.
+                작성 가이드(writing_guidance)가 주어지면 그 권고를 따르세요.
                 """
             
             section_agents[section_id] = Agent(
@@ -236,13 +185,87 @@ class BusinessPlanAgentSystem:
             handoffs=handoffs
         )
     
-    async def process_business_plan(self, input_text: str, selected_sections: Optional[List[str]] = None) -> Dict[str, Any]:
+    def _create_consistency_agent(self) -> Agent:
+        """일관성 검토 에이전트 생성 (섹션을 다시 쓰지 않고 문제점만 짧게 보고)"""
+        instructions = self._load_prompt_from_file("consistency_agent.txt")
+        if not instructions:
+            instructions = """
+            당신은 비즈니스 플랜 검토자입니다.
+            여러 작성자가 동시에 작성한 섹션들을 읽고, 섹션 간에 서로 맞지 않는 부분만 찾아주세요:
+            1. 수치(시장 규모, 가격, 매출 목표 등)의 불일치
+            2. 제품/서비스 이름이나 타겟 고객 정의의 불일치
+            
+            섹션을 다시 작성하지 말고, 발견한 문제를 섹션 이름과 함께 한 줄씩 나열하세요.
+            문제가 없으면 "일관성 문제 없음"이라고만 답하세요.
+            """
+        
+        return Agent(
+            name="비즈니스 플랜 일관성 검토자",
+            instructions=instructions
+        )
+    
+    def _create_summarizer_agent(self) -> Agent:
+        """기획서 요약 에이전트 생성"""
+        instructions = """
+        당신은 비즈니스 기획서 요약 전문가입니다. 
+        제공된 기획서 텍스트를 분석하고, 핵심 내용을 누락 없이 요약해주세요.
+        원본의 주요 아이디어, 비즈니스 모델, 시장 분석, 차별점 등 중요 정보를 
+        모두 포함해야 합니다.
+        요약은 원본의 구조를 유지하되, 간결하게 작성해주세요.
+        """
+        
+        return Agent(
+            name="기획서 요약가",
+            instructions=instructions
+        )
+    
+    async def _run_agent_streamed(self, agent: Agent, input_text: str, max_turns: int,
+                                  on_text: Optional[Callable[[str], None]] = None, cache_mode: str = "off") -> str:
+        """
+        에이전트를 스트리밍 모드로 실행하고 최종 출력 반환
+        에이전트 전환과 필요 정보 표시를 생성되는 대로 출력하며, on_text에는 출력 텍스트 조각이 전달됩니다
+        cache_mode가 "read" 또는 "readwrite"이면 같은 에이전트(지침, 모델)와 입력의 이전 출력을 재사용합니다
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"알 수 없는 캐시 방식입니다: {cache_mode}")
+        cache_id = f"agent:{agent.name}:{agent.model or ''}"
+        cache_prompt = f"{agent.instructions}\0{input_text}"
+        cache_type = f"max_turns={max_turns}"
+        if cache_mode != "off":
+            cached = get_llm_cache().get(cache_id, cache_prompt, cache_type)
+            if cached is not None:
+                print(f"♻️ {agent.name}의 캐시된 결과를 사용합니다.")
+                if on_text:
+                    on_text(cached)
+                return cached
+        
+        result = Runner.run_streamed(agent, input=input_text, max_turns=max_turns)
+        scanner = PlaceholderScanner()
+        
+        async for event in result.stream_events():
+            if event.type == "agent_updated_stream_event":
+                print(f"🤖 {event.new_agent.name} 작업 중...")
+            elif event.type == "raw_response_event" and getattr(event.data, "type", "") == "response.output_text.delta":
+                delta = event.data.delta
+                if on_text:
+                    on_text(delta)
+                for placeholder in scanner.feed(delta):
+                    print(f"🔎 필요 정보 감지: {placeholder}")
+        
+        if cache_mode == "readwrite" and isinstance(result.final_output, str) and result.final_output:
+            get_llm_cache().set(cache_id, cache_prompt, result.final_output, cache_type)
+        return result.final_output
+    
+    async def process_business_plan(self, input_text: str, selected_sections: Optional[List[str]] = None,
+                                    on_text: Optional[Callable[[str], None]] = None,
+                                    cache_mode: str = "off") -> Dict[str, Any]:
         """
         비즈니스 플랜 처리 주 함수
+        on_text를 지정하면 생성되는 출력 텍스트를 조각 단위로 전달받습니다
         """
         # 선택된 섹션이 없으면 모든 섹션 사용
         if not selected_sections:
-            selected_sections = [section.get("id") for section in self.sections_config.get("sections", [])]
+            selected_sections = self.section_config.ids
         
         # 조율 에이전트에 초기 요청 전송
         input_message = {
@@ -250,19 +273,134 @@ class BusinessPlanAgentSystem:
             "selected_sections": selected_sections
         }
         
-        # 에이전트 실행
-        result = await Runner.run(
-            self.coordinator_agent, 
-            input=json.dumps(input_message),
-            max_turns=20
+        # 에이전트 실행 (스트리밍)
+        final_output = await self._run_agent_streamed(
+            self.coordinator_agent,
+            json.dumps(input_message),
+            max_turns=20,
+            on_text=on_text,
+            cache_mode=cache_mode
         )
         
         # 결과 처리 및 반환
         return {
-            "final_output": result.final_output,
-            "sections": self._extract_sections_from_output(result.final_output)
+            "final_output": final_output,
+            "sections": self._extract_sections_from_output(final_output)
+        }
+    
+    def _writing_guidance(self, section_ids: List[str]) -> Dict[str, List[str]]:
+        """섹션별 작성 가이드 구절 (references/, data/templates/ 색인 검색, 색인을 쓸 수 없으면 빈 사전)"""
+        try:
+            index = get_reference_index()
+            return {
+                section_id: [passage["text"][:self.GUIDANCE_CHARS]
+                             for passage in index.section_passages(section_id, self.GUIDANCE_PASSAGES)]
+                for section_id in section_ids
+            }
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 작성 가이드 색인을 사용할 수 없습니다: {str(e)}")
+            return {}
+    
+    async def process_business_plan_fanout(self, input_text: str, selected_sections: Optional[List[str]] = None,
+                                           max_concurrency: Optional[int] = None,
+                                           cache_mode: str = "off") -> Dict[str, Any]:
+        """
+        분석 에이전트를 한 번 실행한 뒤 선택된 섹션 에이전트를 동시에 실행하고, 마지막에 일관성 검토 수행
+        
+        Returns:
+            final_output, sections(섹션 ID → 내용), consistency_notes, timings(에이전트별 소요 시간, 초)
+        """
+        if not selected_sections:
+            selected_sections = self.section_config.ids
+        section_ids = [section_id for section_id in selected_sections if section_id in self.section_agents]
+        timings = {}
+        started = time.monotonic()
+        
+        # 1단계: 분석 (한 번만, 그동안 섹션별 작성 가이드 검색)
+        analysis, guidance = await asyncio.gather(
+            self._timed("analyzer", timings, self._run_agent_streamed(
+                self.analyzer_agent, input_text, max_turns=3, cache_mode=cache_mode
+            )),
+            asyncio.to_thread(self._writing_guidance, section_ids)
+        )
+        
+        # 2단계: 섹션 에이전트 동시 실행 (동시 실행 수 제한, 섹션별로 관련 문맥만 전달)
+        contexts = self.context_builder.build(input_text)
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else self._get_semaphore()
+        
+        async def write_section(section_id):
+            section = self.section_config.get(section_id)
+            section_input = json.dumps({
+                "business_plan_draft": contexts.get(section_id, input_text),
+                "analysis": analysis,
+                "section_id": section_id,
+                "section_title": section.original_title,
+                "writing_guidance": guidance.get(section_id, [])
+            }, ensure_ascii=False)
+            async with semaphore:
+                return await self._timed(f"section:{section_id}", timings, self._run_agent_streamed(
+                    self.section_agents[section_id], section_input, max_turns=3, cache_mode=cache_mode
+                ))
+        
+        outputs = await asyncio.gather(*(write_section(section_id) for section_id in section_ids),
+                                       return_exceptions=True)
+        
+        sections = {}
+        for section_id, output in zip(section_ids, outputs):
+            if isinstance(output, Exception):
+                print(f"❌ {section_id} 섹션 작성 중 오류 발생: {str(output)}")
+            elif output:
+                sections[section_id] = output
+        
+        # 3단계: 일관성 검토 (섹션별 앞부분만 전달하여 비용 절감)
+        consistency_notes = ""
+        if len(sections) > 1:
+            review_input = "\n\n".join(
+                f"## {self.section_config.get(section_id).original_title}\n{content[:1500]}"
+                for section_id, content in sections.items()
+            )
+            try:
+                consistency_notes = await self._timed("consistency", timings, self._run_agent_streamed(
+                    self.consistency_agent, review_input, max_turns=1, cache_mode=cache_mode
+                ))
+            except Exception as e:
+                print(f"⚠️ 일관성 검토 중 오류 발생: {str(e)}")
+        
+        timings["total"] = time.monotonic() - started
+        self._print_timings(timings)
+        
+        final_output = "\n\n".join(
+            f"# {self.section_config.get(section_id).original_title}\n{content}"
+            for section_id, content in sections.items()
+        )
+        return {
+            "final_output": final_output,
+            "sections": sections,
+            "consistency_notes": consistency_notes,
+            "timings": timings
         }
     
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """현재 이벤트 루프의 섹션 에이전트 동시 실행 제한 반환"""
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop]
+    
+    async def _timed(self, name: str, timings: Dict[str, float], coro):
+        """코루틴 실행 시간을 timings[name]에 기록"""
+        started = time.monotonic()
+        try:
+            return await coro
+        finally:
+            timings[name] = time.monotonic() - started
+    
+    def _print_timings(self, timings: Dict[str, float]):
+        """에이전트별 소요 시간 출력"""
+        print("\n⏱️ 에이전트별 소요 시간:")
+        for name, elapsed in timings.items():
+            print(f"  - {name}: {elapsed:.1f}초")
+    
     def _extract_sections_from_output(self, output: str) -> Dict[str, str]:
         """
         최종 출력에서 각 섹션 내용 추출
@@ -295,7 +433,8 @@ class BusinessPlanAgentSystem:
         """
         return asyncio.run(self.process_business_plan(input_text, selected_sections))
     
-    def run_with_mode(self, input_text: str, mode: str = "analyze", selected_sections: Optional[List[str]] = None) -> Dict[str, Any]:
+    def run_with_mode(self, input_text: str, mode: str = "analyze", selected_sections: Optional[List[str]] = None,
+                      orchestration: str = "fanout", cache_mode: str = "off") -> Dict[str, Any]:
         """
         다양한 모드로 입력 처리
         
@@ -303,16 +442,61 @@ class BusinessPlanAgentSystem:
             input_text: 원본 기획서 텍스트
             mode: "raw" (원본 그대로), "summarize" (요약) 또는 "analyze" (분석)
             selected_sections: 처리할 섹션 목록
+            orchestration: "analyze" 모드의 처리 방식 ("fanout" 또는 "coordinator")
+            cache_mode: 에이전트 출력 캐시 사용 방식 ("off", "read", "readwrite")
             
         Returns:
             처리된 결과
         """
+        return asyncio.run(self.process(input_text, mode, selected_sections, orchestration, cache_mode))
+    
+    async def process(self, input_text: str, mode: str = "analyze", selected_sections: Optional[List[str]] = None,
+                      orchestration: str = "fanout", cache_mode: str = "off") -> Dict[str, Any]:
+        """run_with_mode의 비동기 버전 (이미 실행 중인 이벤트 루프에서 사용, AgentRuntime 참고)"""
         if mode == "raw" or mode == "summarize":
-            return asyncio.run(self.process_proposal_content(input_text, mode))
-        else:
-            return asyncio.run(self.process_business_plan(input_text, selected_sections))
+            return await self.process_proposal_content(input_text, mode, cache_mode=cache_mode)
+        if orchestration == "coordinator":
+            return await self._run_coordinator_timed(input_text, selected_sections, cache_mode)
+        return await self.process_business_plan_fanout(input_text, selected_sections, cache_mode=cache_mode)
+    
+    async def _run_coordinator_timed(self, input_text: str, selected_sections: Optional[List[str]] = None,
+                                     cache_mode: str = "off") -> Dict[str, Any]:
+        """조율 에이전트 방식 실행 (처리 방식 비교를 위해 소요 시간 기록)"""
+        timings = {}
+        result = await self._timed("coordinator", timings, self.process_business_plan(
+            input_text, selected_sections, cache_mode=cache_mode
+        ))
+        self._print_timings(timings)
+        result["timings"] = timings
+        return result
     
-    async def process_proposal_content(self, input_text: str, mode: str = "summarize") -> Dict[str, Any]:
+    async def _summarize(self, text: str, on_text: Optional[Callable[[str], None]] = None,
+                         cache_mode: str = "off", depth: int = 0) -> str:
+        """
+        요약 에이전트 실행
+        토큰 예산을 넘는 긴 기획서는 청크별로 동시에 요약(map)한 뒤, 합친 요약을 다시 요약(reduce)합니다
+        """
+        if estimate_tokens(text) <= SUMMARY_CHUNK_TOKENS or depth >= 3:
+            return await self._run_agent_streamed(self.summarizer_agent, text, max_turns=3, on_text=on_text,
+                                                  cache_mode=cache_mode)
+        
+        chunks = chunk_by_tokens(text, SUMMARY_CHUNK_TOKENS)
+        print(f"📚 기획서가 길어 {len(chunks)}개 부분으로 나누어 요약합니다...")
+        semaphore = self._get_semaphore()
+        
+        async def summarize_chunk(index, chunk):
+            async with semaphore:
+                return await self._run_agent_streamed(
+                    self.summarizer_agent, f"[기획서 {index}/{len(chunks)} 부분]\n{chunk}", max_turns=1,
+                    cache_mode=cache_mode
+                )
+        
+        summaries = await asyncio.gather(*(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks, 1)))
+        return await self._summarize("\n\n".join(summaries), on_text, cache_mode, depth + 1)
+    
+    async def process_proposal_content(self, input_text: str, mode: str = "summarize",
+                                       on_text: Optional[Callable[[str], None]] = None,
+                                       cache_mode: str = "off") -> Dict[str, Any]:
         """
         proposals 내용 처리
         
@@ -331,26 +515,9 @@ class BusinessPlanAgentSystem:
             }
         
         # 요약 모드: Agent를 사용하여 내용 요약
-        instructions = """
-        당신은 비즈니스 기획서 요약 전문가입니다. 
-        제공된 기획서 텍스트를 분석하고, 핵심 내용을 누락 없이 요약해주세요.
-        원본의 주요 아이디어, 비즈니스 모델, 시장 분석, 차별점 등 중요 정보를 
-        모두 포함해야 합니다.
-        요약은 원본의 구조를 유지하되, 간결하게 작성해주세요.
-        """
-        
-        summarizer_agent = Agent(
-            name="기획서 요약가",
-            instructions=instructions
-        )
-        
-        result = await Runner.run(
-            summarizer_agent,
-            input=input_text,
-            max_turns=3
-        )
+        final_output = await self._summarize(input_text, on_text, cache_mode)
         
         return {
-            "final_output": result.final_output,
-            "sections": self._extract_sections_from_output(result.final_output)
+            "final_output": final_output,
+            "sections": self._extract_sections_from_output(final_output)
         } 
\ No newline at end of file
@@ -1,9 +1,16 @@
 import requests
 import json
 import os
+import time
+import asyncio
 import logging
+import threading
 from typing import Dict, List, Optional, Any
 
+from utils.http_transport import HTTPTransportError, get_transport, run_coroutine
+from utils.provider_registry import ProviderRegistry
+from utils.response_cache import ResponseCache, get_response_cache
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("APIService")
@@ -11,11 +18,67 @@ logger = logging.getLogger("APIService")
 class APIService:
     """
     다양한 한국 데이터 API를 활용하여 사업계획서에 필요한 정보를 검색하는 서비스
+
+    API 설정에 search_path가 있으면 base_url + search_path로 실제 HTTP 요청을 보내고
+    ({"data": [...]} 형식의 JSON 응답 기대), 없으면 예시 데이터를 반환합니다.
+    선택 설정: api_key_param(기본값 "apiKey"), timeout, retries, max_concurrency,
+    cache_ttl(응답 캐시 유효 기간, 초)
     """
+    # API 이름 → 출처 표시
+    API_SOURCES = {
+        "kosis": "통계청 KOSIS",
+        "kisti": "KISTI",
+        "ecos": "한국은행 ECOS",
+        "public_data_portal": "공공데이터 포털"
+    }
+    
+    # 우선 순위 API 목록 (각 섹션별 최적의 API 순서)
+    SECTION_API_PRIORITIES = {
+        "problem": ["kosis", "public_data_portal", "kisti"],
+        "market": ["kosis", "public_data_portal", "kisti"],
+        "competition": ["kisti", "public_data_portal", "kosis"],
+        "scale_up": ["ecos", "kosis", "public_data_portal"],
+        "financials": ["ecos", "kosis", "public_data_portal"],
+        # 기본값: 모든 API 시도
+        "default": ["kosis", "kisti", "ecos", "public_data_portal"]
+    }
+    
+    # 검색 종류별 (API, 검색 유형) 목록 - search_batch에서 사용
+    QUERY_KIND_APIS = {
+        "market": [("kosis", "general"), ("public_data_portal", "market")],
+        "competitors": [("kisti", "competitors")],
+        "economic": [("ecos", "general")]
+    }
     
-    def __init__(self):
+    def __init__(self, transport=None, cache=None):
+        # 제공자 레지스트리 (사용 가능 여부와 제공자별 상태 추적)
+        self.registry = ProviderRegistry()
         # API 키 로드 (환경 변수 또는 설정 파일에서)
         self.config = self._load_api_config()
+        # HTTP 전송 계층 (기본값: 프로세스 전체에서 공유하는 연결 풀)
+        self.transport = transport or get_transport()
+        # API 응답 캐시 (None이면 공유 디스크 캐시를 처음 사용할 때 열고, False이면 사용 안 함)
+        self._cache = cache
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+    
+    @property
+    def config(self) -> Dict:
+        """API 설정"""
+        return self._config
+    
+    @config.setter
+    def config(self, config: Dict):
+        # 설정이 바뀔 때만 사용 가능 여부를 다시 계산
+        self._config = config
+        self.registry.refresh(config)
+    
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """API 응답 캐시"""
+        if self._cache is None:
+            self._cache = get_response_cache()
+        return self._cache or None
         
     def _load_api_config(self) -> Dict:
         """API 설정 파일 로드"""
@@ -64,16 +127,16 @@ class APIService:
             return {}
     
     def check_api_availability(self) -> Dict[str, bool]:
-        """사용 가능한 API 서비스 확인"""
-        availability = {}
-        
-        for api_name, api_config in self.config.items():
-            if api_config.get("api_key"):
-                availability[api_name] = True
-            else:
-                availability[api_name] = False
-        
-        return availability
+        """사용 가능한 API 서비스 확인 (설정 로드 시 한 번 계산된 값 사용)"""
+        return dict(self.registry.availability)
+    
+    def get_provider_health(self) -> Dict[str, Dict]:
+        """제공자별 사용 가능 여부와 상태(서킷 상태, 오류율, 응답 시간 평균)"""
+        return self.registry.snapshot()
+    
+    def _is_usable(self, api_name: str) -> bool:
+        """API 키가 설정되어 있고 서킷이 열려 있지 않은지 확인"""
+        return self.registry.is_available(api_name) and not self.registry.health(api_name).is_open()
     
     def search_market_data(self, keywords: List[str], industry_code: Optional[str] = None) -> Dict:
         """
@@ -82,11 +145,8 @@ class APIService:
         """
         results = {"data": [], "sources": []}
         
-        # API 사용 가능 여부 확인
-        availability = self.check_api_availability()
-        
         # KOSIS API 사용 (통계청)
-        if availability.get("kosis"):
+        if self._is_usable("kosis"):
             try:
                 kosis_results = self._search_kosis(keywords, industry_code)
                 if kosis_results:
@@ -96,7 +156,7 @@ class APIService:
                 logger.error(f"KOSIS API 검색 중 오류 발생: {str(e)}")
         
         # 공공데이터 포털 API 사용
-        if availability.get("public_data_portal"):
+        if self._is_usable("public_data_portal"):
             try:
                 public_data_results = self._search_public_data_portal(keywords, "market")
                 if public_data_results:
@@ -114,11 +174,8 @@ class APIService:
         """
         results = {"data": [], "sources": []}
         
-        # API 사용 가능 여부 확인
-        availability = self.check_api_availability()
-        
         # KISTI API 사용
-        if availability.get("kisti"):
+        if self._is_usable("kisti"):
             try:
                 kisti_results = self._search_kisti(keywords, "competitors")
                 if kisti_results:
@@ -136,11 +193,8 @@ class APIService:
         """
         results = {"data": [], "sources": []}
         
-        # API 사용 가능 여부 확인
-        availability = self.check_api_availability()
-        
         # ECOS API 사용 (한국은행)
-        if availability.get("ecos"):
+        if self._is_usable("ecos"):
             try:
                 ecos_results = self._search_ecos(keywords)
                 if ecos_results:
@@ -151,60 +205,65 @@ class APIService:
         
         return results
     
-    def search_section_data(self, section_id: str, keywords: List[str]) -> Dict:
+    def search_section_data(self, section_id: str, keywords: List[str], min_results: int = 3) -> Dict:
         """
         섹션별 필요 데이터 검색
-        섹션 ID에 따라 적합한 API 선택하고, 해당 API가 사용 불가능하면 다른 API도 시도
+        섹션 ID에 따라 적합한 API를 모두 동시에 조회하고, 충분한 데이터가 모이면 나머지 요청은 취소
         """
+        return run_coroutine(self.search_section_data_async(section_id, keywords, min_results))
+    
+    async def search_section_data_async(self, section_id: str, keywords: List[str], min_results: int = 3) -> Dict:
+        """search_section_data의 비동기 버전"""
         results = {"data": [], "sources": []}
-        available_apis = {k: v for k, v in self.check_api_availability().items() if v}
-        
-        # 우선 순위 API 목록 (각 섹션별 최적의 API 순서)
-        primary_apis = {
-            "problem": ["kosis", "public_data_portal", "kisti"],
-            "market": ["kosis", "public_data_portal", "kisti"],
-            "competition": ["kisti", "public_data_portal", "kosis"],
-            "scale_up": ["ecos", "kosis", "public_data_portal"],
-            "financials": ["ecos", "kosis", "public_data_portal"],
-            # 기본값: 모든 API 시도
-            "default": ["kosis", "kisti", "ecos", "public_data_portal"]
-        }
         
         # 섹션에 맞는 API 우선순위 결정
-        priority_list = primary_apis.get(section_id, primary_apis["default"])
+        priority_list = self.SECTION_API_PRIORITIES.get(section_id, self.SECTION_API_PRIORITIES["default"])
         
-        # 가용한 API 중 우선순위에 따라 데이터 검색 시도
+        # 사용할 수 없거나 서킷이 열린 API는 제외하고, 느리거나 오류가 잦은 API는 뒤로 보냄
+        eligible_apis = self.registry.route(priority_list)
         for api_name in priority_list:
-            if api_name not in available_apis or not available_apis[api_name]:
+            if api_name not in eligible_apis:
                 logger.info(f"API '{api_name}'는 사용할 수 없습니다. 다음 API를 시도합니다.")
-                continue
-            
+        
+        # 가용한 API에 동시에 검색 요청
+        tasks = {}
+        for api_name in eligible_apis:
             logger.info(f"API '{api_name}'를 사용하여 데이터를 검색합니다.")
-            
-            # API별 검색 수행
-            api_results = None
-            
-            if api_name == "kosis":
-                api_results = self._search_kosis(keywords)
-            elif api_name == "kisti":
-                search_type = "competitors" if section_id == "competition" else "general"
-                api_results = self._search_kisti(keywords, search_type)
-            elif api_name == "ecos":
-                api_results = self._search_ecos(keywords)
-            elif api_name == "public_data_portal":
-                search_type = "market" if section_id in ["problem", "market"] else "general"
-                api_results = self._search_public_data_portal(keywords, search_type)
-            
-            # 결과가 있으면 추가
-            if api_results and api_results.get("data"):
-                results["data"].extend(api_results["data"])
-                results["sources"].extend(api_results["sources"])
-                logger.info(f"API '{api_name}'에서 {len(api_results['data'])}개의 데이터를 찾았습니다.")
-            
-            # 충분한 데이터를 찾았으면 검색 중단
-            if len(results["data"]) >= 3:
-                logger.info(f"충분한 데이터를 찾았습니다. 검색을 중단합니다.")
-                break
+            search_type = self._get_search_type(api_name, section_id)
+            tasks[asyncio.ensure_future(self._search_api_async(api_name, keywords, search_type))] = api_name
+        
+        api_results_by_name = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    api_name = tasks[task]
+                    try:
+                        api_results = task.result()
+                    except Exception as e:
+                        logger.error(f"API '{api_name}' 검색 중 오류 발생: {str(e)}")
+                        continue
+                    
+                    if api_results and api_results.get("data"):
+                        api_results_by_name[api_name] = api_results
+                        logger.info(f"API '{api_name}'에서 {len(api_results['data'])}개의 데이터를 찾았습니다.")
+                
+                # 충분한 데이터를 찾았으면 나머지 검색 취소
+                if pending and sum(len(r["data"]) for r in api_results_by_name.values()) >= min_results:
+                    logger.info(f"충분한 데이터를 찾았습니다. 검색을 중단합니다.")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        # 완료 순서와 관계없이 우선순위 순서로 결과 결합
+        for api_name in eligible_apis:
+            if api_name in api_results_by_name:
+                results["data"].extend(api_results_by_name[api_name]["data"])
+                results["sources"].extend(api_results_by_name[api_name]["sources"])
         
         # API 키가 없거나 모든 API 검색에서 데이터를 찾지 못한 경우 더미 데이터 제공
         if not results["data"]:
@@ -214,6 +273,184 @@ class APIService:
         
         return results
     
+    def search_batch(self, queries: List[Dict]) -> List[Dict]:
+        """
+        여러 검색 요청을 API별로 묶어 한 번씩만 조회한 뒤 요청별 결과로 나누어 반환
+
+        Args:
+            queries: {"kind", "keywords", "section_id"} 목록
+                kind는 "section"(섹션별 우선순위 API), "market", "competitors", "economic" 중 하나
+
+        Returns:
+            queries와 같은 순서의 {"data", "sources"} 목록
+        """
+        return run_coroutine(self.search_batch_async(queries))
+    
+    async def search_batch_async(self, queries: List[Dict]) -> List[Dict]:
+        """search_batch의 비동기 버전"""
+        # 요청별로 조회할 (API, 검색 유형)을 정하고, 같은 조합의 키워드를 합침
+        query_calls = []
+        merged_keywords = {}
+        for query in queries:
+            calls = self._plan_query(query)
+            query_calls.append(calls)
+            for call in calls:
+                merged_keywords.setdefault(call, {}).update(dict.fromkeys(query["keywords"]))
+        
+        # (API, 검색 유형)별로 한 번씩 동시에 조회
+        calls = list(merged_keywords)
+        logger.info(f"{len(queries)}개의 검색 요청을 {len(calls)}개의 API 조회로 묶었습니다.")
+        responses = await asyncio.gather(
+            *(self._search_api_async(api_name, list(merged_keywords[(api_name, search_type)]), search_type)
+              for api_name, search_type in calls),
+            return_exceptions=True
+        )
+        response_by_call = {}
+        for call, response in zip(calls, responses):
+            if isinstance(response, Exception):
+                logger.error(f"API '{call[0]}' 검색 중 오류 발생: {str(response)}")
+            elif response and response.get("data"):
+                response_by_call[call] = response
+        
+        # 결과를 원래 요청별로 분배
+        results = []
+        for query, calls in zip(queries, query_calls):
+            result = {"data": [], "sources": []}
+            for call in calls:
+                response = response_by_call.get(call)
+                data = self._scatter(response["data"], query["keywords"]) if response else []
+                if data:
+                    result["data"].extend(data)
+                    result["sources"].extend(src for src in response["sources"] if src not in result["sources"])
+            
+            if not result["data"] and query.get("kind", "section") == "section":
+                section_id = query.get("section_id", "default")
+                result["data"] = self._get_dummy_data(section_id, query["keywords"])
+                result["sources"] = ["예시 데이터 (API 검색 결과 없음)"]
+            results.append(result)
+        
+        return results
+    
+    def _plan_query(self, query: Dict) -> List[tuple]:
+        """검색 요청에 사용할 (API, 검색 유형) 목록"""
+        kind = query.get("kind", "section")
+        if kind == "section":
+            section_id = query.get("section_id", "default")
+            priority_list = self.SECTION_API_PRIORITIES.get(section_id, self.SECTION_API_PRIORITIES["default"])
+            return [(api_name, self._get_search_type(api_name, section_id)) for api_name in self.registry.route(priority_list)]
+        return [(api_name, search_type) for api_name, search_type in self.QUERY_KIND_APIS[kind] if self._is_usable(api_name)]
+    
+    def _scatter(self, data: List[Dict], keywords: List[str]) -> List[Dict]:
+        """
+        묶음 조회 결과 중 요청 키워드에 해당하는 항목 선택
+        응답 항목에 "keyword" 필드가 있으면 해당 키워드를 요청한 항목에만, 없으면 모든 요청에 분배합니다
+        """
+        requested = set(keywords)
+        return [item for item in data
+                if not isinstance(item, dict) or not item.get("keyword") or item["keyword"] in requested]
+    
+    def _get_search_type(self, api_name: str, section_id: str) -> str:
+        """섹션에 맞는 API별 검색 유형"""
+        if api_name == "kisti":
+            return "competitors" if section_id == "competition" else "general"
+        if api_name == "public_data_portal":
+            return "market" if section_id in ["problem", "market"] else "general"
+        return "general"
+    
+    def _search_api(self, api_name: str, keywords: List[str], search_type: str) -> Dict:
+        """API 이름으로 개별 검색 메서드 호출"""
+        if api_name == "kosis":
+            return self._search_kosis(keywords)
+        elif api_name == "kisti":
+            return self._search_kisti(keywords, search_type)
+        elif api_name == "ecos":
+            return self._search_ecos(keywords)
+        elif api_name == "public_data_portal":
+            return self._search_public_data_portal(keywords, search_type)
+        return {"data": [], "sources": []}
+    
+    async def _search_api_async(self, api_name: str, keywords: List[str], search_type: str) -> Dict:
+        """API 검색 (HTTP 엔드포인트가 설정된 API는 비동기 요청, 아니면 예시 데이터)"""
+        if self.config.get(api_name, {}).get("search_path"):
+            return await self._fetch_api(api_name, keywords, search_type)
+        return self._search_api(api_name, keywords, search_type)
+    
+    async def _fetch_api(self, api_name: str, keywords: List[str], search_type: str) -> Dict:
+        """
+        설정된 HTTP 엔드포인트에서 데이터 검색 (응답 캐시 우선)
+        만료된 캐시 항목은 그대로 반환하고 백그라운드에서 다시 조회합니다
+        """
+        cache = self.cache
+        if cache is not None:
+            if self.config.get(api_name, {}).get("cache_ttl") is not None:
+                cache.set_ttl(api_name, self.config[api_name]["cache_ttl"])
+            
+            cached, state = cache.get(api_name, keywords, search_type)
+            if state == ResponseCache.FRESH:
+                return cached
+            if state == ResponseCache.STALE:
+                self._revalidate_in_background(api_name, keywords, search_type)
+                return cached
+        
+        result = await self._request_api(api_name, keywords, search_type)
+        if cache is not None:
+            cache.set(api_name, keywords, result, search_type)
+        return result
+    
+    def _revalidate_in_background(self, api_name: str, keywords: List[str], search_type: str):
+        """만료된 캐시 항목을 백그라운드 스레드에서 다시 조회 (같은 항목은 한 번만)"""
+        key = ResponseCache.make_key(api_name, keywords, search_type)
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        
+        def revalidate():
+            try:
+                result = run_coroutine(self._request_api(api_name, keywords, search_type))
+                self.cache.set(api_name, keywords, result, search_type)
+            except Exception as e:
+                logger.warning(f"API '{api_name}' 캐시 갱신 실패: {str(e)}")
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+        
+        threading.Thread(target=revalidate, daemon=True).start()
+    
+    async def _request_api(self, api_name: str, keywords: List[str], search_type: str) -> Dict:
+        """설정된 HTTP 엔드포인트에 검색 요청"""
+        api_config = self.config.get(api_name, {})
+        url = api_config.get("base_url", "").rstrip("/") + "/" + api_config["search_path"].lstrip("/")
+        params = {
+            api_config.get("api_key_param", "apiKey"): api_config.get("api_key"),
+            "keyword": " ".join(keywords),
+            "type": search_type
+        }
+        if api_config.get("max_concurrency"):
+            self.transport.set_limit(api_name, api_config["max_concurrency"])
+        
+        health = self.registry.health(api_name)
+        if not health.allow_request():
+            raise HTTPTransportError(api_name, "연속 실패로 서킷이 열려 있어 요청하지 않습니다.")
+        
+        started = time.monotonic()
+        try:
+            payload = await self.transport.get_json(
+                api_name, url, params,
+                timeout=api_config.get("timeout"),
+                retries=api_config.get("retries")
+            )
+        except asyncio.CancelledError:
+            # 충분한 데이터가 모여 취소된 요청은 실패로 기록하지 않음
+            health.release_probe()
+            raise
+        except Exception:
+            health.record_failure(time.monotonic() - started)
+            raise
+        health.record_success(time.monotonic() - started)
+        data = payload.get("data", []) if isinstance(payload, dict) else payload
+        return {"data": data or [], "sources": [self.API_SOURCES.get(api_name, api_name)] if data else []}
+    
     # 개별 API 검색 메서드
     def _search_kosis(self, keywords: List[str], industry_code: Optional[str] = None) -> Dict:
         """통계청 KOSIS API 검색"""
@@ -222,6 +459,10 @@ class APIService:
         if not api_key:
             return {"data": [], "sources": []}
         
+        # HTTP 엔드포인트가 설정된 경우 실제 요청
+        if self.config.get("kosis", {}).get("search_path"):
+            return run_coroutine(self._fetch_api("kosis", keywords, "general"))
+        
         # 여기에 실제 KOSIS API 호출 코드 구현
         # 지금은 예시 데이터 반환
         return {"data": [
@@ -236,6 +477,10 @@ class APIService:
         if not api_key:
             return {"data": [], "sources": []}
         
+        # HTTP 엔드포인트가 설정된 경우 실제 요청
+        if self.config.get("kisti", {}).get("search_path"):
+            return run_coroutine(self._fetch_api("kisti", keywords, search_type))
+        
         # 여기에 실제 KISTI API 호출 코드 구현
         # 지금은 예시 데이터 반환
         if search_type == "competitors":
@@ -253,6 +498,10 @@ class APIService:
         if not api_key:
             return {"data": [], "sources": []}
         
+        # HTTP 엔드포인트가 설정된 경우 실제 요청
+        if self.config.get("ecos", {}).get("search_path"):
+            return run_coroutine(self._fetch_api("ecos", keywords, "general"))
+        
         # 여기에 실제 ECOS API 호출 코드 구현
         # 지금은 예시 데이터 반환
         return {"data": [
@@ -267,6 +516,10 @@ class APIService:
         if not api_key:
             return {"data": [], "sources": []}
         
+        # HTTP 엔드포인트가 설정된 경우 실제 요청
+        if self.config.get("public_data_portal", {}).get("search_path"):
+            return run_coroutine(self._fetch_api("public_data_portal", keywords, search_type))
+        
         # 여기에 실제 공공데이터 포털 API 호출 코드 구현
         # 지금은 예시 데이터 반환
         if search_type == "market":
@@ -0,0 +1,163 @@
+"""
+토큰 예산 기반 기획서 분할 - 긴 기획서를 문단 단위로 나누고, 섹션별로 관련 문단만 예산 안에서 골라 프롬프트 문맥 구성
+"""
+import re
+from typing import Dict, List, Optional
+
+from utils.coverage import CoverageScorer
+from utils.retrieval import ProposalRetriever
+
+# 섹션 프롬프트에 넣을 기획서 문맥의 기본 토큰 예산
+CONTEXT_TOKEN_BUDGET = 4000
+
+# 요약(map 단계) 한 번에 전달할 최대 토큰 수
+SUMMARY_CHUNK_TOKENS = 3000
+
+# 빈 줄로 구분된 문단
+PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+# 문장 끝 (마침표, 물음표, 느낌표 뒤 공백)
+SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+# 한글, 한자, 가나 (대부분의 토크나이저에서 글자당 1토큰 안팎)
+WIDE_CHAR = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏一-鿿가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (토크나이저 없이 보수적으로 계산)
+    한글/한자는 글자당 1토큰, 나머지 공백이 아닌 글자는 4글자당 1토큰으로 계산합니다
+    """
+    if not text:
+        return 0
+    wide = len(WIDE_CHAR.findall(text))
+    other = len(text) - wide - text.count(" ") - text.count("\n")
+    return wide + max(0, other) // 4 + 1
+
+
+def _split_oversized(paragraph: str, max_tokens: int) -> List[str]:
+    """예산보다 큰 문단을 줄, 문장, 글자 순서로 나누어 예산 이하 조각으로 분할"""
+    if estimate_tokens(paragraph) <= max_tokens:
+        return [paragraph]
+
+    for parts, separator in (
+        ([line for line in paragraph.split("\n") if line.strip()], "\n"),
+        ([sentence for sentence in SENTENCE_END.split(paragraph) if sentence.strip()], " ")
+    ):
+        if len(parts) > 1:
+            pieces = []
+            for part in _pack(parts, max_tokens, separator):
+                pieces.extend(_split_oversized(part, max_tokens))
+            return pieces
+
+    # 나눌 경계가 없으면 글자 수 기준으로 자름 (한 글자 = 최대 1토큰)
+    return [paragraph[start:start + max_tokens] for start in range(0, len(paragraph), max_tokens)]
+
+
+def _pack(parts: List[str], max_tokens: int, separator: str) -> List[str]:
+    """조각들을 순서대로 이어 붙여 예산 이하의 묶음으로 구성"""
+    packed = []
+    current = []
+    current_tokens = 0
+    for part in parts:
+        tokens = estimate_tokens(part)
+        if current and current_tokens + tokens > max_tokens:
+            packed.append(separator.join(current))
+            current, current_tokens = [], 0
+        current.append(part)
+        current_tokens += tokens
+    if current:
+        packed.append(separator.join(current))
+    return packed
+
+
+def split_paragraphs(text: str, max_tokens: Optional[int] = None) -> List[str]:
+    """텍스트를 문단 목록으로 분할 (max_tokens를 지정하면 그보다 큰 문단은 더 작게 나눔)"""
+    paragraphs = [p.strip() for p in PARAGRAPH_SEPARATOR.split(text) if p.strip()]
+    if not max_tokens:
+        return paragraphs
+    units = []
+    for paragraph in paragraphs:
+        units.extend(_split_oversized(paragraph, max_tokens))
+    return units
+
+
+def chunk_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """텍스트를 문단 경계를 유지하며 max_tokens 이하의 청크들로 분할"""
+    return _pack(split_paragraphs(text, max_tokens), max_tokens, "\n\n")
+
+
+def select_within_budget(token_counts: List[int], scores: List[int], candidates: List[int], max_tokens: int,
+                         required: Optional[List[int]] = None) -> List[int]:
+    """
+    후보 문단 중 점수가 높은 순서로(같으면 앞 문단 우선) 예산 안에서 선택하여 원래 순서로 반환
+    required 문단은 예산과 관계없이 먼저 포함합니다
+    """
+    selected = set(required or [])
+    used = sum(token_counts[i] for i in selected)
+    for index in sorted(candidates, key=lambda i: (-scores[i], i)):
+        if index in selected:
+            continue
+        if used + token_counts[index] <= max_tokens:
+            selected.add(index)
+            used += token_counts[index]
+    return sorted(selected)
+
+
+class SectionContextBuilder:
+    """
+    섹션별 프롬프트 문맥 구성기
+
+    기획서 전체가 예산 안에 들어가면 그대로 사용하고, 넘으면 첫 문단(제목/개요)과
+    섹션 질의(제목, 필수 요소, 키워드)에 대한 BM25 점수가 높은 문단을 예산 안에서 골라 원래 순서로 이어 붙입니다.
+    따라서 기획서가 길어져도 섹션 프롬프트 크기는 예산 이하로 유지됩니다.
+    """
+    def __init__(self, sections, max_tokens: Optional[int] = CONTEXT_TOKEN_BUDGET,
+                 scorer: Optional[CoverageScorer] = None):
+        self.sections = {section.id: section for section in sections}
+        self.section_ids = list(self.sections)
+        self.max_tokens = max_tokens
+        self.scorer = scorer or CoverageScorer(sections)
+
+    def split(self, text: str) -> List[str]:
+        """선택 단위 문단 목록 (예산의 1/4보다 큰 문단은 나눔)"""
+        return split_paragraphs(text, self.max_tokens // 4 if self.max_tokens else None)
+
+    def select(self, paragraphs: List[str], scoped: bool = False) -> Dict[str, List[int]]:
+        """
+        섹션별로 사용할 문단 인덱스 선택
+
+        Args:
+            paragraphs: split()으로 나눈 문단 목록
+            scoped: True이면 예산과 관계없이 첫 문단과 관련 문단만 사용 (관련 문단이 없으면 전체)
+        """
+        counts = [self.scorer.section_match_counts(paragraph) for paragraph in paragraphs]
+        token_counts = [estimate_tokens(paragraph) for paragraph in paragraphs]
+        all_indexes = list(range(len(paragraphs)))
+        lead = [0] if paragraphs else []
+
+        retriever = None
+        selection = {}
+        for section_id in self.section_ids:
+            relevant = [i for i in all_indexes if section_id in counts[i]]
+            if scoped and relevant:
+                candidates = sorted(set(lead + relevant))
+            else:
+                candidates = all_indexes
+
+            if not self.max_tokens or sum(token_counts[i] for i in candidates) <= self.max_tokens:
+                selection[section_id] = candidates
+            else:
+                if retriever is None:
+                    retriever = ProposalRetriever("", self.sections, paragraphs=paragraphs)
+                scores = retriever.paragraph_scores(section_id)
+                selection[section_id] = select_within_budget(token_counts, scores, candidates, self.max_tokens, lead)
+        return selection
+
+    def build(self, text: str) -> Dict[str, str]:
+        """섹션 ID → 프롬프트에 넣을 기획서 문맥 (예산 안이면 원문 그대로)"""
+        if not self.max_tokens or estimate_tokens(text) <= self.max_tokens:
+            return {section_id: text for section_id in self.section_ids}
+        paragraphs = self.split(text)
+        return {
+            section_id: "\n\n".join(paragraphs[i] for i in indexes)
+            for section_id, indexes in self.select(paragraphs).items()
+        }
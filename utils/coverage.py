@@ -0,0 +1,165 @@
+"""
+사업계획서 섹션 충족도 계산 - 섹션 키워드와 필수 요소 단어를 Aho-Corasick 오토마톤으로 한 번에 검색
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# 섹션별 완성도 판단 키워드
+SECTION_KEYWORDS = {
+    "problem": ["문제", "고객 페인 포인트", "필요성", "시장 현황"],
+    "solution": ["제품", "서비스", "해결 방안", "기술", "특징"],
+    "market": ["시장 규모", "TAM", "SAM", "SOM", "성장률", "타겟 시장"],
+    "business_model": ["수익 모델", "가격", "비용 구조", "마진", "수익성"],
+    "competition": ["경쟁사", "차별점", "경쟁 우위", "진입 장벽"],
+    "team": ["팀원", "역량", "경험", "전문성"],
+    "financials": ["매출", "비용", "손익", "투자", "ROI"],
+    "scale_up": ["성장 전략", "확장성", "로드맵"]
+}
+
+# 필수 요소 이름에서 검색에 사용할 단어의 최소 길이 (이보다 길어야 사용)
+MIN_ELEMENT_TOKEN_LENGTH = 3
+
+
+class AhoCorasick:
+    """
+    여러 문자열 패턴을 텍스트 한 번 순회로 찾는 Aho-Corasick 오토마톤
+
+    겹치거나 포함 관계인 패턴("시장", "시장 규모")도 모두 찾으며,
+    결과는 텍스트에 나타난 패턴의 인덱스 집합입니다.
+    """
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[int]] = [set()]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("빈 패턴은 사용할 수 없습니다.")
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].add(index)
+
+        # 너비 우선으로 실패 링크 계산 (출력 집합은 실패 링크를 따라 합침)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[int]:
+        """텍스트에 나타난 패턴 인덱스 집합 반환 (모든 패턴을 찾으면 바로 종료)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        remaining = len(self.patterns)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                before = len(found)
+                found |= output[state]
+                remaining -= len(found) - before
+                if not remaining:
+                    break
+        return found
+
+
+class CoverageScorer:
+    """
+    섹션 설정으로부터 한 번 만들어 두고 재사용하는 섹션 충족도 계산기
+
+    섹션 키워드와 필수 요소 단어를 하나의 오토마톤으로 묶어 기획서를 한 번만 순회합니다.
+    판정 기준은 기존 analyze_business_plan 도구와 같습니다:
+    - 완성도: 기획서에 포함된 섹션 키워드 비율 (키워드가 없는 섹션은 0.5)
+    - 누락 요소: 이름의 단어 중 MIN_ELEMENT_TOKEN_LENGTH자보다 긴 단어가 하나도 나타나지 않은 필수 요소
+    (모든 비교는 소문자 기준 부분 문자열 일치)
+    """
+    def __init__(self, section_config, section_keywords: Optional[Dict[str, List[str]]] = None):
+        section_keywords = SECTION_KEYWORDS if section_keywords is None else section_keywords
+        pattern_ids: Dict[str, int] = {}
+
+        def pattern_id(pattern: str) -> int:
+            return pattern_ids.setdefault(pattern, len(pattern_ids))
+
+        # 섹션별 (ID, 제목, 키워드 패턴 ID 목록, [(요소 이름, 단어 패턴 ID 목록)])
+        self._sections = []
+        for section in section_config:
+            keyword_ids = [pattern_id(keyword.lower()) for keyword in section_keywords.get(section.id, [])]
+            elements = [
+                (element, [pattern_id(token) for token in element.lower().split()
+                           if len(token) > MIN_ELEMENT_TOKEN_LENGTH])
+                for element in section.element_names
+            ]
+            self._sections.append((section.id, section.original_title, keyword_ids, elements))
+
+        self._automaton = AhoCorasick(pattern_ids)
+        # 섹션별로 검색하는 모든 패턴 ID (키워드 + 필수 요소 단어)
+        self._section_patterns = {
+            section_id: set(keyword_ids).union(*(token_ids for _, token_ids in elements))
+            for section_id, _, keyword_ids, elements in self._sections
+        }
+
+    def matching_sections(self, text: str) -> List[str]:
+        """텍스트에 섹션 키워드나 필수 요소 단어가 하나라도 나타나는 섹션 ID 목록 (설정 순서)"""
+        return list(self.section_match_counts(text))
+
+    def section_match_counts(self, text: str) -> Dict[str, int]:
+        """섹션별로 텍스트에 나타난 서로 다른 키워드/필수 요소 단어 수 (하나도 없는 섹션은 제외, 설정 순서)"""
+        found = self._automaton.find(text.lower())
+        counts = {}
+        for section_id, pattern_ids in self._section_patterns.items():
+            count = len(pattern_ids & found)
+            if count:
+                counts[section_id] = count
+        return counts
+
+    def score(self, plan_text: str) -> Dict[str, Any]:
+        """
+        기획서의 섹션별 완성도와 누락 요소 계산
+
+        Returns:
+            {"missing_info", "improvements", "section_analysis"} 형태의 분석 결과
+        """
+        found = self._automaton.find(plan_text.lower())
+        analysis = {
+            "missing_info": [],
+            "improvements": [],
+            "section_analysis": {}
+        }
+
+        for section_id, section_title, keyword_ids, elements in self._sections:
+            if keyword_ids:
+                keyword_count = sum(1 for keyword_id in keyword_ids if keyword_id in found)
+                completeness = min(1.0, keyword_count / len(keyword_ids))
+            else:
+                completeness = 0.5  # 기본값
+
+            missing = [element for element, token_ids in elements
+                       if not any(token_id in found for token_id in token_ids)]
+
+            analysis["section_analysis"][section_id] = {
+                "title": section_title,
+                "completeness": completeness,
+                "missing_elements": missing,
+                "suggestions": [
+                    f"{element}에 대한 구체적인 정보 추가 필요" for element in missing
+                ] if missing else ["섹션 완성도 높음"]
+            }
+
+            if missing:
+                analysis["missing_info"].append(f"{section_title}에서 {', '.join(missing)}에 대한 정보 필요")
+
+        return analysis
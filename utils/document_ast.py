@@ -0,0 +1,77 @@
+"""
+사업계획서 문서 구조 - 생성된 섹션 내용을 (종류, 텍스트) 블록으로 한 번만 변환해 Word, PDF, Markdown, HTML 렌더러가 함께 사용
+
+블록 종류:
+- heading: 섹션 제목
+- item: ◦로 시작하는 강조 항목
+- bullet: -로 시작하는 목록
+- text: 일반 문단
+- placeholder: 한 줄 전체가 [필요 정보: ...] 표시인 문단
+- blank: 섹션 사이 간격
+- page_break: 페이지 나누기 (병합 문서)
+"""
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from utils.streaming import PLACEHOLDER_PATTERN
+
+HEADING = "heading"
+ITEM = "item"
+BULLET = "bullet"
+PARAGRAPH = "text"
+PLACEHOLDER = "placeholder"
+BLANK = "blank"
+PAGE_BREAK = "page_break"
+
+BLOCK_KINDS = (HEADING, ITEM, BULLET, PARAGRAPH, PLACEHOLDER, BLANK, PAGE_BREAK)
+
+
+class Block(NamedTuple):
+    """문서 블록 하나 (튜플이므로 (종류, 텍스트)로 풀어 쓸 수 있음)"""
+    kind: str
+    text: str = ""
+
+
+def line_kind(line: str) -> Optional[str]:
+    """섹션 내용 한 줄의 종류 (빈 줄은 None)"""
+    if line.startswith('◦'):
+        return ITEM
+    if line.startswith('-'):
+        return BULLET
+    stripped = line.strip()
+    if not stripped:
+        return None
+    if PLACEHOLDER_PATTERN.fullmatch(stripped):
+        return PLACEHOLDER
+    return PARAGRAPH
+
+
+@lru_cache(maxsize=256)
+def parse_section(content: str) -> Tuple[Block, ...]:
+    """섹션 내용을 블록으로 변환 (같은 내용은 캐시된 결과를 재사용하므로 형식마다 다시 해석하지 않음)"""
+    blocks = []
+    for line in content.split('\n'):
+        kind = line_kind(line)
+        if kind:
+            blocks.append(Block(kind, line))
+    return tuple(blocks)
+
+
+def iter_section_blocks(sections_dict: Dict[str, str]) -> Iterator[Block]:
+    """{제목: 내용} 사전을 블록으로 차례로 변환하는 생성기"""
+    for index, (title, content) in enumerate(sections_dict.items()):
+        # 섹션 간 간격 추가 (마지막 섹션이 아닌 경우)
+        if index:
+            yield Block(BLANK)
+        yield Block(HEADING, title)
+        yield from parse_section(content)
+
+
+def parse_document(sections_dict: Dict[str, str]) -> Tuple[Block, ...]:
+    """{제목: 내용} 사전 전체를 블록 튜플로 변환 (여러 렌더러가 함께 사용)"""
+    return tuple(iter_section_blocks(sections_dict))
+
+
+def sections_to_blocks(sections_dict: Dict[str, str]) -> List[Block]:
+    """{제목: 내용} 사전을 블록 목록으로 변환"""
+    return list(iter_section_blocks(sections_dict))
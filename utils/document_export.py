@@ -0,0 +1,146 @@
+"""
+문서 내보내기 - 섹션 내용을 블록(document_ast)으로 한 번만 변환하고 형식별 렌더러(Word, PDF, Markdown, HTML)가
+같은 블록을 사용해 여러 형식을 동시에 생성
+"""
+import os
+import re
+import html
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from utils.document_ast import (
+    BULLET, HEADING, ITEM, PAGE_BREAK, PARAGRAPH, PLACEHOLDER, Block, parse_document
+)
+from utils.docx_stream import write_docx
+from utils.pdf_utils import render_blocks_to_pdf
+
+# 문단 시작에 오면 Markdown 문법으로 해석되는 문자 (#, >, +, *, 1. 등)
+_MARKDOWN_LEADING = re.compile(r"^(\d*)((?<=\d)[.)]|[#>+*])")
+
+
+def _write_text(output_path: str, text: str) -> str:
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return output_path
+
+
+def to_markdown(blocks: Iterable[Block]) -> str:
+    """블록을 Markdown 텍스트로 변환 (섹션 제목은 #, ◦ 항목은 굵게, 필요 정보 표시는 기울임)"""
+    chunks = []
+    bullets = []
+    for kind, text in blocks:
+        # 연속된 목록은 빈 줄 없이 하나의 묶음으로 씀
+        if kind == BULLET:
+            bullets.append(text)
+            continue
+        if bullets:
+            chunks.append("\n".join(bullets))
+            bullets = []
+        if kind == HEADING:
+            chunks.append(f"# {text}")
+        elif kind == PAGE_BREAK:
+            chunks.append("---")
+        elif kind in (ITEM, PLACEHOLDER, PARAGRAPH):
+            text = _MARKDOWN_LEADING.sub(lambda match: f"{match.group(1)}\\{match.group(2)}", text.strip(), count=1)
+            if kind == ITEM:
+                text = f"**{text}**"
+            elif kind == PLACEHOLDER:
+                text = f"*{text}*"
+            chunks.append(text)
+    if bullets:
+        chunks.append("\n".join(bullets))
+    return "\n\n".join(chunks) + "\n"
+
+
+def to_html(blocks: Iterable[Block], title: str = "사업계획서") -> str:
+    """블록을 HTML 문서로 변환 (연속된 목록은 하나의 <ul>로 묶음)"""
+    body = []
+    in_list = False
+    for kind, text in blocks:
+        if kind != BULLET and in_list:
+            body.append("</ul>")
+            in_list = False
+        escaped = html.escape(text)
+        if kind == HEADING:
+            body.append(f"<h1>{escaped}</h1>")
+        elif kind == ITEM:
+            body.append(f"<p><strong>{escaped}</strong></p>")
+        elif kind == BULLET:
+            if not in_list:
+                body.append("<ul>")
+                in_list = True
+            body.append(f"<li>{html.escape(text.lstrip('-').strip())}</li>")
+        elif kind == PLACEHOLDER:
+            body.append(f'<p class="placeholder"><mark>{escaped}</mark></p>')
+        elif kind == PARAGRAPH:
+            body.append(f"<p>{escaped}</p>")
+        elif kind == PAGE_BREAK:
+            body.append('<hr style="page-break-after: always">')
+    if in_list:
+        body.append("</ul>")
+    return (
+        '<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{html.escape(title)}</title>\n</head>\n<body>\n" + "\n".join(body) + "\n</body>\n</html>\n"
+    )
+
+
+def render_markdown(blocks: Sequence[Block], output_path: str) -> str:
+    return _write_text(output_path, to_markdown(blocks))
+
+
+def render_html(blocks: Sequence[Block], output_path: str) -> str:
+    return _write_text(output_path, to_html(blocks))
+
+
+def render_docx(blocks: Sequence[Block], output_path: str) -> str:
+    return write_docx(output_path, blocks)
+
+
+def render_pdf(blocks: Sequence[Block], output_path: str) -> str:
+    return render_blocks_to_pdf(blocks, output_path)
+
+
+# 형식 이름 → (파일 확장자, 렌더러)
+RENDERERS: Dict[str, Tuple[str, Callable[[Sequence[Block], str], str]]] = {
+    "docx": (".docx", render_docx),
+    "pdf": (".pdf", render_pdf),
+    "markdown": (".md", render_markdown),
+    "html": (".html", render_html)
+}
+
+
+def register_renderer(format_name: str, extension: str, renderer: Callable[[Sequence[Block], str], str]):
+    """새 형식의 렌더러 등록 (renderer(blocks, output_path)는 저장한 경로 반환)"""
+    RENDERERS[format_name] = (extension, renderer)
+
+
+def export_document(document: Union[Dict[str, str], Sequence[Block]], output_base: str,
+                    formats: Iterable[str] = ("docx", "pdf"), max_workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    문서를 여러 형식으로 저장
+
+    섹션 사전은 한 번만 블록으로 변환하고, 형식별 렌더러는 같은 블록을 스레드에서 동시에 사용합니다.
+
+    Args:
+        document: {제목: 내용} 사전 또는 이미 변환한 블록
+        output_base: 확장자를 뺀 출력 경로 (형식별 확장자를 붙임)
+
+    Returns:
+        {형식: 저장한 경로}
+    """
+    formats = list(dict.fromkeys(formats))
+    unknown = [name for name in formats if name not in RENDERERS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 문서 형식: {', '.join(unknown)} (사용 가능: {', '.join(RENDERERS)})")
+    blocks = parse_document(document) if isinstance(document, dict) else tuple(document)
+
+    def render(name):
+        extension, renderer = RENDERERS[name]
+        return renderer(blocks, output_base + extension)
+
+    if len(formats) <= 1:
+        return {name: render(name) for name in formats}
+    with ThreadPoolExecutor(max_workers=max_workers or len(formats)) as executor:
+        futures = {name: executor.submit(render, name) for name in formats}
+        return {name: future.result() for name, future in futures.items()}
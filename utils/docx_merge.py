@@ -0,0 +1,416 @@
+"""
+Word 문서 병합 엔진 - 각 문서의 word/document.xml 본문을 XML 요소 단위로 이어 붙이고,
+스타일/번호 매기기 정의와 관계(이미지, 링크)는 문서마다 한 번만 맞춰 필요한 것만 추가
+
+- 표, 실행(run) 서식, 목록 번호, 이미지가 그대로 유지됩니다 (단락 텍스트만 복사하던 이전 방식과 다름)
+- 첫 문서의 스타일, 설정, 페이지 설정이 기준이며, 같은 ID의 정의가 다르면 새 ID로 추가하고 본문 참조를 바꿉니다
+- 본문은 임시 파일에 차례로 기록하므로 문서를 수십 개 합쳐도 한 번에 한 문서만 메모리에 올립니다
+"""
+import os
+import copy
+import shutil
+import zipfile
+import posixpath
+import tempfile
+from typing import Dict, Iterable, List, Set, Tuple
+
+from lxml import etree
+
+from utils.docx_stream import DOCUMENT_PART, paragraph_xml
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+W = f"{{{W_NS}}}"
+
+STYLES_PART = "word/styles.xml"
+NUMBERING_PART = "word/numbering.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+CONTENT_TYPES = "[Content_Types].xml"
+NUMBERING_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering"
+NUMBERING_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"
+
+# 본문에서 스타일을 참조하는 요소
+STYLE_REFERENCES = (W + "pStyle", W + "rStyle", W + "tblStyle")
+# 스타일 정의 안에서 다른 스타일을 참조하는 요소
+STYLE_LINKS = (W + "basedOn", W + "next", W + "link")
+# 관계 ID(rId)를 참조하는 속성
+REL_ATTRIBUTES = (f"{{{R_NS}}}id", f"{{{R_NS}}}embed", f"{{{R_NS}}}link")
+BOOKMARKS = (W + "bookmarkStart", W + "bookmarkEnd")
+DRAWING_ID = f"{{{WP_NS}}}docPr"
+
+
+# 스타일/번호 매기기 정의는 들여쓰기 공백과 관계없이 비교 (저장한 프로그램마다 들여쓰기가 다름)
+_DEFINITION_PARSER = etree.XMLParser(remove_blank_text=True)
+
+
+def _definitions(data: bytes):
+    return etree.fromstring(data, _DEFINITION_PARSER)
+
+
+def _canonical(element) -> bytes:
+    return etree.tostring(element, method="c14n") if element is not None else b""
+
+
+def _xml(root) -> bytes:
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+class _BodyReferences:
+    """본문 요소 한 번 순회로 모은 스타일/번호/관계/책갈피/그림 참조"""
+    def __init__(self, elements: Iterable):
+        self.styles: List = []
+        self.numbers: List = []
+        self.relations: List[Tuple[object, str]] = []
+        self.bookmarks: List = []
+        self.drawings: List = []
+        for root in elements:
+            for element in root.iter():
+                tag = element.tag
+                if tag in STYLE_REFERENCES:
+                    self.styles.append(element)
+                elif tag == W + "numId":
+                    self.numbers.append(element)
+                elif tag in BOOKMARKS:
+                    self.bookmarks.append(element)
+                elif tag == DRAWING_ID:
+                    self.drawings.append(element)
+                for attribute in REL_ATTRIBUTES:
+                    if attribute in element.attrib:
+                        self.relations.append((element, attribute))
+
+    @staticmethod
+    def remap(elements: Iterable, mapping: Dict[str, str], attribute: str = W + "val"):
+        if mapping:
+            for element in elements:
+                value = element.get(attribute)
+                if value in mapping:
+                    element.set(attribute, mapping[value])
+
+
+class DocxMerger:
+    """
+    여러 Word 문서를 첫 문서를 기준으로 하나로 병합
+
+    예시:
+        DocxMerger(["plan_a.docx", "plan_b.docx"]).save("merged.docx")
+    """
+    def __init__(self, input_files: List[str], page_breaks: bool = True):
+        if not input_files:
+            raise ValueError("병합할 문서가 없습니다.")
+        self.input_files = list(input_files)
+        self.page_breaks = page_breaks
+
+    def save(self, output_file: str) -> str:
+        """병합한 문서를 저장 (임시 파일에 쓴 뒤 교체하므로 실패해도 기존 파일은 그대로)"""
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        temp_path = f"{output_file}.tmp"
+        try:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as output, \
+                    tempfile.TemporaryFile() as body:
+                self._merge(output, body)
+            os.replace(temp_path, output_file)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return output_file
+
+    def _merge(self, output: zipfile.ZipFile, body):
+        with zipfile.ZipFile(self.input_files[0]) as master:
+            self._load_master(master)
+            document = master.read(DOCUMENT_PART).decode("utf-8")
+            head = document[:document.index("<w:body>") + len("<w:body>")]
+            # 바꾸지 않는 기준 문서 파일은 그대로 복사
+            for info in master.infolist():
+                if info.filename not in (DOCUMENT_PART, STYLES_PART, NUMBERING_PART, DOCUMENT_RELS, CONTENT_TYPES):
+                    output.writestr(info, master.read(info.filename), zipfile.ZIP_DEFLATED)
+                    self.part_names.add(info.filename)
+            section = self._append_body(master, body, output, is_master=True)
+
+        for path in self.input_files[1:]:
+            if self.page_breaks:
+                body.write(paragraph_xml("page_break").encode("utf-8"))
+            with zipfile.ZipFile(path) as source:
+                self._append_body(source, body, output, is_master=False)
+
+        # 본문 조립: 기준 문서 머리 + 이어 붙인 본문 + 기준 문서 페이지 설정
+        with output.open(DOCUMENT_PART, "w", force_zip64=True) as stream:
+            stream.write(head.encode("utf-8"))
+            body.seek(0)
+            shutil.copyfileobj(body, stream)
+            if section is not None:
+                stream.write(etree.tostring(section))
+            stream.write(b"</w:body></w:document>")
+
+        if self.styles_bytes is not None:
+            output.writestr(STYLES_PART, self.styles_bytes if self.styles is None else _xml(self.styles))
+        if self.numbering is not None:
+            output.writestr(NUMBERING_PART, _xml(self.numbering))
+        output.writestr(DOCUMENT_RELS, _xml(self.relationships))
+        output.writestr(CONTENT_TYPES, _xml(self.content_types))
+
+    def _load_master(self, master: zipfile.ZipFile):
+        """기준 문서의 스타일, 번호 매기기, 관계, 콘텐츠 형식 정의를 읽어 둠"""
+        names = set(master.namelist())
+        self.part_names: Set[str] = set()
+        self.styles_bytes = master.read(STYLES_PART) if STYLES_PART in names else None
+        self.styles = None  # 새 스타일이 필요할 때만 해석
+        self.style_keys: Dict[str, bytes] = {}
+        self.style_aliases: Dict[Tuple[str, bytes], str] = {}
+
+        self.numbering_bytes = master.read(NUMBERING_PART) if NUMBERING_PART in names else None
+        self.numbering = _definitions(self.numbering_bytes) if self.numbering_bytes else None
+        self.num_keys: Dict[str, Tuple[bytes, bytes]] = {}
+        self.num_aliases: Dict[Tuple[bytes, bytes], str] = {}
+        self.next_num_id = self.next_abstract_id = 1
+        if self.numbering is not None:
+            abstracts = {a.get(W + "abstractNumId"): a for a in self.numbering.iter(W + "abstractNum")}
+            for num in self.numbering.iter(W + "num"):
+                key = self._num_key(num, abstracts)
+                self.num_keys[num.get(W + "numId")] = key
+                self.num_aliases.setdefault(key, num.get(W + "numId"))
+            self.next_num_id = 1 + max((int(n) for n in self.num_keys), default=0)
+            self.next_abstract_id = 1 + max((int(a) for a in abstracts), default=-1)
+
+        self.relationships = etree.fromstring(master.read(DOCUMENT_RELS))
+        self.relation_ids = {rel.get("Id") for rel in self.relationships}
+        self.content_types = etree.fromstring(master.read(CONTENT_TYPES))
+        self.copied_parts: Dict[Tuple[str, str], str] = {}
+        self.next_bookmark_id = 0
+        self.next_drawing_id = 1
+
+    def _append_body(self, source: zipfile.ZipFile, body, output: zipfile.ZipFile, is_master: bool):
+        """문서 본문을 정의를 맞춘 뒤 임시 파일에 이어 씀 (본문 끝 페이지 설정은 반환)"""
+        root = etree.fromstring(source.read(DOCUMENT_PART))
+        children = list(root.find(W + "body"))
+        section = None
+        if children and children[-1].tag == W + "sectPr":
+            section = children.pop()
+        references = _BodyReferences(children)
+
+        if not is_master:
+            styles = self._source_styles(source)
+            num_map = self._merge_numbering(source, references, styles)
+            _BodyReferences.remap(references.numbers, num_map)
+            style_map = self._merge_styles(styles, references, num_map)
+            _BodyReferences.remap(references.styles, style_map)
+            self._merge_relations(source, references, output)
+
+        # 책갈피/그림 ID는 병합한 문서 안에서 겹치지 않도록 다시 매김
+        bookmark_map = {}
+        for element in references.bookmarks:
+            old_id = element.get(W + "id")
+            if old_id not in bookmark_map:
+                bookmark_map[old_id] = str(self.next_bookmark_id)
+                self.next_bookmark_id += 1
+            element.set(W + "id", bookmark_map[old_id])
+        for element in references.drawings:
+            element.set("id", str(self.next_drawing_id))
+            self.next_drawing_id += 1
+
+        for child in children:
+            body.write(etree.tostring(child))
+        return section
+
+    @staticmethod
+    def _num_key(num, abstracts) -> Tuple[bytes, bytes]:
+        abstract_ref = num.find(W + "abstractNumId")
+        abstract = abstracts.get(abstract_ref.get(W + "val")) if abstract_ref is not None else None
+        return _canonical(num), _canonical(abstract)
+
+    def _merge_numbering(self, source: zipfile.ZipFile, references: _BodyReferences,
+                         styles: Dict[str, object]) -> Dict[str, str]:
+        """본문과 사용 스타일이 참조하는 목록 번호 정의를 맞추고 {원래 numId: 새 numId} 반환"""
+        if NUMBERING_PART not in source.namelist():
+            return {}
+        data = source.read(NUMBERING_PART)
+        if data == self.numbering_bytes:
+            return {}
+        used = {element.get(W + "val") for element in references.numbers}
+        for style_id in self._needed_styles(styles, references):
+            used.update(numbering.get(W + "val") for numbering in styles[style_id].iter(W + "numId"))
+        if not used:
+            return {}
+
+        numbering = _definitions(data)
+        abstracts = {a.get(W + "abstractNumId"): a for a in numbering.iter(W + "abstractNum")}
+        nums = {n.get(W + "numId"): n for n in numbering.iter(W + "num")}
+        if self.numbering is None:
+            self._create_numbering(numbering)
+
+        mapping = {}
+        for num_id in sorted(used):
+            num = nums.get(num_id)
+            if num is None:
+                continue
+            key = self._num_key(num, abstracts)
+            if self.num_keys.get(num_id) == key:
+                continue
+            if key not in self.num_aliases:
+                new_num_id = str(self.next_num_id)
+                self.next_num_id += 1
+                new_num = copy.deepcopy(num)
+                new_num.set(W + "numId", new_num_id)
+                abstract_ref = new_num.find(W + "abstractNumId")
+                abstract = abstracts.get(abstract_ref.get(W + "val")) if abstract_ref is not None else None
+                if abstract is not None:
+                    new_abstract = copy.deepcopy(abstract)
+                    new_abstract.set(W + "abstractNumId", str(self.next_abstract_id))
+                    abstract_ref.set(W + "val", str(self.next_abstract_id))
+                    self.next_abstract_id += 1
+                    # 같은 nsid의 목록은 Word가 하나로 합치므로 제거 (선택 요소)
+                    for nsid in new_abstract.findall(W + "nsid"):
+                        new_abstract.remove(nsid)
+                    # abstractNum은 모든 num보다 앞에 있어야 함
+                    existing = self.numbering.findall(W + "abstractNum")
+                    position = self.numbering.index(existing[-1]) + 1 if existing else 0
+                    self.numbering.insert(position, new_abstract)
+                nums_in_master = self.numbering.findall(W + "num")
+                if nums_in_master:
+                    nums_in_master[-1].addnext(new_num)
+                else:
+                    self.numbering.append(new_num)
+                self.num_aliases[key] = new_num_id
+            mapping[num_id] = self.num_aliases[key]
+        return mapping
+
+    def _create_numbering(self, source_numbering):
+        """기준 문서에 번호 매기기 정의가 없으면 빈 정의와 관계, 콘텐츠 형식을 추가"""
+        self.numbering = etree.Element(source_numbering.tag, nsmap=source_numbering.nsmap)
+        self._add_relationship(NUMBERING_REL_TYPE, "numbering.xml")
+        etree.SubElement(self.content_types, f"{{{CT_NS}}}Override",
+                         PartName="/" + NUMBERING_PART, ContentType=NUMBERING_CONTENT_TYPE)
+
+    def _source_styles(self, source: zipfile.ZipFile) -> Dict[str, object]:
+        """원본 문서의 {스타일 ID: 정의} (기준 문서와 스타일 파일이 같으면 빈 사전)"""
+        if STYLES_PART not in source.namelist() or self.styles_bytes is None:
+            return {}
+        data = source.read(STYLES_PART)
+        if data == self.styles_bytes:
+            return {}
+        return {style.get(W + "styleId"): style for style in _definitions(data).iter(W + "style")}
+
+    @staticmethod
+    def _needed_styles(styles: Dict[str, object], references: _BodyReferences) -> Set[str]:
+        """본문이 사용하는 스타일과 그 기반/연결 스타일"""
+        pending = [element.get(W + "val") for element in references.styles]
+        needed = set()
+        while pending:
+            style_id = pending.pop()
+            if style_id in needed or style_id not in styles:
+                continue
+            needed.add(style_id)
+            pending.extend(link.get(W + "val") for link in styles[style_id] if link.tag in STYLE_LINKS)
+        return needed
+
+    def _merge_styles(self, styles: Dict[str, object], references: _BodyReferences,
+                      num_map: Dict[str, str]) -> Dict[str, str]:
+        """사용하는 스타일 정의를 맞추고 {원래 스타일 ID: 새 스타일 ID} 반환"""
+        needed = self._needed_styles(styles, references)
+        if not needed:
+            return {}
+        if self.styles is None:
+            self.styles = _definitions(self.styles_bytes)
+            for style in self.styles.iter(W + "style"):
+                self.style_keys[style.get(W + "styleId")] = _canonical(style)
+
+        # 정의가 다르거나 번호 매기기가 바뀐 스타일만 추가 (같은 ID가 있으면 새 ID)
+        mapping = {}
+        added = []
+        for style_id in sorted(needed):
+            style = styles[style_id]
+            key = _canonical(style)
+            renumbered = any(n.get(W + "val") in num_map for n in style.iter(W + "numId"))
+            if self.style_keys.get(style_id) == key and not renumbered:
+                continue
+            alias = self.style_aliases.get((style_id, key))
+            if alias is None:
+                alias = style_id
+                suffix = 1
+                while alias in self.style_keys:
+                    suffix += 1
+                    alias = f"{style_id}{suffix}"
+                self.style_keys[alias] = key
+                self.style_aliases[(style_id, key)] = alias
+                added.append((style, alias, suffix))
+            if alias != style_id:
+                mapping[style_id] = alias
+
+        for style, alias, suffix in added:
+            new_style = copy.deepcopy(style)
+            new_style.set(W + "styleId", alias)
+            name = new_style.find(W + "name")
+            if name is not None and suffix > 1:
+                name.set(W + "val", f"{name.get(W + 'val')} {suffix}")
+            _BodyReferences.remap([link for link in new_style if link.tag in STYLE_LINKS], mapping)
+            _BodyReferences.remap(new_style.iter(W + "numId"), num_map)
+            self.styles.append(new_style)
+        return mapping
+
+    def _add_relationship(self, rel_type: str, target: str, external: bool = False) -> str:
+        number = len(self.relation_ids) + 1
+        while f"rId{number}" in self.relation_ids:
+            number += 1
+        rel_id = f"rId{number}"
+        self.relation_ids.add(rel_id)
+        attributes = {"Id": rel_id, "Type": rel_type, "Target": target}
+        if external:
+            attributes["TargetMode"] = "External"
+        etree.SubElement(self.relationships, f"{{{REL_NS}}}Relationship", **attributes)
+        return rel_id
+
+    def _merge_relations(self, source: zipfile.ZipFile, references: _BodyReferences, output: zipfile.ZipFile):
+        """본문이 참조하는 관계(이미지, 링크)를 복사하고 rId를 바꿈"""
+        if not references.relations:
+            return
+        relationships = {rel.get("Id"): rel for rel in etree.fromstring(source.read(DOCUMENT_RELS))}
+        content_types = None
+        mapping = {}
+        for element, attribute in references.relations:
+            old_id = element.get(attribute)
+            if old_id not in mapping:
+                rel = relationships.get(old_id)
+                if rel is None:
+                    continue
+                if rel.get("TargetMode") == "External":
+                    mapping[old_id] = self._add_relationship(rel.get("Type"), rel.get("Target"), external=True)
+                else:
+                    if content_types is None:
+                        content_types = etree.fromstring(source.read(CONTENT_TYPES))
+                    part = self._copy_part(source, posixpath.normpath(posixpath.join("word", rel.get("Target"))),
+                                           content_types, output)
+                    mapping[old_id] = self._add_relationship(rel.get("Type"), posixpath.relpath(part, "word"))
+            element.set(attribute, mapping[old_id])
+
+    def _copy_part(self, source: zipfile.ZipFile, part: str, content_types, output: zipfile.ZipFile) -> str:
+        """원본 문서의 파일(이미지 등)을 겹치지 않는 이름으로 복사하고 콘텐츠 형식을 등록"""
+        key = (source.filename, part)
+        if key in self.copied_parts:
+            return self.copied_parts[key]
+        base, extension = posixpath.splitext(part)
+        name, suffix = part, 1
+        while name in self.part_names:
+            suffix += 1
+            name = f"{base}_{suffix}{extension}"
+        output.writestr(name, source.read(part))
+        self.part_names.add(name)
+        self.copied_parts[key] = name
+
+        defaults = {d.get("Extension").lower() for d in self.content_types.iter(f"{{{CT_NS}}}Default")}
+        if extension[1:].lower() not in defaults:
+            for entry in content_types:
+                if entry.get("PartName") == "/" + part or (
+                        entry.get("Extension", "").lower() == extension[1:].lower()):
+                    new_entry = copy.deepcopy(entry)
+                    if new_entry.get("PartName"):
+                        new_entry.set("PartName", "/" + name)
+                    self.content_types.append(new_entry)
+                    break
+        return name
+
+
+def merge_docx(input_files: List[str], output_file: str, page_breaks: bool = True) -> str:
+    """여러 Word 문서를 하나로 병합 (문서 사이에 페이지 나누기)"""
+    return DocxMerger(input_files, page_breaks=page_breaks).save(output_file)
@@ -0,0 +1,152 @@
+"""
+스트리밍 Word 문서 작성기 - (종류, 텍스트) 블록을 받는 대로 word/document.xml 단락으로 변환해
+zip 항목에 바로 기록 (python-docx 객체 트리를 만들지 않으므로 문서 길이와 관계없이 메모리 사용량이 일정)
+
+- 스타일, 글꼴, 번호 매기기 등 나머지 파일은 python-docx 기본 문서와 같으므로 Document()로 만든 문서와 서식이 같습니다
+- 블록 종류는 document_ast와 같습니다 (heading, item(굵게), bullet(목록 스타일), text, placeholder(형광펜), blank, page_break)
+"""
+import os
+import re
+import zipfile
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from xml.sax.saxutils import escape
+
+import docx
+
+# python-docx 기본 문서 (Document()가 사용하는 문서와 같음)
+DOCX_TEMPLATE = os.path.join(os.path.dirname(docx.__file__), "templates", "default.docx")
+
+DOCUMENT_PART = "word/document.xml"
+
+# 압축 전에 모아 둘 단락 XML 크기 (작은 쓰기를 줄임)
+FLUSH_BYTES = 64 * 1024
+
+# XML에 쓸 수 없는 제어 문자 (탭은 <w:tab/>으로 변환)
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_STYLE_IDS = {"heading": "Heading1", "bullet": "ListBullet"}
+
+
+def _runs_xml(text: str, bold: bool = False, highlight: bool = False) -> str:
+    """텍스트를 실행(run) XML로 변환 (탭은 python-docx와 같이 <w:tab/>으로 기록)"""
+    properties = ("<w:b/>" if bold else "") + ('<w:highlight w:val="yellow"/>' if highlight else "")
+    properties = f"<w:rPr>{properties}</w:rPr>" if properties else ""
+    parts = []
+    for index, piece in enumerate(_INVALID_XML_CHARS.sub("", text).split("\t")):
+        if index:
+            parts.append("<w:tab/>")
+        if piece:
+            parts.append(f'<w:t xml:space="preserve">{escape(piece)}</w:t>')
+    return f"<w:r>{properties}{''.join(parts)}</w:r>"
+
+
+def paragraph_xml(kind: str, text: str = "") -> str:
+    """블록 하나를 w:p 단락 XML로 변환"""
+    if kind == "blank" or (kind != "page_break" and not text):
+        return "<w:p/>"
+    if kind == "page_break":
+        return '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    style_id = _STYLE_IDS.get(kind)
+    properties = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+    return f"<w:p>{properties}{_runs_xml(text, bold=kind == 'item', highlight=kind == 'placeholder')}</w:p>"
+
+
+_templates: Dict[str, Tuple[Dict[str, bytes], str, str]] = {}
+_templates_lock = threading.Lock()
+
+
+def _load_template(template_path: str):
+    """기본 문서의 (document.xml 이외 파일, 본문 앞부분, 본문 뒷부분(sectPr))을 한 번만 읽어 둠"""
+    with _templates_lock:
+        if template_path not in _templates:
+            with zipfile.ZipFile(template_path) as source:
+                parts = {name: source.read(name) for name in source.namelist() if name != DOCUMENT_PART}
+                document = source.read(DOCUMENT_PART).decode("utf-8")
+            body_start = document.index("<w:body>") + len("<w:body>")
+            section_start = document.rfind("<w:sectPr", body_start)
+            if section_start < 0:
+                section_start = document.index("</w:body>")
+            _templates[template_path] = (parts, document[:body_start], document[section_start:])
+        return _templates[template_path]
+
+
+class StreamingDocxWriter:
+    """
+    블록을 받는 대로 Word 문서에 기록하는 작성기
+
+    예시:
+        with StreamingDocxWriter("output/plan.docx") as writer:
+            writer.write("heading", "Problem")
+            writer.write_blocks(blocks)
+    """
+    def __init__(self, output_path: str, template_path: Optional[str] = None):
+        self.output_path = output_path
+        parts, self._head, self._tail = _load_template(template_path or DOCX_TEMPLATE)
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self._zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        for name, data in parts.items():
+            self._zip.writestr(name, data)
+        self._stream = self._zip.open(DOCUMENT_PART, "w", force_zip64=True)
+        self._buffer = []
+        self._buffered = 0
+        self._append(self._head)
+        self.paragraphs = 0
+
+    def _append(self, xml: str):
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        if self._buffered >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._stream.write("".join(self._buffer).encode("utf-8"))
+            self._buffer, self._buffered = [], 0
+
+    def write(self, kind: str, text: str = ""):
+        """블록 하나를 단락으로 기록"""
+        self._append(paragraph_xml(kind, text))
+        self.paragraphs += 1
+
+    def write_blocks(self, blocks: Iterable[Tuple[str, str]]):
+        """블록 목록(또는 생성기)을 차례로 기록"""
+        for kind, text in blocks:
+            self.write(kind, text)
+
+    def close(self):
+        """본문을 마무리하고 파일을 닫음"""
+        if self._zip is None:
+            return
+        self._append(self._tail)
+        self._flush()
+        self._stream.close()
+        self._zip.close()
+        self._zip = None
+
+    def abort(self):
+        """작성 중 오류가 나면 불완전한 파일을 지움"""
+        if self._zip is not None:
+            self._stream.close()
+            self._zip.close()
+            self._zip = None
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_docx(output_path: str, blocks: Iterable[Tuple[str, str]], template_path: Optional[str] = None) -> str:
+    """블록 목록(또는 생성기)을 Word 문서로 저장"""
+    with StreamingDocxWriter(output_path, template_path) as writer:
+        writer.write_blocks(blocks)
+    return output_path
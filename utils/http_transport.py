@@ -0,0 +1,169 @@
+"""
+비동기 HTTP 전송 계층 - 공유 연결 풀, API별 동시 요청 제한, 타임아웃, 지터 재시도
+"""
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("HTTPTransport")
+
+# 재시도할 HTTP 상태 코드 (요청 과다, 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HTTPTransportError(Exception):
+    """재시도 후에도 요청에 실패한 경우"""
+    def __init__(self, provider: str, message: str):
+        super().__init__(f"[{provider}] {message}")
+        self.provider = provider
+
+
+class AsyncHTTPTransport:
+    """
+    asyncio 기반 HTTP 전송 계층
+
+    - 연결 풀을 가진 requests.Session 하나를 전용 스레드 풀에서 실행하여 공유합니다
+    - API(provider)별 세마포어로 동시 요청 수를 제한합니다
+    - 연결 오류, 타임아웃, 429/5xx 응답은 지수 백오프 + 지터로 재시도합니다
+    """
+    def __init__(self, timeout: float = 10.0, retries: int = 2, backoff: float = 0.5,
+                 max_connections: int = 16, default_limit: int = 4):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.default_limit = default_limit
+
+        self._limits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 세마포어는 이벤트 루프마다 따로 생성 (asyncio.run을 여러 번 호출해도 안전하도록)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def set_limit(self, provider: str, limit: int):
+        """API별 최대 동시 요청 수 설정"""
+        self._limits[provider] = max(1, int(limit))
+
+    def _get_session(self) -> requests.Session:
+        """연결 풀을 가진 공유 세션과 실행용 스레드 풀 지연 생성"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.max_connections)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                                        thread_name_prefix="http-transport")
+                    self._session = session
+        return self._session
+
+    def _get_semaphore(self, provider: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(self._limits.get(provider, self.default_limit))
+        return semaphores[provider]
+
+    def _retry_delay(self, attempt: int) -> float:
+        """지수 백오프에 0.5~1.5배 지터 적용"""
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def get_json(self, provider: str, url: str, params: Optional[Dict] = None,
+                       timeout: Optional[float] = None, retries: Optional[int] = None) -> Any:
+        """
+        GET 요청 후 JSON 응답 반환
+
+        Raises:
+            HTTPTransportError: 재시도 후에도 실패한 경우
+        """
+        session = self._get_session()
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        loop = asyncio.get_running_loop()
+        last_error = None
+
+        for attempt in range(retries + 1):
+            if attempt:
+                await asyncio.sleep(self._retry_delay(attempt - 1))
+
+            async with self._get_semaphore(provider):
+                try:
+                    response = await loop.run_in_executor(
+                        self._executor, lambda: session.get(url, params=params, timeout=timeout)
+                    )
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    last_error = f"연결 실패: {str(e)}"
+                    logger.warning(f"{provider} 요청 실패 ({attempt + 1}/{retries + 1}): {last_error}")
+                    continue
+
+            if response.status_code in RETRY_STATUS_CODES:
+                last_error = f"HTTP {response.status_code}"
+                logger.warning(f"{provider} 요청 실패 ({attempt + 1}/{retries + 1}): {last_error}")
+                continue
+            if response.status_code >= 400:
+                raise HTTPTransportError(provider, f"HTTP {response.status_code}")
+
+            try:
+                return response.json()
+            except ValueError:
+                raise HTTPTransportError(provider, "JSON 응답이 아닙니다.")
+
+        raise HTTPTransportError(provider, last_error or "요청 실패")
+
+    def close(self):
+        """세션과 스레드 풀 정리"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._executor.shutdown(wait=False)
+                self._session = None
+                self._executor = None
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> AsyncHTTPTransport:
+    """프로세스 전체에서 공유하는 HTTP 전송 계층 반환"""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = AsyncHTTPTransport()
+    return _transport
+
+
+def run_coroutine(coro):
+    """
+    동기 코드에서 코루틴 실행
+    이미 이벤트 루프가 실행 중인 스레드(에이전트 도구 등)에서는 별도 스레드에서 실행합니다
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
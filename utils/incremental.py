@@ -0,0 +1,128 @@
+"""
+기획서 증분 처리 - 기획서를 내용 해시 기반 문단 청크로 나누고, 섹션별 입력 해시가 바뀐 섹션만 다시 처리
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.chunking import CONTEXT_TOKEN_BUDGET, SectionContextBuilder
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(*parts: str) -> str:
+    """여러 문자열을 구분자로 이어 붙인 SHA-256 해시"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IncrementalPlan:
+    """
+    기획서 한 개의 섹션별 입력과 이전 실행 결과 관리
+
+    각 섹션에는 첫 문단(제목/개요)과 섹션 키워드나 필수 요소 단어가 나타나는 문단만 입력으로 전달하고
+    (해당하는 문단이 없으면 전체 기획서, 토큰 예산을 넘으면 관련도가 높은 문단부터 예산 안에서 선택),
+    섹션 입력 해시는 다음 값으로 계산합니다:
+    - 섹션 ID와 분석/생성 프롬프트 템플릿 원문
+    - 섹션에 전달되는 문단 청크의 해시 (순서 포함)
+    - LLM 백엔드 식별자와 기타 처리 옵션(extra_key)
+
+    입력 해시가 manifest에 기록된 값과 같으면 이전 결과를 재사용합니다.
+
+    예시:
+        plan = IncrementalPlan(business_idea, sections, "output/.incremental/idea.json", backend.backend_id)
+        result = plan.cached_result("problem")
+        if result is None:
+            result = process(plan.section_input("problem"))
+            plan.store("problem", result)
+        plan.save()
+    """
+    def __init__(self, business_idea: str, sections, manifest_path: str, backend_id: str = "",
+                 extra_key: str = "", prompt_texts: Optional[Callable[[str], Tuple[str, str]]] = None,
+                 max_tokens: Optional[int] = CONTEXT_TOKEN_BUDGET):
+        self.manifest_path = manifest_path
+        self._full_text = business_idea
+        self._lock = threading.Lock()
+
+        builder = SectionContextBuilder(sections, max_tokens)
+        self.chunks = [(content_hash(paragraph), paragraph) for paragraph in builder.split(business_idea)]
+        selection = builder.select([paragraph for _, paragraph in self.chunks], scoped=True)
+
+        self._inputs: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        for section_id, indexes in selection.items():
+            self._inputs[section_id] = "\n\n".join(self.chunks[i][1] for i in indexes)
+
+            analysis_text, generation_text = prompt_texts(section_id) if prompt_texts else ("", "")
+            self._hashes[section_id] = content_hash(
+                section_id, analysis_text, generation_text, backend_id, extra_key,
+                *(self.chunks[i][0] for i in indexes)
+            )
+
+        self._previous = self._load()
+        self._results: Dict[str, Dict[str, str]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """이전 manifest의 섹션 기록 로드 (없거나 형식이 다르면 빈 사전)"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("sections", {})
+
+    def section_input(self, section_id: str) -> str:
+        """섹션 분석/생성에 전달할 기획서 내용"""
+        return self._inputs.get(section_id, self._full_text)
+
+    def input_hash(self, section_id: str) -> Optional[str]:
+        return self._hashes.get(section_id)
+
+    def include_dependencies(self, section_id: str, dependency_results: Dict[str, Optional[str]]):
+        """선행 섹션(depends_on) 결과를 섹션 입력 해시에 포함 (선행 섹션 결과가 바뀌면 이 섹션도 다시 처리)"""
+        if section_id in self._hashes and dependency_results:
+            parts = [f"{dep}\0{result or ''}" for dep, result in sorted(dependency_results.items())]
+            self._hashes[section_id] = content_hash(self._hashes[section_id], *parts)
+
+    def cached_result(self, section_id: str) -> Optional[str]:
+        """입력이 바뀌지 않은 섹션의 이전 결과 (없으면 None)"""
+        entry = self._previous.get(section_id)
+        if entry and entry.get("input_hash") == self._hashes.get(section_id):
+            with self._lock:
+                self._results[section_id] = entry
+            return entry.get("result")
+        return None
+
+    def store(self, section_id: str, result: str):
+        """새로 처리한 섹션 결과 기록 (save 호출 시 저장)"""
+        with self._lock:
+            self._results[section_id] = {"input_hash": self._hashes.get(section_id), "result": result}
+
+    def changed_sections(self) -> List[str]:
+        """입력이 바뀌었거나 이전 결과가 없는 섹션 ID 목록"""
+        return [section_id for section_id, input_hash in self._hashes.items()
+                if self._previous.get(section_id, {}).get("input_hash") != input_hash]
+
+    def save(self):
+        """manifest 저장 (이번에 처리하지 않은 섹션의 이전 기록은 유지)"""
+        with self._lock:
+            sections = dict(self._previous)
+            sections.update(self._results)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "chunks": [chunk_hash for chunk_hash, _ in self.chunks],
+            "sections": sections
+        }
+
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,301 @@
+"""
+프롬프트를 처리하여 응답을 돌려주는 LLM 백엔드 모음
+"""
+import time
+import shlex
+import subprocess
+import threading
+from typing import Callable, Dict, Iterator, Optional, Union
+
+
+class LLMResponseUnavailable(Exception):
+    """
+    백엔드가 응답을 받지 못했을 때 발생 (결과 캐시에 저장하지 않음)
+    호출하는 쪽은 fallback("<프롬프트 종류> 정보 없음")으로 처리를 계속할 수 있습니다
+    """
+    def __init__(self, prompt_type: str = "분석"):
+        super().__init__(f"{prompt_type} 결과를 가져올 수 없습니다")
+        self.fallback = f"{prompt_type} 정보 없음"
+
+
+def complete_or_fallback(backend: "LLMBackend", prompt: str, prompt_type: str = "분석") -> str:
+    """응답을 받지 못하면 대체 문구를 반환하는 complete()"""
+    try:
+        return backend.complete(prompt, prompt_type)
+    except LLMResponseUnavailable as e:
+        return e.fallback
+
+
+def stream_or_fallback(backend: "LLMBackend", prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+    """응답을 받지 못하면 대체 문구를 반환하는 stream()"""
+    try:
+        yield from backend.stream(prompt, prompt_type)
+    except LLMResponseUnavailable as e:
+        yield e.fallback
+
+
+class LLMBackend:
+    """
+    LLM 백엔드 기본 클래스
+    complete()는 프롬프트를 받아 응답 텍스트를 반환하고,
+    stream()은 응답을 생성되는 대로 조각(청크) 단위로 반환합니다
+    """
+    name = "base"
+    # 사용자 입력이 필요한 백엔드인지 여부 (True이면 병렬 처리 시 직렬화됨)
+    interactive = False
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        """프롬프트에 대한 응답 생성 (응답을 받지 못하면 LLMResponseUnavailable 발생)"""
+        raise NotImplementedError
+
+    def stream(self, prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+        """응답을 청크 단위로 생성 (스트리밍을 지원하지 않는 백엔드는 전체 응답을 한 번에 반환)"""
+        yield self.complete(prompt, prompt_type)
+
+    @property
+    def backend_id(self) -> str:
+        """캐시 키 등에 사용하는 백엔드 식별자"""
+        return self.name
+
+
+class ClipboardBackend(LLMBackend):
+    """
+    클립보드를 통해 사용자가 외부 AI 도구(Cursor AI 등)에 프롬프트를 붙여넣고
+    응답을 다시 복사해 오는 대화형 백엔드
+    """
+    name = "clipboard"
+    interactive = True
+
+    # 여러 섹션을 동시에 처리하더라도 콘솔 입력/클립보드 사용이 섞이지 않도록 보호
+    _lock = threading.RLock()
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        with self._lock:
+            return self._complete(prompt, prompt_type)
+
+    def _complete(self, prompt: str, prompt_type: str) -> str:
+        """클립보드 상호작용 처리 (잠금 획득 후 호출)"""
+        import pyperclip
+
+        pyperclip.copy(prompt)
+        print(f"{prompt_type} 프롬프트가 클립보드에 복사되었습니다.")
+        copy_again = True
+
+        while copy_again:
+            print("1. Cursor AI에 붙여넣기 후 실행해주세요")
+            print("2. 응답이 생성되면 복사 버튼을 클릭하세요")
+            option = input("3. 복사가 완료되면 Enter를 눌러 계속하세요 (다시 복사하려면 'r' 입력): ").strip().lower()
+
+            if option == 'r':
+                pyperclip.copy(prompt)
+                print(f"{prompt_type} 프롬프트가 클립보드에 다시 복사되었습니다.")
+            else:
+                copy_again = False
+
+        # 클립보드에서 결과 가져오기
+        result = pyperclip.paste()
+        if not result or result == prompt:
+            print(f"경고: 클립보드에서 유효한 {prompt_type} 결과를 가져올 수 없습니다.")
+            user_input = input(f"직접 {prompt_type} 결과를 입력하시겠습니까? (y/n): ").strip().lower()
+            if user_input == 'y':
+                print(f"{prompt_type} 결과를 입력하세요. 입력을 마치려면 빈 줄에서 Ctrl+D (Unix) 또는 Ctrl+Z (Windows)를 입력하세요:")
+                lines = []
+                while True:
+                    try:
+                        line = input()
+                        lines.append(line)
+                    except EOFError:
+                        break
+                result = "\n".join(lines)
+            else:
+                raise LLMResponseUnavailable(prompt_type)
+
+        return result
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    OpenAI Chat Completions API를 사용하는 비대화형 백엔드
+    API 키는 OPENAI_API_KEY 환경 변수에서 읽습니다
+    """
+    name = "openai"
+
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.3, timeout: float = 120.0):
+        self.model = model
+        self.temperature = temperature
+        self.timeout = timeout
+        self._client = None
+
+    @property
+    def backend_id(self) -> str:
+        return f"{self.name}:{self.model}"
+
+    def _get_client(self):
+        """OpenAI 클라이언트 지연 생성 (openai 패키지는 이 백엔드에서만 필요)"""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(timeout=self.timeout)
+        return self._client
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        response = self._get_client().chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.choices[0].message.content or ""
+
+    def stream(self, prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+        response = self._get_client().chat.completions.create(
+            model=self.model,
+            temperature=self.temperature,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def __getstate__(self):
+        # 프로세스 풀로 전달할 때 클라이언트 객체는 제외
+        state = self.__dict__.copy()
+        state["_client"] = None
+        return state
+
+
+class CommandBackend(LLMBackend):
+    """
+    외부 명령(로컬 LLM CLI 등)에 프롬프트를 표준 입력으로 전달하고
+    표준 출력을 응답으로 사용하는 비대화형 백엔드
+    """
+    name = "command"
+
+    def __init__(self, command: str = "", timeout: float = 600.0):
+        if not command:
+            raise ValueError("command 백엔드에는 실행할 명령이 필요합니다.")
+        self.command = command
+        self.timeout = timeout
+
+    @property
+    def backend_id(self) -> str:
+        return f"{self.name}:{self.command}"
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        completed = subprocess.run(
+            shlex.split(self.command),
+            input=prompt,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            timeout=self.timeout
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"명령 실행 실패 (종료 코드 {completed.returncode}): {completed.stderr.strip()}")
+        return completed.stdout.strip()
+
+    def stream(self, prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+        """명령의 표준 출력을 줄 단위로 반환"""
+        process = subprocess.Popen(
+            shlex.split(self.command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8"
+        )
+
+        # 긴 프롬프트 전달 중 출력 버퍼가 가득 차 멈추지 않도록 별도 스레드에서 입력
+        def write_prompt():
+            try:
+                process.stdin.write(prompt)
+            except OSError:
+                pass
+            finally:
+                process.stdin.close()
+
+        # 표준 오류가 파이프 버퍼를 채워 명령이 멈추지 않도록 별도 스레드에서 계속 읽음
+        errors = []
+
+        def read_errors():
+            for line in process.stderr:
+                errors.append(line)
+
+        writer = threading.Thread(target=write_prompt, daemon=True)
+        writer.start()
+        error_reader = threading.Thread(target=read_errors, daemon=True)
+        error_reader.start()
+
+        # 시간 초과 시 명령 종료
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        try:
+            for line in process.stdout:
+                yield line
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            writer.join()
+            error_reader.join()
+
+        if returncode != 0:
+            raise RuntimeError(f"명령 실행 실패 (종료 코드 {returncode}): {''.join(errors).strip()}")
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    테스트 및 시험 실행용 로컬 가짜 LLM 백엔드
+    미리 정한 응답을 chunk_size 글자씩 나누어 (선택적으로 delay초 간격으로) 스트리밍합니다
+    """
+    name = "fake"
+
+    DEFAULT_RESPONSES = {
+        "분석": "시장 규모: 없음 - 국내 시장 규모 데이터가 필요함",
+        "생성": "◦ 시장 현황\n- 시장이 빠르게 성장하고 있습니다 [필요 정보: 국내 시장 규모]\n- 첫 번째 핵심 포인트"
+    }
+
+    def __init__(self, responses: Optional[Union[Dict[str, str], Callable[[str, str], str]]] = None,
+                 chunk_size: int = 16, delay: float = 0.0):
+        self.responses = responses if responses is not None else dict(self.DEFAULT_RESPONSES)
+        self.chunk_size = max(1, chunk_size)
+        self.delay = delay
+
+    def _response(self, prompt: str, prompt_type: str) -> str:
+        if callable(self.responses):
+            return self.responses(prompt, prompt_type)
+        return self.responses.get(prompt_type, "")
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        return self._response(prompt, prompt_type)
+
+    def stream(self, prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+        text = self._response(prompt, prompt_type)
+        for start in range(0, len(text), self.chunk_size):
+            if self.delay:
+                time.sleep(self.delay)
+            yield text[start:start + self.chunk_size]
+
+
+# 이름 → 백엔드 클래스
+BACKENDS = {
+    ClipboardBackend.name: ClipboardBackend,
+    OpenAIBackend.name: OpenAIBackend,
+    CommandBackend.name: CommandBackend,
+    FakeLLMBackend.name: FakeLLMBackend
+}
+
+
+def get_backend(name: str = "clipboard", options: Optional[Dict] = None) -> LLMBackend:
+    """
+    이름으로 LLM 백엔드 생성
+
+    Args:
+        name: 백엔드 이름 (clipboard, openai, command, fake)
+        options: 백엔드 생성자에 전달할 옵션
+    """
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"알 수 없는 LLM 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return backend_class(**(options or {}))
@@ -0,0 +1,213 @@
+"""
+LLM 결과 캐시 - 렌더링된 프롬프트와 백엔드/모델 식별자의 해시로 분석·생성 결과를 저장 (SQLite, 크기 제한 LRU)
+"""
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterator, Optional
+
+from utils.llm_backend import LLMBackend
+
+# 기본 캐시 파일 경로
+DEFAULT_LLM_CACHE_PATH = os.path.join("data", "cache", "llm_results.sqlite3")
+
+# 기본 최대 저장 용량 (바이트)
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# 캐시 사용 방식: off(사용 안 함), read(조회만), readwrite(조회 및 저장)
+CACHE_MODES = ("off", "read", "readwrite")
+
+
+class LLMResultCache:
+    """
+    LLM 응답을 내용 주소(프롬프트 해시)로 저장하는 디스크 캐시
+
+    - 키는 백엔드 식별자, 프롬프트 종류, 렌더링된 프롬프트 전체의 SHA-256 해시입니다
+    - 저장된 응답의 총 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다
+    - 여러 프로세스(일괄 처리 작업자)가 같은 파일을 공유할 수 있습니다
+    """
+    def __init__(self, path: str = DEFAULT_LLM_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, backend TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(backend_id: str, prompt: str, prompt_type: str = "") -> str:
+        """백엔드 식별자, 프롬프트 종류, 프롬프트 전체로 키 생성"""
+        digest = hashlib.sha256()
+        for part in (backend_id, prompt_type, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, backend_id: str, prompt: str, prompt_type: str = "") -> Optional[str]:
+        """캐시된 응답 반환 (없으면 None)"""
+        key = self.make_key(backend_id, prompt, prompt_type)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self._stats["hits"] += 1
+            return row[0]
+
+    def set(self, backend_id: str, prompt: str, value: str, prompt_type: str = ""):
+        """응답 저장 후 크기 제한 적용"""
+        key = self.make_key(backend_id, prompt, prompt_type)
+        size = len(value.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, backend, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, backend_id, value, size, now, now)
+            )
+            self._stats["writes"] += 1
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                # 오래 사용되지 않은 순서로 초과 용량만큼 삭제
+                evict_keys = []
+                for old_key, old_size in self._conn.execute("SELECT key, size FROM results ORDER BY accessed_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    evict_keys.append(old_key)
+                    total -= old_size
+                self._conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in evict_keys])
+                self._stats["evictions"] += len(evict_keys)
+            self._conn.commit()
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패 통계와 현재 항목 수, 저장 용량"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"], stats["bytes"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedBackend(LLMBackend):
+    """
+    다른 LLM 백엔드의 응답을 LLMResultCache에 저장하고 재사용하는 백엔드
+
+    같은 백엔드(모델)에 같은 프롬프트를 보내면 캐시된 응답을 바로 반환합니다.
+    mode가 "read"이면 조회만 하고 새 응답은 저장하지 않습니다.
+    백엔드가 응답을 받지 못하면(LLMResponseUnavailable 등 예외) 아무것도 저장하지 않고 예외를 그대로 전달합니다.
+    """
+    def __init__(self, backend: LLMBackend, cache: Optional[LLMResultCache] = None, mode: str = "readwrite"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"알 수 없는 캐시 방식입니다: {mode} (사용 가능: {', '.join(CACHE_MODES)})")
+        self.backend = backend
+        self.mode = mode
+        self._cache = cache
+
+    @property
+    def name(self) -> str:
+        return self.backend.name
+
+    @property
+    def interactive(self) -> bool:
+        return self.backend.interactive
+
+    @property
+    def backend_id(self) -> str:
+        return self.backend.backend_id
+
+    @property
+    def cache(self) -> LLMResultCache:
+        if self._cache is None:
+            self._cache = get_llm_cache()
+        return self._cache
+
+    def _lookup(self, prompt: str, prompt_type: str) -> Optional[str]:
+        if self.mode == "off":
+            return None
+        cached = self.cache.get(self.backend_id, prompt, prompt_type)
+        if cached is not None:
+            print(f"♻️ 캐시된 {prompt_type} 결과를 사용합니다.")
+        return cached
+
+    def _store(self, prompt: str, prompt_type: str, value: str):
+        if self.mode == "readwrite" and value:
+            self.cache.set(self.backend_id, prompt, value, prompt_type)
+
+    def complete(self, prompt: str, prompt_type: str = "분석") -> str:
+        cached = self._lookup(prompt, prompt_type)
+        if cached is not None:
+            return cached
+        result = self.backend.complete(prompt, prompt_type)
+        self._store(prompt, prompt_type, result)
+        return result
+
+    def stream(self, prompt: str, prompt_type: str = "분석") -> Iterator[str]:
+        cached = self._lookup(prompt, prompt_type)
+        if cached is not None:
+            yield cached
+            return
+
+        # 응답을 끝까지 받은 경우에만 저장
+        chunks = []
+        for chunk in self.backend.stream(prompt, prompt_type):
+            chunks.append(chunk)
+            yield chunk
+        self._store(prompt, prompt_type, "".join(chunks))
+
+    def __getstate__(self):
+        # 프로세스 풀로 전달할 때 SQLite 연결은 제외 (작업자 프로세스에서 다시 연결)
+        state = self.__dict__.copy()
+        state["_cache"] = None
+        return state
+
+
+def with_cache(backend: LLMBackend, mode: str = "readwrite", cache: Optional[LLMResultCache] = None) -> LLMBackend:
+    """mode가 "off"가 아니면 백엔드를 CachedBackend로 감싸서 반환"""
+    if mode == "off" or isinstance(backend, CachedBackend):
+        return backend
+    return CachedBackend(backend, cache, mode)
+
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResultCache:
+    """프로세스 전체에서 공유하는 LLM 결과 캐시 반환 (fork된 작업자 프로세스는 새 연결 사용)"""
+    global _cache, _cache_pid
+    if _cache is None or _cache_pid != os.getpid():
+        with _cache_lock:
+            if _cache is None or _cache_pid != os.getpid():
+                _cache = LLMResultCache()
+                _cache_pid = os.getpid()
+    return _cache
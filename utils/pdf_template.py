@@ -0,0 +1,327 @@
+"""
+PDF 템플릿 캐시 - 템플릿을 프로세스당 한 번만 읽어 페이지 트리와 리소스를 보관하고,
+결과 문서는 원본 바이트 뒤에 바뀐 페이지만 덧붙이는 증분 업데이트(copy-on-write)로 작성
+
+- 바뀌지 않은 페이지, 글꼴, 이미지는 원본 바이트를 그대로 공유하므로 작성 비용은 바뀐 페이지 수에 비례합니다
+- 템플릿 객체는 수정하지 않고 복사본만 바꾸므로 여러 작업(스레드)이 같은 캐시를 함께 사용할 수 있습니다
+- 교차 참조 스트림(PDF 1.5 압축 형식)이나 암호화된 템플릿은 PdfWriter로 전체를 다시 씁니다
+"""
+import io
+import os
+import copy
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+    RectangleObject, StreamObject
+)
+
+# 오버레이를 그리는 Form XObject 이름
+OVERLAY_XOBJECT = "/TextOverlay"
+
+
+def _overlay_form(overlay_page, resources) -> DecodedStreamObject:
+    """오버레이 페이지 내용을 Form XObject로 변환"""
+    form = DecodedStreamObject()
+    form.set_data(overlay_page.get_contents().get_data())
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): RectangleObject(overlay_page.mediabox),
+        NameObject("/Resources"): resources
+    })
+    return form
+
+
+def _stream(data: bytes) -> StreamObject:
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return stream
+
+
+def _stamped_page(page: DictionaryObject, resources: DictionaryObject, form_ref, original_contents: List,
+                  add_stream) -> DictionaryObject:
+    """
+    페이지 사본에 오버레이 Form XObject를 추가 (원본 페이지와 리소스 사전은 수정하지 않음)
+    원래 내용은 q/Q로 감싸 그래픽 상태가 오버레이에 영향을 주지 않도록 합니다
+    """
+    resources = DictionaryObject(resources)
+    xobjects = DictionaryObject(resources.get("/XObject", DictionaryObject()).get_object())
+    name = OVERLAY_XOBJECT
+    while name in xobjects:
+        name += "_"
+    xobjects[NameObject(name)] = form_ref
+    resources[NameObject("/XObject")] = xobjects
+
+    stamped = DictionaryObject(page)
+    stamped[NameObject("/Resources")] = resources
+    stamped[NameObject("/Contents")] = ArrayObject(
+        [add_stream(b"q\n")] + list(original_contents) + [add_stream(f"\nQ\nq {name} Do Q\n".encode("ascii"))]
+    )
+    return stamped
+
+
+class _Update:
+    """증분 업데이트 한 번에 쓸 객체 모음 (새 객체 번호 할당, 오버레이 객체 가져오기)"""
+    def __init__(self, first_number: int):
+        self.next_number = first_number
+        self.objects: Dict[int, object] = {}
+
+    def add(self, obj) -> IndirectObject:
+        number = self.next_number
+        self.next_number += 1
+        self.objects[number] = obj
+        return IndirectObject(number, 0, None)
+
+    def replace(self, ref: IndirectObject, obj):
+        self.objects[ref.idnum] = obj
+
+    def add_stream(self, data: bytes) -> IndirectObject:
+        return self.add(_stream(data))
+
+    def import_object(self, obj, mapping: Dict[int, IndirectObject]):
+        """다른 PDF(오버레이)의 객체를 새 번호로 복사 (참조하는 객체도 함께)"""
+        if isinstance(obj, IndirectObject):
+            if obj.idnum not in mapping:
+                mapping[obj.idnum] = self.add(None)
+                self.objects[mapping[obj.idnum].idnum] = self.import_object(obj.get_object(), mapping)
+            return mapping[obj.idnum]
+        if isinstance(obj, DictionaryObject):
+            copied = copy.copy(obj)
+            for key, value in obj.items():
+                if key != "/Parent":
+                    copied[key] = self.import_object(value, mapping)
+            return copied
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self.import_object(value, mapping) for value in obj)
+        return obj
+
+
+class ParsedTemplate:
+    """
+    한 번 읽어 둔 PDF 템플릿
+
+    예시:
+        template = get_pdf_template("data/templates/template.pdf")
+        template.write("output/plan.pdf", {0: overlay_reader})
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.reader = PdfReader(io.BytesIO(self.data))
+        self._lock = threading.Lock()
+
+        self.startxref = self._find_startxref()
+        self.incremental = (
+            not self.reader.is_encrypted
+            and self.startxref is not None
+            and self.data[self.startxref:self.startxref + 4] == b"xref"
+        )
+
+        # 페이지 트리와 리소스를 미리 해석해 둠 (이후 렌더링에서는 템플릿 스트림을 다시 읽지 않음)
+        trailer = self.reader.trailer
+        self.size = int(trailer["/Size"])
+        self.trailer_refs = {key: trailer.raw_get(key) for key in ("/Root", "/Info", "/ID") if key in trailer}
+        self.pages = []
+        for page in self.reader.pages:
+            # 작성 중에는 공유 reader를 읽지 않도록 수정할 사전은 미리 풀어 둠 (여러 스레드가 동시에 작성 가능)
+            resources = DictionaryObject(self._inherited(page, "/Resources") or DictionaryObject())
+            if "/XObject" in resources:
+                resources[NameObject("/XObject")] = DictionaryObject(resources["/XObject"])
+            self.pages.append({
+                "ref": page.indirect_reference,
+                "page": DictionaryObject(page),
+                "resources": resources,
+                "contents": self._contents_of(page),
+                "size": (float(page.mediabox.width), float(page.mediabox.height)),
+                "parent": page.raw_get("/Parent")
+            })
+        self._nodes = {}
+        for entry in self.pages:
+            parent = entry["parent"]
+            while parent is not None and parent.idnum not in self._nodes:
+                node = parent.get_object()
+                self._nodes[parent.idnum] = DictionaryObject(node)
+                self._nodes[parent.idnum][NameObject("/Kids")] = ArrayObject(node["/Kids"])
+                parent = node.raw_get("/Parent") if "/Parent" in node else None
+
+    def _find_startxref(self) -> Optional[int]:
+        position = self.data.rfind(b"startxref")
+        if position < 0:
+            return None
+        try:
+            return int(self.data[position + 9:].split()[0])
+        except (ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _inherited(page, key):
+        """페이지 또는 상위 페이지 트리에서 상속되는 속성 (예: /Resources)"""
+        node = page
+        while node is not None:
+            if key in node:
+                return node[key].get_object()
+            node = node.get("/Parent")
+            node = node.get_object() if node is not None else None
+        return None
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page_size(self, page_num: int) -> Tuple[float, float]:
+        return self.pages[page_num]["size"]
+
+    def write(self, output_path: str, overlays: Dict[int, PdfReader]):
+        """
+        오버레이를 적용한 결과 문서 저장
+
+        Args:
+            overlays: 페이지 번호 → 오버레이 PDF (첫 페이지는 템플릿 페이지 위에 그리고, 나머지는 그 뒤에 추가)
+        """
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        if not self.incremental:
+            with self._lock:
+                self._write_full(output_path, overlays)
+            return output_path
+
+        appendix = self._incremental_update(overlays)
+        with open(output_path, "wb") as f:
+            f.write(self.data)
+            f.write(appendix)
+        return output_path
+
+    def _incremental_update(self, overlays: Dict[int, PdfReader]) -> bytes:
+        """바뀐 페이지와 새 객체만 담은 증분 업데이트 구역 생성"""
+        update = _Update(self.size)
+        nodes: Dict[int, DictionaryObject] = {}
+
+        def node_copy(ref: IndirectObject) -> DictionaryObject:
+            if ref.idnum not in nodes:
+                original = self._nodes[ref.idnum]
+                nodes[ref.idnum] = DictionaryObject(original)
+                nodes[ref.idnum][NameObject("/Kids")] = ArrayObject(original["/Kids"])
+            return nodes[ref.idnum]
+
+        for page_num in sorted(overlays):
+            entry = self.pages[page_num]
+            overlay = overlays[page_num]
+            mapping: Dict[int, IndirectObject] = {}
+
+            first = overlay.pages[0]
+            resources = update.import_object(first.raw_get("/Resources"), mapping)
+            form_ref = update.add(_overlay_form(first, resources))
+            update.replace(entry["ref"], _stamped_page(
+                entry["page"], entry["resources"], form_ref, entry["contents"], update.add_stream
+            ))
+
+            # 넘친 내용은 새 페이지로 만들어 템플릿 페이지 바로 뒤에 삽입
+            extra_refs = []
+            for extra in overlay.pages[1:]:
+                extra_page = DictionaryObject({
+                    NameObject("/Type"): NameObject("/Page"),
+                    NameObject("/Parent"): entry["parent"],
+                    NameObject("/MediaBox"): RectangleObject(extra.mediabox),
+                    NameObject("/Resources"): update.import_object(extra.raw_get("/Resources"), mapping),
+                    NameObject("/Contents"): update.import_object(extra.raw_get("/Contents"), mapping)
+                })
+                extra_refs.append(update.add(extra_page))
+            if extra_refs:
+                parent = node_copy(entry["parent"])
+                kids = parent["/Kids"]
+                position = next(i for i, kid in enumerate(kids) if kid.idnum == entry["ref"].idnum)
+                parent[NameObject("/Kids")] = ArrayObject(kids[:position + 1] + extra_refs + kids[position + 1:])
+                # 상위 페이지 트리 노드의 페이지 수 갱신
+                ref = entry["parent"]
+                while ref is not None:
+                    node = node_copy(ref)
+                    node[NameObject("/Count")] = NumberObject(int(node["/Count"]) + len(extra_refs))
+                    ref = node.raw_get("/Parent") if "/Parent" in node else None
+
+        for number, node in nodes.items():
+            update.objects[number] = node
+        return self._serialize(update)
+
+    def _serialize(self, update: _Update) -> bytes:
+        """증분 업데이트 구역(객체, 교차 참조 표, 트레일러) 직렬화"""
+        buffer = io.BytesIO()
+        base = len(self.data)
+        if not self.data.endswith(b"\n"):
+            buffer.write(b"\n")
+
+        offsets = {}
+        for number in sorted(update.objects):
+            offsets[number] = base + buffer.tell()
+            buffer.write(f"{number} 0 obj\n".encode("ascii"))
+            update.objects[number].write_to_stream(buffer, None)
+            buffer.write(b"\nendobj\n")
+
+        xref_offset = base + buffer.tell()
+        # 0번(빈 객체 목록의 시작) 항목부터 써서 0부터 시작하는 표로 읽히도록 함
+        buffer.write(b"xref\n0 1\n0000000000 65535 f \n")
+        numbers = sorted(offsets)
+        start = 0
+        while start < len(numbers):
+            end = start
+            while end + 1 < len(numbers) and numbers[end + 1] == numbers[end] + 1:
+                end += 1
+            buffer.write(f"{numbers[start]} {end - start + 1}\n".encode("ascii"))
+            for number in numbers[start:end + 1]:
+                buffer.write(f"{offsets[number]:010d} 00000 n \n".encode("ascii"))
+            start = end + 1
+
+        trailer = DictionaryObject({NameObject(key): value for key, value in self.trailer_refs.items()})
+        trailer[NameObject("/Size")] = NumberObject(max(self.size, update.next_number))
+        trailer[NameObject("/Prev")] = NumberObject(self.startxref)
+        buffer.write(b"trailer\n")
+        trailer.write_to_stream(buffer, None)
+        buffer.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+        return buffer.getvalue()
+
+    def _write_full(self, output_path: str, overlays: Dict[int, PdfReader]):
+        """증분 업데이트를 쓸 수 없는 템플릿은 PdfWriter로 전체 문서를 다시 씀"""
+        writer = PdfWriter()
+        for page_num, page in enumerate(self.reader.pages):
+            written_page = writer.add_page(page)
+            overlay = overlays.get(page_num)
+            if overlay is None:
+                continue
+            first = overlay.pages[0]
+            form_ref = writer._add_object(_overlay_form(first, first["/Resources"].clone(writer)))
+            stamped = _stamped_page(
+                written_page, written_page.get("/Resources", DictionaryObject()).get_object(), form_ref,
+                self._contents_of(written_page), lambda data: writer._add_object(_stream(data))
+            )
+            written_page.update(stamped)
+            for extra_page in overlay.pages[1:]:
+                writer.add_page(extra_page)
+        with open(output_path, "wb") as f:
+            writer.write(f)
+
+    @staticmethod
+    def _contents_of(page) -> List:
+        contents = page.raw_get("/Contents") if "/Contents" in page else None
+        if contents is None:
+            return []
+        resolved = contents.get_object()
+        return list(resolved) if isinstance(resolved, ArrayObject) else [contents]
+
+
+_templates: Dict[str, Tuple[Tuple[float, int], ParsedTemplate]] = {}
+_templates_lock = threading.Lock()
+
+
+def get_pdf_template(path: str) -> ParsedTemplate:
+    """프로세스 전체에서 공유하는 템플릿 반환 (파일이 바뀌면 다시 읽음)"""
+    key = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime, stat.st_size)
+    with _templates_lock:
+        cached = _templates.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, ParsedTemplate(path))
+            _templates[key] = cached
+        return cached[1]
@@ -1,145 +1,287 @@
-from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2 import PdfReader
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 import io
 import os
+import re
+import threading
+from collections import defaultdict
 from docx import Document
+from utils.document_ast import (
+    BLANK, BULLET, HEADING, ITEM, PAGE_BREAK, PARAGRAPH, PLACEHOLDER, Block, iter_section_blocks
+)
+from utils.docx_merge import merge_docx
+from utils.streaming import PLACEHOLDER_PATTERN
+from utils.docx_stream import write_docx
+from utils.pdf_template import get_pdf_template
 
-def insert_text_to_pdf(input_pdf, output_pdf, text, position, font_size=12):
-    """PDF 템플릿의 지정된 위치에 텍스트 삽입"""
-    reader = PdfReader(input_pdf)
-    writer = PdfWriter()
-    
-    # 텍스트 위치와 페이지 정보
-    page_num, x, y = position
+# 기본 사업계획서 PDF 템플릿
+DEFAULT_TEMPLATE_PDF = os.path.join("data", "templates", "template.pdf")
+
+# 한글 TTF 글꼴 후보 (KOREAN_FONT_PATH 환경 변수가 우선, 찾은 글꼴은 사용한 글자만 PDF에 포함됨)
+KOREAN_FONT_CANDIDATES = [
+    os.path.join("data", "fonts", "NanumGothic.ttf"),
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf"
+]
+
+# TTF 글꼴을 찾지 못했을 때 사용하는 한글 CID 글꼴 (파일에 포함되지 않고 PDF 뷰어의 한글 글꼴로 표시)
+KOREAN_CID_FONT = "HYGothic-Medium"
+
+_registered_fonts = {}
+_font_lock = threading.Lock()
+
+
+def register_korean_font(font_path=None):
+    """한글 글꼴을 reportlab에 한 번만 등록하고 글꼴 이름 반환 (Helvetica는 한글을 표시하지 못함)"""
+    path = font_path or os.environ.get("KOREAN_FONT_PATH")
+    if not path:
+        path = next((candidate for candidate in KOREAN_FONT_CANDIDATES if os.path.exists(candidate)), None)
+    key = path or KOREAN_CID_FONT
     
-    # 해당 페이지 수정
-    if page_num < len(reader.pages):
-        # 텍스트 오버레이 생성
-        packet = io.BytesIO()
-        c = canvas.Canvas(packet, pagesize=A4)
-        c.setFont("Helvetica", font_size)
+    with _font_lock:
+        if key in _registered_fonts:
+            return _registered_fonts[key]
         
-        # 텍스트 줄바꿈 처리
-        lines = text.split('\n')
-        current_y = y
-        line_height = font_size * 1.2
+        font_name = KOREAN_CID_FONT
+        if path:
+            try:
+                font_name = f"Korean-{os.path.splitext(os.path.basename(path))[0]}"
+                pdfmetrics.registerFont(TTFont(font_name, path))
+            except Exception as e:
+                print(f"⚠️ 글꼴을 불러올 수 없어 기본 한글 글꼴을 사용합니다 ({path}): {str(e)}")
+                font_name = KOREAN_CID_FONT
+        if font_name == KOREAN_CID_FONT:
+            pdfmetrics.registerFont(UnicodeCIDFont(KOREAN_CID_FONT))
         
-        for line in lines:
-            c.drawString(x, current_y, line)
-            current_y -= line_height
+        _registered_fonts[key] = font_name
+        return font_name
+
+
+def wrap_text(text, font_name, font_size, max_width):
+    """텍스트를 주어진 너비에 맞게 줄바꿈 (공백 기준, 공백 없이 긴 단어는 글자 단위로 나눔)"""
+    def width(value):
+        return pdfmetrics.stringWidth(value, font_name, font_size)
+    
+    lines = []
+    for raw_line in text.split('\n'):
+        current, current_width = "", 0.0
+        for word in re.split(r"(\s+)", raw_line):
+            if not word:
+                continue
+            word_width = width(word)
+            if current_width + word_width <= max_width:
+                current, current_width = current + word, current_width + word_width
+                continue
+            if word.isspace():
+                continue
+            if current.strip():
+                lines.append(current.rstrip())
+            current, current_width = "", 0.0
+            
+            # 한 줄보다 긴 단어는 글자 단위로 나눔
+            while word_width > max_width and len(word) > 1:
+                cut, cut_width = 0, 0.0
+                while cut < len(word) and cut_width + width(word[cut]) <= max_width:
+                    cut_width += width(word[cut])
+                    cut += 1
+                cut = max(cut, 1)
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = width(word)
+            current, current_width = word, word_width
+        lines.append(current.rstrip())
+    return lines
+
+
+def fill_pdf_template(template_pdf, output_pdf, placements, font_size=10, font_path=None, margin=50,
+                      line_spacing=1.4):
+    """
+    PDF 템플릿의 여러 위치에 텍스트를 한 번에 삽입
+    
+    템플릿은 프로세스당 한 번만 읽어 캐시(pdf_template.get_pdf_template)하고, 텍스트가 들어가는 페이지마다
+    오버레이를 하나씩 만들어 바뀐 페이지만 원본 뒤에 덧붙입니다 (증분 업데이트).
+    텍스트는 페이지 오른쪽 여백에 맞춰 줄바꿈하고, 아래 여백을 넘으면 해당 페이지 바로 뒤에 이어지는 페이지를 추가합니다.
+    
+    Args:
+        placements: [(텍스트, (페이지 번호, x, y))] (같은 페이지에 여러 개 가능, 순서대로 배치)
+        font_path: 한글 TTF 글꼴 경로 (없으면 register_korean_font의 기본 글꼴)
+    """
+    template = get_pdf_template(template_pdf)
+    font_name = register_korean_font(font_path)
+    line_height = font_size * line_spacing
+    
+    by_page = defaultdict(list)
+    for text, (page_num, x, y) in placements:
+        if 0 <= page_num < template.page_count:
+            by_page[page_num].append((text, x, y))
+        else:
+            print(f"⚠️ 템플릿에 {page_num}번 페이지가 없어 텍스트를 건너뜁니다.")
+    
+    # 페이지별 오버레이 생성 (첫 페이지는 템플릿 페이지에 합치고, 나머지는 넘친 내용)
+    overlays = {}
+    for page_num, items in by_page.items():
+        page_width, page_height = template.page_size(page_num)
         
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet, pagesize=(page_width, page_height))
+        c.setFont(font_name, font_size)
+        overflowed = False
+        current_y = 0.0
+        for text, x, y in items:
+            # 넘친 페이지에서는 이전 텍스트 바로 아래에 이어서 배치
+            if not overflowed:
+                current_y = y
+            for line in wrap_text(text, font_name, font_size, page_width - x - margin):
+                if current_y < margin:
+                    c.showPage()
+                    c.setFont(font_name, font_size)
+                    current_y = page_height - margin
+                    overflowed = True
+                if line:
+                    c.drawString(x, current_y, line)
+                current_y -= line_height
         c.save()
         packet.seek(0)
-        
-        # 오버레이 적용
-        overlay = PdfReader(packet)
-        page = reader.pages[page_num]
-        page.merge_page(overlay.pages[0])
-        
-        # 수정된 페이지 추가
-        writer.add_page(page)
+        overlays[page_num] = PdfReader(packet)
     
-    # 나머지 페이지 추가
-    for i in range(len(reader.pages)):
-        if i != page_num:
-            writer.add_page(reader.pages[i])
-    
-    # 결과 저장
-    with open(output_pdf, "wb") as f:
-        writer.write(f)
+    template.write(output_pdf, overlays)
     
     return output_pdf
 
+def insert_text_to_pdf(input_pdf, output_pdf, text, position, font_size=12):
+    """PDF 템플릿의 지정된 위치에 텍스트 삽입 (여러 위치는 fill_pdf_template로 한 번에 삽입)"""
+    return fill_pdf_template(input_pdf, output_pdf, [(text, position)], font_size=font_size)
+
 def create_docx_with_section(section_content, output_path, title="1. 문제 인식 (Problem)_창업 아이템의 필요성"):
     """Word 문서에 섹션 내용 삽입"""
-    doc = Document()
-    
-    # 제목 추가
-    doc.add_heading(title, level=1)
-    
-    # 내용 분석
-    lines = section_content.split('\n')
-    for line in lines:
-        if line.startswith('◦'):
-            # 첫 번째 수준 항목
-            p = doc.add_paragraph()
-            p.add_run(line).bold = True
-        elif line.startswith('-'):
-            # 두 번째 수준 항목
-            doc.add_paragraph(line, style='List Bullet')
-        elif line.strip():
-            # 일반 텍스트
-            doc.add_paragraph(line)
-    
-    # 저장
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    doc.save(output_path)
-    return output_path
+    return write_docx(output_path, iter_section_blocks({title: section_content}))
 
 def create_docx_with_sections(output_path, sections_dict):
-    """여러 섹션을 포함하는 Word 문서 생성"""
-    doc = Document()
+    """
+    여러 섹션을 포함하는 Word 문서 생성
     
-    # 각 섹션 추가
-    for title, content in sections_dict.items():
-        # 제목 추가
-        doc.add_heading(title, level=1)
-        
-        # 내용 분석
-        lines = content.split('\n')
-        for line in lines:
-            if line.startswith('◦'):
-                # 첫 번째 수준 항목
-                p = doc.add_paragraph()
-                p.add_run(line).bold = True
-            elif line.startswith('-'):
-                # 두 번째 수준 항목
-                doc.add_paragraph(line, style='List Bullet')
-            elif line.strip():
-                # 일반 텍스트
-                doc.add_paragraph(line)
-        
-        # 섹션 간 간격 추가 (마지막 섹션이 아닌 경우)
-        if title != list(sections_dict.keys())[-1]:
-            doc.add_paragraph()
-    
-    # 저장
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    doc.save(output_path)
-    return output_path
+    섹션 내용을 한 줄씩 블록으로 바꾸는 대로 word/document.xml에 바로 기록하므로(docx_stream),
+    섹션이 많거나 여러 기획서를 합친 문서도 메모리 사용량이 늘지 않고 작성 시간은 내용 길이에 비례합니다.
+    """
+    return write_docx(output_path, iter_section_blocks(sections_dict))
 
 def merge_docx_files(input_files, output_file):
-    """여러 Word 문서를 하나로 병합"""
-    # 첫 번째 문서를 기준으로 병합
-    master_doc = Document(input_files[0])
+    """
+    여러 Word 문서를 하나로 병합
+    
+    본문을 XML 요소 단위로 이어 붙이고 스타일/번호 매기기 정의는 문서마다 한 번만 맞추므로(docx_merge),
+    표, 굵게 등 실행 서식, 목록 번호, 이미지가 유지됩니다. 문서 사이에는 페이지 나누기를 넣습니다.
+    """
+    return merge_docx(input_files, output_file)
+
+# 블록 종류별 PDF 서식: (글자 크기 증가, 들여쓰기, 앞 간격(줄 높이 비율), 굵게)
+PDF_BLOCK_STYLES = {
+    "heading": (4, 0, 1.0, True),
+    "item": (0, 0, 0.4, True),
+    "bullet": (0, 12, 0.0, False),
+    "text": (0, 0, 0.2, False),
+    "placeholder": (0, 0, 0.2, False)
+}
+
+
+def docx_to_blocks(docx_path):
+    """Word 문서의 단락을 블록 목록으로 변환 (제목/굵은 항목/목록 스타일/페이지 나누기/필요 정보 표시 인식)"""
+    blocks = []
+    for paragraph in Document(docx_path).paragraphs:
+        page_break = bool(paragraph._p.xpath('.//w:br[@w:type="page"]'))
+        if page_break:
+            blocks.append(Block(PAGE_BREAK))
+        text = paragraph.text
+        # 병합하며 새 ID로 추가된 스타일은 "heading 1 2"처럼 소문자 이름일 수 있음
+        style_name = paragraph.style.name.lower() if paragraph.style is not None else ""
+        if not text.strip():
+            if not page_break:
+                blocks.append(Block(BLANK))
+        elif style_name.startswith("heading") or style_name == "title":
+            blocks.append(Block(HEADING, text))
+        elif style_name.startswith("list"):
+            blocks.append(Block(BULLET, text))
+        elif all(run.bold for run in paragraph.runs if run.text.strip()):
+            blocks.append(Block(ITEM, text))
+        elif PLACEHOLDER_PATTERN.fullmatch(text.strip()):
+            blocks.append(Block(PLACEHOLDER, text))
+        else:
+            blocks.append(Block(PARAGRAPH, text))
+    return blocks
+
+
+def render_blocks_to_pdf(blocks, output_path, font_size=10, font_path=None, margin=50, line_spacing=1.4,
+                         pagesize=A4):
+    """
+    (종류, 텍스트) 블록을 한글 글꼴을 포함한 PDF로 직접 배치 (Word나 LibreOffice 없이 동작)
+    
+    블록 종류는 document_ast와 같습니다 (heading, item(굵게), bullet(들여쓰기), text, placeholder, blank(빈 줄), page_break).
+    페이지 너비에 맞춰 줄바꿈하고 아래 여백을 넘으면 새 페이지에 이어서 배치하며, 제목이 페이지 끝에 홀로 남지 않도록 합니다.
+    """
+    font_name = register_korean_font(font_path)
+    page_width, page_height = pagesize
+    top = page_height - margin
+    
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    c = canvas.Canvas(output_path, pagesize=pagesize)
+    # 굵게는 채우기+윤곽선 글자로 표시 (굵은 한글 글꼴이 없어도 동작)
+    c.setLineWidth(font_size * 0.03)
+    y = top
+    page_empty = True
     
-    # 첫 번째 문서를 제외한 나머지 문서를 순회하며 내용 추가
-    for i, file_path in enumerate(input_files[1:], 1):
-        # 페이지 나누기 추가
-        master_doc.add_page_break()
+    def new_page():
+        nonlocal y, page_empty
+        c.showPage()
+        y = top
+        page_empty = True
+    
+    for kind, text in blocks:
+        if kind == "page_break":
+            if not page_empty:
+                new_page()
+            continue
+        if kind == "blank":
+            if not page_empty:
+                y -= font_size * line_spacing
+            continue
         
-        # 다음 문서 열기
-        doc = Document(file_path)
+        size_delta, indent, space_before, bold = PDF_BLOCK_STYLES[kind]
+        size = font_size + size_delta
+        line_height = size * line_spacing
+        if not page_empty:
+            y -= space_before * line_height
+            # 제목 뒤에 최소 두 줄이 들어갈 공간이 없으면 다음 페이지에서 시작
+            if kind == "heading" and y - line_height - 2 * font_size * line_spacing < margin:
+                new_page()
         
-        # 모든 단락 추가
-        for paragraph in doc.paragraphs:
-            # 단락 스타일과 내용 복사
-            p = master_doc.add_paragraph(paragraph.text)
-            # 스타일 복사 (가능한 경우)
-            try:
-                p.style = paragraph.style
-            except:
-                pass
+        x = margin + indent
+        for line in wrap_text(text, font_name, size, page_width - margin - x):
+            if y - line_height < margin and not page_empty:
+                new_page()
+            if line:
+                text_object = c.beginText(x, y - size)
+                text_object.setFont(font_name, size)
+                text_object.setTextRenderMode(2 if bold else 0)
+                text_object.textLine(line)
+                c.drawText(text_object)
+            y -= line_height
+            page_empty = False
     
-    # 저장
-    master_doc.save(output_file)
-    return output_file
-
-def convert_docx_to_pdf(docx_path, pdf_path):
-    """Word 문서를 PDF로 변환 (향후 구현)"""
-    # 이 기능은 해당 라이브러리 설치 필요
-    # 현재는 자동화가 힘들어 사용자에게 알림을 줌
-    print(f"알림: Word 문서 '{docx_path}'를 PDF로 변환하려면 MS Word나 LibreOffice를 사용해주세요.")
-    print(f"변환 후 '{pdf_path}'로 저장해주세요.")
-    return pdf_path 
\ No newline at end of file
+    c.save()
+    return output_path
+
+def create_pdf_with_sections(output_path, sections_dict, font_size=10, font_path=None):
+    """여러 섹션을 포함하는 PDF 문서를 Word 문서를 거치지 않고 직접 생성"""
+    return render_blocks_to_pdf(iter_section_blocks(sections_dict), output_path, font_size=font_size,
+                                font_path=font_path)
+
+def convert_docx_to_pdf(docx_path, pdf_path, font_size=10, font_path=None):
+    """Word 문서를 PDF로 변환 (python-docx로 단락을 읽어 reportlab으로 배치, 외부 오피스 프로그램 불필요)"""
+    return render_blocks_to_pdf(docx_to_blocks(docx_path), pdf_path, font_size=font_size, font_path=font_path)
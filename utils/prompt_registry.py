@@ -0,0 +1,186 @@
+"""
+프롬프트 템플릿 레지스트리 - 템플릿을 한 번만 읽고 슬롯 기반 렌더러로 컴파일하여 재사용
+"""
+import os
+import re
+import time
+import threading
+from typing import Dict, List, Optional
+
+# {business_idea}, {analysis} 같은 슬롯
+SLOT_PATTERN = re.compile(r"\{(\w+)\}")
+
+
+class CompiledTemplate:
+    """
+    슬롯 단위로 미리 분해된 프롬프트 템플릿
+
+    렌더링 시 파일을 다시 읽거나 문자열 전체를 반복 치환하지 않고,
+    고정 문자열 조각과 슬롯 값을 한 번에 이어 붙입니다.
+    값이 지정되지 않은 슬롯은 원래 표기({name})를 그대로 유지합니다.
+    """
+    def __init__(self, text: str, path: Optional[str] = None, mtime: Optional[float] = None):
+        self.text = text
+        self.path = path
+        self.mtime = mtime
+
+        # split 결과: 짝수 인덱스는 고정 문자열, 홀수 인덱스는 슬롯 이름
+        parts = SLOT_PATTERN.split(text)
+        self._literals = parts[0::2]
+        self._slots = parts[1::2]
+
+    @property
+    def slots(self) -> List[str]:
+        """템플릿에 포함된 슬롯 이름 목록 (중복 제거, 등장 순서 유지)"""
+        return list(dict.fromkeys(self._slots))
+
+    def render(self, **values) -> str:
+        """슬롯에 값을 채워 프롬프트 생성"""
+        pieces = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            value = values.get(slot)
+            pieces.append("{" + slot + "}" if value is None else str(value))
+            pieces.append(literal)
+        return "".join(pieces)
+
+
+class PromptRegistry:
+    """
+    data/prompts/ 아래의 모든 프롬프트 템플릿을 시작 시 한 번 읽어 컴파일하고 보관하는 클래스
+
+    - 섹션별 분석/생성 프롬프트 경로 결정(새 구조 → 레거시 구조 → 통합 프롬프트) 결과도 보관합니다
+    - 파일 변경은 수정 시간(mtime)으로 감지하며, 확인은 check_interval초에 한 번만 수행합니다
+      (check_interval=None이면 변경을 확인하지 않습니다)
+    """
+    # 프롬프트 종류별 (섹션 전용 디렉토리, 통합 프롬프트 파일)
+    PROMPT_KINDS = {
+        "analysis": ("analysis_prompts", "analysis_prompt.txt"),
+        "generation": ("generation_prompts", "generation_prompt.txt")
+    }
+
+    def __init__(self, base_dir: str = os.path.join("data", "prompts"), legacy_dir: str = "prompts",
+                 check_interval: Optional[float] = 2.0):
+        self.base_dir = base_dir
+        self.legacy_dir = legacy_dir
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._templates: Dict[str, Optional[CompiledTemplate]] = {}
+        self._checked_at: Dict[object, float] = {}
+        self._resolved: Dict[tuple, Optional[str]] = {}
+
+        self.load_all()
+
+    def load_all(self) -> int:
+        """기본 디렉토리 아래의 모든 .txt 템플릿을 읽어 컴파일 (읽은 템플릿 수 반환)"""
+        count = 0
+        with self._lock:
+            self._resolved.clear()
+            for root, _, files in os.walk(self.base_dir):
+                for file_name in files:
+                    if file_name.endswith(".txt"):
+                        self._load(os.path.join(root, file_name))
+                        count += 1
+        return count
+
+    def get(self, path: str) -> Optional[CompiledTemplate]:
+        """
+        경로에 해당하는 컴파일된 템플릿 반환 (없으면 None)
+        처음 요청된 경로는 읽어서 보관하고, 이후에는 변경된 경우에만 다시 읽습니다
+        """
+        key = self._key(path)
+        with self._lock:
+            if key not in self._templates:
+                return self._load(key)
+            if self._needs_check(key):
+                self._revalidate(key)
+            return self._templates[key]
+
+    def get_section_template(self, kind: str, section_id: str) -> Optional[CompiledTemplate]:
+        """
+        섹션별 분석("analysis")/생성("generation") 템플릿 반환
+        섹션 전용 프롬프트가 없으면 통합 프롬프트를 사용합니다
+        """
+        cache_key = (kind, section_id)
+        with self._lock:
+            # 더 우선순위가 높은 파일이 새로 생겼을 수 있으므로 확인 주기마다 경로를 다시 결정
+            if cache_key not in self._resolved or self._needs_check(cache_key):
+                self._resolved[cache_key] = self._resolve(kind, section_id)
+                self._checked_at[cache_key] = time.monotonic()
+            path = self._resolved[cache_key]
+
+            return self.get(path) if path is not None else None
+
+    def render_analysis(self, section_id: str, business_idea: str) -> Optional[str]:
+        """분석 프롬프트 렌더링 (템플릿이 없으면 None)"""
+        template = self.get_section_template("analysis", section_id)
+        return template.render(business_idea=business_idea) if template else None
+
+    def render_generation(self, section_id: str, business_idea: str, analysis: str) -> Optional[str]:
+        """생성 프롬프트 렌더링 (템플릿이 없으면 None)"""
+        template = self.get_section_template("generation", section_id)
+        return template.render(business_idea=business_idea, analysis=analysis) if template else None
+
+    def _resolve(self, kind: str, section_id: str) -> Optional[str]:
+        """섹션 템플릿 경로 결정 (새 구조 우선, 없으면 레거시 구조, 그 다음 통합 프롬프트)"""
+        subdir, fallback_name = self.PROMPT_KINDS[kind]
+        candidates = [
+            os.path.join(self.base_dir, subdir, f"{section_id}_{kind}.txt"),
+            os.path.join(self.legacy_dir, f"{section_id}_{kind}.txt"),
+            os.path.join(self.base_dir, fallback_name),
+            os.path.join(self.legacy_dir, fallback_name)
+        ]
+        for candidate in candidates:
+            if self.get(candidate) is not None:
+                return candidate
+        return None
+
+    def _key(self, path: str) -> str:
+        return os.path.normpath(path)
+
+    def _needs_check(self, key) -> bool:
+        if self.check_interval is None:
+            return False
+        return time.monotonic() - self._checked_at.get(key, 0.0) >= self.check_interval
+
+    def _revalidate(self, key: str):
+        """수정 시간이 바뀐 템플릿 다시 읽기"""
+        template = self._templates.get(key)
+        try:
+            mtime = os.stat(key).st_mtime
+        except OSError:
+            mtime = None
+
+        self._checked_at[key] = time.monotonic()
+        if template is None and mtime is None:
+            return
+        if template is None or mtime != template.mtime:
+            self._load(key)
+
+    def _load(self, path: str) -> Optional[CompiledTemplate]:
+        """템플릿 파일을 읽어 컴파일 후 보관 (없으면 None 보관)"""
+        key = self._key(path)
+        self._checked_at[key] = time.monotonic()
+        try:
+            mtime = os.stat(key).st_mtime
+            with open(key, "r", encoding="utf-8") as f:
+                template = CompiledTemplate(f.read(), key, mtime)
+        except OSError:
+            template = None
+
+        self._templates[key] = template
+        return template
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """프로세스 전체에서 공유하는 프롬프트 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
@@ -4,7 +4,9 @@ import time
 import os
 import uuid
 import sys
-import json
+
+from utils.prompt_registry import get_prompt_registry
+from core.section_config import get_section_config
 
 # 기본 템플릿 정의 (코드 상단에 분리)
 DEFAULT_ANALYSIS_TEMPLATE = """다음 기획서를 분석하고, 사업계획서 '문제 인식(Problem)' 섹션 작성에 필요하지만 누락된 정보를 찾아주세요:
@@ -54,19 +56,24 @@ DEFAULT_GENERATION_TEMPLATE = """다음 사업 아이디어 기획 메모를 바
 - 첫 번째 문제점
 - 두 번째 문제점"""
 
-# 섹션 설정 로드
-def load_section_config():
-    """섹션 설정 파일 로드"""
-    config_path = os.path.join("data", "section_config.json")
+# 프롬프트 경로가 포함된 섹션 설정 파일
+SECTION_CONFIG_PATH = os.path.join("data", "section_config.json")
+
+def get_prompt_section_config():
+    """섹션 설정 객체 반환 (프로세스당 한 번만 로드, 실패하면 None)"""
     try:
-        with open(config_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return get_section_config(SECTION_CONFIG_PATH)
     except FileNotFoundError:
-        print(f"경고: 섹션 설정 파일 '{config_path}'을(를) 찾을 수 없습니다.")
-        return {"sections": []}
+        print(f"경고: 섹션 설정 파일 '{SECTION_CONFIG_PATH}'을(를) 찾을 수 없습니다.")
     except Exception as e:
         print(f"섹션 설정 파일 읽기 오류: {str(e)}")
-        return {"sections": []}
+    return None
+
+# 섹션 설정 로드
+def load_section_config():
+    """섹션 설정 파일 로드 (기존 사전 형식)"""
+    config = get_prompt_section_config()
+    return config.to_dict() if config else {"sections": []}
 
 def load_prompt_template(file_path):
     """프롬프트 템플릿 파일 읽기"""
@@ -105,26 +112,27 @@ def format_prompt_safely(template, **kwargs):
 
 def generate_analysis_prompt(section_id, business_idea):
     """섹션 분석 프롬프트 생성"""
-    config = load_section_config()
-    section = next((s for s in config["sections"] if s["id"] == section_id), None)
+    config = get_prompt_section_config()
+    section = config.get(section_id) if config else None
     
     if not section:
         print(f"경고: '{section_id}' 섹션을 설정에서 찾을 수 없습니다.")
         return None
     
     # 분석 프롬프트 템플릿 로드
-    analysis_prompt_path = section.get("analysis_prompt")
+    analysis_prompt_path = section.analysis_prompt
     if not analysis_prompt_path:
         print(f"경고: '{section_id}' 섹션에 분석 프롬프트 경로가 지정되지 않았습니다.")
         return None
     
-    template = load_prompt_template(analysis_prompt_path)
+    # 컴파일된 템플릿 사용 (파일은 변경된 경우에만 다시 읽음)
+    template = get_prompt_registry().get(analysis_prompt_path)
     if not template:
         print(f"경고: '{analysis_prompt_path}' 분석 프롬프트 템플릿을 로드할 수 없습니다.")
         return None
     
     # 프롬프트 생성
-    prompt = template.format(business_idea=business_idea)
+    prompt = template.render(business_idea=business_idea)
     
     # 클립보드에 복사
     try:
@@ -137,26 +145,27 @@ def generate_analysis_prompt(section_id, business_idea):
 
 def generate_section_prompt(section_id, business_idea, analysis):
     """섹션 생성 프롬프트 생성"""
-    config = load_section_config()
-    section = next((s for s in config["sections"] if s["id"] == section_id), None)
+    config = get_prompt_section_config()
+    section = config.get(section_id) if config else None
     
     if not section:
         print(f"경고: '{section_id}' 섹션을 설정에서 찾을 수 없습니다.")
         return None
     
     # 생성 프롬프트 템플릿 로드
-    generation_prompt_path = section.get("generation_prompt")
+    generation_prompt_path = section.generation_prompt
     if not generation_prompt_path:
         print(f"경고: '{section_id}' 섹션에 생성 프롬프트 경로가 지정되지 않았습니다.")
         return None
     
-    template = load_prompt_template(generation_prompt_path)
+    # 컴파일된 템플릿 사용 (파일은 변경된 경우에만 다시 읽음)
+    template = get_prompt_registry().get(generation_prompt_path)
     if not template:
         print(f"경고: '{generation_prompt_path}' 생성 프롬프트 템플릿을 로드할 수 없습니다.")
         return None
     
     # 프롬프트 생성
-    prompt = template.format(business_idea=business_idea, analysis=analysis)
+    prompt = template.render(business_idea=business_idea, analysis=analysis)
     
     # 클립보드에 복사
     try:
@@ -0,0 +1,158 @@
+"""
+데이터 API 제공자 레지스트리 - 사용 가능 여부를 한 번만 계산하고 제공자별 상태(서킷 브레이커, 오류율, 응답 시간)를 추적
+"""
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class ProviderHealth:
+    """
+    단일 API 제공자의 실시간 상태
+
+    - 연속 실패가 failure_threshold회에 도달하면 서킷을 열고(open) cooldown초 동안 요청을 보내지 않습니다
+    - cooldown이 지나면 한 번의 시험 요청(half_open)을 허용하고, 성공하면 다시 닫습니다(closed)
+    - 최근 window개 요청의 오류율과 응답 시간 지수 이동 평균(EWMA)을 유지합니다
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0, alpha: float = 0.3, window: int = 20):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.opened_at: Optional[float] = None
+        self._outcomes = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        """최근 요청 중 실패 비율"""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def is_open(self) -> bool:
+        """요청을 보낼 수 없는 상태인지 확인 (상태를 변경하지 않음)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                return time.monotonic() - self.opened_at < self.cooldown
+            return self.state == self.HALF_OPEN and self._probe_in_flight
+
+    def allow_request(self) -> bool:
+        """요청 전 호출 - 서킷이 열려 있으면 False, cooldown이 지났으면 시험 요청 한 번 허용"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._outcomes.append(True)
+            self._update_latency(latency)
+            self.consecutive_failures = 0
+            self.state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self, latency: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append(False)
+            if latency is not None:
+                self._update_latency(latency)
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """결과 없이 끝난 요청(취소 등)의 시험 요청 표시 해제"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _update_latency(self, latency: float):
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = self.alpha * latency + (1 - self.alpha) * self.latency_ewma
+
+    def snapshot(self) -> Dict:
+        """현재 상태 요약"""
+        return {
+            "state": self.state,
+            "error_rate": self.error_rate,
+            "latency_ewma": self.latency_ewma,
+            "consecutive_failures": self.consecutive_failures
+        }
+
+
+class ProviderRegistry:
+    """
+    API 제공자 레지스트리
+
+    사용 가능 여부(API 키 설정 여부)는 설정이 바뀔 때만 다시 계산하고,
+    제공자별 ProviderHealth로 느리거나 실패하는 제공자를 우선순위 목록에서 뒤로 보내거나 제외합니다
+    """
+    def __init__(self, config: Optional[Dict] = None, failure_threshold: int = 3, cooldown: float = 60.0,
+                 slow_threshold: float = 5.0, error_rate_threshold: float = 0.5):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.slow_threshold = slow_threshold
+        self.error_rate_threshold = error_rate_threshold
+
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+        self.availability: Dict[str, bool] = {}
+        self.refresh(config or {})
+
+    def refresh(self, config: Dict):
+        """설정이 바뀌었을 때 사용 가능 여부 다시 계산 (상태 기록은 유지)"""
+        self.availability = {
+            api_name: bool(api_config.get("api_key")) if isinstance(api_config, dict) else False
+            for api_name, api_config in config.items()
+        }
+
+    def is_available(self, api_name: str) -> bool:
+        return self.availability.get(api_name, False)
+
+    def health(self, api_name: str) -> ProviderHealth:
+        """제공자 상태 객체 반환 (없으면 생성)"""
+        with self._lock:
+            if api_name not in self._health:
+                self._health[api_name] = ProviderHealth(self.failure_threshold, self.cooldown)
+            return self._health[api_name]
+
+    def is_degraded(self, api_name: str) -> bool:
+        """최근 오류율이 높거나 응답이 느린 제공자인지 확인"""
+        health = self.health(api_name)
+        if health.error_rate >= self.error_rate_threshold:
+            return True
+        return health.latency_ewma is not None and health.latency_ewma >= self.slow_threshold
+
+    def route(self, priority_list: List[str]) -> List[str]:
+        """
+        우선순위 목록에서 사용할 제공자 결정
+        사용 불가능하거나 서킷이 열린 제공자는 제외하고, 느리거나 오류가 잦은 제공자는 뒤로 보냅니다
+        """
+        usable = [name for name in priority_list if self.is_available(name) and not self.health(name).is_open()]
+        return sorted(usable, key=self.is_degraded)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """제공자별 사용 가능 여부와 상태 요약"""
+        return {
+            api_name: dict(self.health(api_name).snapshot(), available=available)
+            for api_name, available in self.availability.items()
+        }
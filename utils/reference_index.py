@@ -0,0 +1,449 @@
+"""
+참고 자료 색인 - references/와 data/templates/의 작성 가이드 문서를 디스크 역색인(BM25)으로 저장하고 섹션별 관련 구절 검색
+
+색인 구조 (index_dir 아래):
+- manifest.json: 세그먼트 목록, 파일별 수정 시각/크기와 구절 범위, 삭제된 구절 번호
+- seg_NNNNNN/: 한 번에 색인한 파일 묶음 (세그먼트)
+  - meta.json: 원본 파일 목록, 구절 수, 색인어 총 개수
+  - lexicon.json: 색인어 → [postings 시작 위치, 문서 빈도]
+  - postings.bin: (구절 번호, 빈도) uint32 쌍 (메모리 매핑)
+  - docs.bin: 구절별 (본문 시작 바이트, 본문 바이트 수, 파일 번호, 파일 내 순서, 색인어 수) uint32 (메모리 매핑)
+  - passages.bin: UTF-8 구절 본문 (메모리 매핑)
+
+파일이 추가/수정되면 바뀐 파일만 새 세그먼트로 색인하고 이전 구절은 삭제 표시만 합니다.
+세그먼트가 많아지거나 삭제된 구절이 많아지면 저장된 구절로 세그먼트 하나를 다시 만듭니다 (원본 파일은 다시 읽지 않음).
+색인 갱신은 index.lock 파일 잠금 안에서 하므로 여러 프로세스(일괄 처리 작업자)가 같은 색인을 함께 사용할 수 있습니다.
+"""
+import os
+import json
+import math
+import mmap
+import heapq
+import shutil
+import threading
+from array import array
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from core.section_config import get_section_config
+from utils.chunking import split_paragraphs
+from utils.retrieval import BM25_B, BM25_K1, analyze, section_query
+
+# 기본 색인 대상 디렉토리와 확장자
+REFERENCE_SOURCES = ("references", os.path.join("data", "templates"))
+REFERENCE_EXTENSIONS = (".txt", ".md")
+
+# 기본 색인 저장 위치
+DEFAULT_INDEX_DIR = os.path.join("data", "cache", "reference_index")
+
+# 구절 하나의 최대 토큰 수 (이보다 긴 문단은 나눔)
+PASSAGE_TOKENS = 300
+
+# 세그먼트 수나 삭제된 구절 비율이 이 값을 넘으면 세그먼트를 하나로 합침
+MAX_SEGMENTS = 8
+MAX_DELETED_RATIO = 0.25
+
+INDEX_VERSION = 1
+DOC_FIELDS = 5
+
+LOCK_FILE = "index.lock"
+
+
+@contextmanager
+def _file_lock(path: str):
+    """다른 프로세스와 함께 쓰는 배타적 파일 잠금 (잠금을 얻을 때까지 대기)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK은 약 10초 후 실패하므로 다시 시도
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _map_file(path: str):
+    """파일을 읽기 전용으로 메모리 매핑 (빈 파일은 None)"""
+    if os.path.getsize(path) == 0:
+        return None
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Segment:
+    """디스크에 저장된 세그먼트 하나 (postings, 구절 정보, 본문은 메모리 매핑으로 접근)"""
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, "lexicon.json"), "r", encoding="utf-8") as f:
+            self.lexicon: Dict[str, List[int]] = json.load(f)
+        self.sources: List[str] = meta["sources"]
+        self.passage_count: int = meta["passages"]
+        self.total_length: int = meta["total_length"]
+
+        self._maps = [_map_file(os.path.join(path, name)) for name in ("postings.bin", "docs.bin", "passages.bin")]
+        postings_map, docs_map, self._text = self._maps
+        self._postings = memoryview(postings_map).cast("I") if postings_map else memoryview(array("I"))
+        self._docs = memoryview(docs_map).cast("I") if docs_map else memoryview(array("I"))
+
+    def doc(self, doc_id: int) -> Tuple[int, int, int, int, int]:
+        """(본문 시작, 본문 바이트 수, 파일 번호, 파일 내 순서, 색인어 수)"""
+        base = doc_id * DOC_FIELDS
+        return tuple(self._docs[base:base + DOC_FIELDS])
+
+    def length(self, doc_id: int) -> int:
+        return self._docs[doc_id * DOC_FIELDS + 4]
+
+    def text(self, doc_id: int) -> str:
+        offset, size = self._docs[doc_id * DOC_FIELDS], self._docs[doc_id * DOC_FIELDS + 1]
+        return self._text[offset:offset + size].decode("utf-8") if size else ""
+
+    def postings(self, term: str) -> Iterable[Tuple[int, int]]:
+        """색인어의 (구절 번호, 빈도) 목록"""
+        entry = self.lexicon.get(term)
+        if not entry:
+            return ()
+        start, df = entry
+        flat = self._postings[start * 2:(start + df) * 2]
+        return zip(flat[0::2], flat[1::2])
+
+    def passages(self) -> Iterable[Tuple[int, str, str, int]]:
+        """(구절 번호, 파일 경로, 본문, 파일 내 순서) 전체"""
+        for doc_id in range(self.passage_count):
+            _, _, source_index, position, _ = self.doc(doc_id)
+            yield doc_id, self.sources[source_index], self.text(doc_id), position
+
+    def close(self):
+        self._postings.release()
+        self._docs.release()
+        for mapped in self._maps:
+            if mapped is not None:
+                mapped.close()
+
+
+def _write_segment(path: str, passages: List[Tuple[str, str, int]]) -> Dict[str, Tuple[int, int]]:
+    """
+    구절 목록 [(파일 경로, 본문, 파일 내 순서)]으로 세그먼트 작성 (임시 디렉토리에 쓴 뒤 이름 변경)
+
+    Returns:
+        파일 경로 → 세그먼트 안의 구절 번호 범위 (시작, 끝)
+    """
+    sources: List[str] = []
+    source_numbers: Dict[str, int] = {}
+    ranges: Dict[str, List[int]] = {}
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    docs = array("I")
+    text = bytearray()
+    total_length = 0
+
+    for doc_id, (source, passage, position) in enumerate(passages):
+        if source not in source_numbers:
+            source_numbers[source] = len(sources)
+            sources.append(source)
+            ranges[source] = [doc_id, doc_id + 1]
+        ranges[source][1] = doc_id + 1
+
+        terms = analyze(passage)
+        for term, count in Counter(terms).items():
+            postings[term].append((doc_id, count))
+        encoded = passage.encode("utf-8")
+        docs.extend((len(text), len(encoded), source_numbers[source], position, len(terms)))
+        text.extend(encoded)
+        total_length += len(terms)
+
+    lexicon = {}
+    flat = array("I")
+    for term in sorted(postings):
+        lexicon[term] = [len(flat) // 2, len(postings[term])]
+        for doc_id, count in postings[term]:
+            flat.extend((doc_id, count))
+
+    temp_path = f"{path}.tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    with open(os.path.join(temp_path, "postings.bin"), "wb") as f:
+        flat.tofile(f)
+    with open(os.path.join(temp_path, "docs.bin"), "wb") as f:
+        docs.tofile(f)
+    with open(os.path.join(temp_path, "passages.bin"), "wb") as f:
+        f.write(text)
+    with open(os.path.join(temp_path, "lexicon.json"), "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False, separators=(",", ":"))
+    with open(os.path.join(temp_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"sources": sources, "passages": len(passages), "total_length": total_length},
+                  f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return {source: tuple(doc_range) for source, doc_range in ranges.items()}
+
+
+class ReferenceIndex:
+    """
+    작성 가이드 문서의 디스크 역색인
+
+    예시:
+        index = ReferenceIndex()
+        index.refresh()  # 바뀐 파일만 다시 색인
+        for passage in index.section_passages("market", k=3):
+            print(passage["source"], passage["score"], passage["text"][:80])
+    """
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR, sources: Iterable[str] = REFERENCE_SOURCES,
+                 section_config=None):
+        self.index_dir = index_dir
+        self.sources = list(sources)
+        self.section_config = section_config
+        self._lock = threading.RLock()
+        self._segments: Dict[str, _Segment] = {}
+        self._manifest = self._load_manifest()
+        self._open_segments()
+
+    # ---- 색인 상태 ----
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.index_dir, "manifest.json")
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("version") != INDEX_VERSION:
+            manifest = {"version": INDEX_VERSION, "next_segment": 1, "segments": [], "files": {}, "deleted": {}}
+        return manifest
+
+    def _save_manifest(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        temp_path = f"{self._manifest_path()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self._manifest_path())
+
+    def _open_segments(self):
+        """manifest에 기록된 세그먼트 열기 (이미 열린 세그먼트는 재사용, 빠진 세그먼트는 닫음)"""
+        names = self._manifest["segments"]
+        for name in list(self._segments):
+            if name not in names:
+                self._segments.pop(name).close()
+        for name in names:
+            if name not in self._segments:
+                try:
+                    self._segments[name] = _Segment(os.path.join(self.index_dir, name))
+                except (OSError, ValueError, KeyError):
+                    # 손상되었거나 다른 프로세스가 정리한 세그먼트는 색인을 다시 만들도록 초기화
+                    self._reset()
+                    return
+
+    def _reset(self):
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+        self._manifest = {"version": INDEX_VERSION, "next_segment": self._manifest.get("next_segment", 1),
+                          "segments": [], "files": {}, "deleted": {}}
+
+    def _source_files(self) -> Dict[str, Tuple[float, int]]:
+        """색인 대상 파일 경로 → (수정 시각, 크기)"""
+        files = {}
+        for source in self.sources:
+            for root, _, names in os.walk(source):
+                for name in sorted(names):
+                    if name.lower().endswith(REFERENCE_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        stat = os.stat(path)
+                        files[path.replace(os.sep, "/")] = (stat.st_mtime, stat.st_size)
+        return files
+
+    def _new_segment_name(self) -> str:
+        number = self._manifest["next_segment"]
+        self._manifest["next_segment"] = number + 1
+        return f"seg_{number:06d}"
+
+    def _add_segment(self, passages: List[Tuple[str, str, int]], stats: Dict[str, Tuple[float, int]]):
+        name = self._new_segment_name()
+        ranges = _write_segment(os.path.join(self.index_dir, name), passages)
+        self._manifest["segments"].append(name)
+        for path, (mtime, size) in stats.items():
+            start, end = ranges.get(path, (0, 0))
+            self._manifest["files"][path] = {"mtime": mtime, "size": size, "segment": name, "docs": [start, end]}
+
+    def _mark_deleted(self, path: str):
+        entry = self._manifest["files"].pop(path)
+        start, end = entry["docs"]
+        if end > start:
+            self._manifest["deleted"].setdefault(entry["segment"], []).extend(range(start, end))
+
+    def _deleted_ratio(self) -> float:
+        total = sum(segment.passage_count for segment in self._segments.values())
+        deleted = sum(len(ids) for ids in self._manifest["deleted"].values())
+        return deleted / total if total else 0.0
+
+    def _changes(self, current: Dict[str, Tuple[float, int]]) -> Tuple[List[str], List[str], List[str]]:
+        """색인 이후 (추가, 수정, 삭제)된 파일 목록"""
+        indexed = self._manifest["files"]
+        added = [path for path in current if path not in indexed]
+        updated = [path for path in current if path in indexed
+                   and (indexed[path]["mtime"], indexed[path]["size"]) != tuple(current[path])]
+        removed = [path for path in indexed if path not in current]
+        return added, updated, removed
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        원본 파일이 바뀌었으면 색인 갱신 (바뀐 파일만 새로 색인)
+
+        Returns:
+            추가/수정/삭제된 파일 수와 현재 구절 수
+        """
+        with self._lock:
+            current = self._source_files()
+            added, updated, removed = self._changes(current)
+            if added or updated or removed:
+                with _file_lock(os.path.join(self.index_dir, LOCK_FILE)):
+                    # 잠금을 기다리는 동안 다른 프로세스가 갱신했을 수 있으므로 최신 manifest로 다시 비교
+                    self._manifest = self._load_manifest()
+                    self._open_segments()
+                    added, updated, removed = self._changes(current)
+                    self._apply_changes(current, added, updated, removed)
+
+            return {"added": len(added), "updated": len(updated), "removed": len(removed),
+                    "passages": self.passage_count}
+
+    def _apply_changes(self, current: Dict[str, Tuple[float, int]], added: List[str], updated: List[str],
+                       removed: List[str]):
+        """바뀐 파일을 색인하고 manifest 저장 (파일 잠금 안에서 호출)"""
+        if not (added or updated or removed):
+            return
+        for path in updated + removed:
+            self._mark_deleted(path)
+
+        changed = added + updated
+        if changed:
+            passages = []
+            for path in changed:
+                with open(path, "r", encoding="utf-8") as f:
+                    passages.extend((path, paragraph, position) for position, paragraph
+                                    in enumerate(split_paragraphs(f.read(), PASSAGE_TOKENS)))
+            self._add_segment(passages, {path: current[path] for path in changed})
+        self._open_segments()
+
+        if len(self._segments) > MAX_SEGMENTS or self._deleted_ratio() > MAX_DELETED_RATIO:
+            self._compact()
+        self._save_manifest()
+
+    def _compact(self):
+        """삭제되지 않은 구절을 모아 세그먼트 하나로 합침"""
+        deleted = {name: set(ids) for name, ids in self._manifest["deleted"].items()}
+        passages = []
+        stats = {}
+        for name in self._manifest["segments"]:
+            for doc_id, source, text, position in self._segments[name].passages():
+                if doc_id not in deleted.get(name, ()):
+                    passages.append((source, text, position))
+        for path, entry in self._manifest["files"].items():
+            stats[path] = (entry["mtime"], entry["size"])
+
+        old_segments = list(self._manifest["segments"])
+        self._manifest["segments"] = []
+        self._manifest["deleted"] = {}
+        self._add_segment(passages, stats)
+        self._open_segments()
+        for name in old_segments:
+            shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+
+    @property
+    def passage_count(self) -> int:
+        """삭제되지 않은 구절 수"""
+        total = sum(segment.passage_count for segment in self._segments.values())
+        return total - sum(len(ids) for ids in self._manifest["deleted"].values())
+
+    # ---- 검색 ----
+
+    def search(self, query: str, k: int = 5) -> List[Dict]:
+        """
+        질의와 관련도(BM25)가 높은 구절 k개
+
+        Returns:
+            [{"score", "text", "source", "position"}] (점수 높은 순)
+        """
+        with self._lock:
+            segments = list(self._segments.values())
+            deleted = {name: set(ids) for name, ids in self._manifest["deleted"].items()}
+            total_passages = self.passage_count
+            if not segments or total_passages <= 0:
+                return []
+            # 삭제 표시된 구절의 길이는 평균 구절 길이에서 제외
+            total_length = sum(segment.total_length for segment in segments)
+            total_length -= sum(segment.length(doc_id) for segment in segments
+                                for doc_id in deleted.get(segment.name, ()))
+            average_length = (total_length / total_passages) or 1.0
+            k1, b = BM25_K1, BM25_B
+
+            scores: Dict[Tuple[int, int], float] = defaultdict(float)
+            for term in set(analyze(query)):
+                df = sum(segment.lexicon[term][1] for segment in segments if term in segment.lexicon)
+                if not df:
+                    continue
+                idf = math.log(1 + (total_passages - df + 0.5) / (df + 0.5))
+                for number, segment in enumerate(segments):
+                    removed = deleted.get(segment.name, ())
+                    for doc_id, tf in segment.postings(term):
+                        if doc_id in removed:
+                            continue
+                        norm = k1 * (1 - b + b * segment.length(doc_id) / average_length)
+                        scores[(number, doc_id)] += idf * tf * (k1 + 1) / (tf + norm)
+
+            best = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+            results = []
+            for (number, doc_id), score in best:
+                segment = segments[number]
+                _, _, source_index, position, _ = segment.doc(doc_id)
+                results.append({"score": score, "text": segment.text(doc_id),
+                                "source": segment.sources[source_index], "position": position})
+            return results
+
+    def section_passages(self, section_id: str, k: int = 3, extra: str = "") -> List[Dict]:
+        """섹션 질의(제목, 필수 요소, 키워드)와 관련도가 높은 가이드 구절 k개"""
+        if self.section_config is None:
+            self.section_config = get_section_config()
+        section = self.section_config.get(section_id)
+        query = section_query(section) if section else section_id
+        return self.search(f"{query} {extra}".strip(), k)
+
+    def close(self):
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments = {}
+
+
+_index = None
+_index_pid = None
+_index_lock = threading.Lock()
+
+
+def get_reference_index() -> ReferenceIndex:
+    """프로세스 전체에서 공유하는 참고 자료 색인 반환 (호출할 때마다 바뀐 파일이 있는지 확인)"""
+    global _index, _index_pid
+    with _index_lock:
+        if _index is None or _index_pid != os.getpid():
+            _index = ReferenceIndex()
+            _index_pid = os.getpid()
+    _index.refresh()
+    return _index
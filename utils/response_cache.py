@@ -0,0 +1,151 @@
+"""
+공공 데이터 API 응답 캐시 - SQLite 기반, API별 유효 기간, LRU 크기 제한, 만료 데이터 재검증
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# 기본 캐시 파일 경로
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "api_responses.sqlite3")
+
+# 기본 유효 기간 (초) - 공공 통계는 길어야 월 단위로 갱신됨
+DEFAULT_TTL = 7 * 24 * 3600
+
+
+class ResponseCache:
+    """
+    API 응답을 API 이름 + 정규화된 키워드 집합으로 저장하는 디스크 캐시
+
+    - 유효 기간(ttl)이 지난 항목은 stale_ttl 동안 "만료" 상태로 반환되며,
+      호출 측은 만료 데이터를 먼저 사용하고 백그라운드에서 다시 조회할 수 있습니다
+    - 항목 수가 max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다
+    - 여러 프로세스(일괄 처리 작업자)가 같은 파일을 공유할 수 있습니다
+    """
+    FRESH = "fresh"
+    STALE = "stale"
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL, stale_ttl: Optional[float] = None, max_entries: int = 5000):
+        self.path = path
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, provider TEXT NOT NULL, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(provider: str, keywords: Iterable[str], search_type: str = "") -> str:
+        """API 이름, 검색 유형, 정규화된 키워드 집합(소문자, 공백 정리, 중복 제거, 정렬)으로 키 생성"""
+        normalized = sorted({" ".join(k.lower().split()) for k in keywords if k and k.strip()})
+        return "|".join([provider, search_type, "\x1f".join(normalized)])
+
+    def set_ttl(self, provider: str, ttl: float):
+        """API별 유효 기간 설정"""
+        self.ttls[provider] = ttl
+
+    def get(self, provider: str, keywords: Iterable[str], search_type: str = "") -> Tuple[Any, Optional[str]]:
+        """
+        캐시 조회
+
+        Returns:
+            (값, 상태) - 상태는 "fresh", "stale" 또는 None(캐시 없음)
+        """
+        key = self.make_key(provider, keywords, search_type)
+        now = time.time()
+        ttl = self.ttls.get(provider, self.default_ttl)
+        stale_ttl = ttl if self.stale_ttl is None else self.stale_ttl
+
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None, None
+
+            age = now - row[1]
+            if age > ttl + stale_ttl:
+                self._stats["misses"] += 1
+                return None, None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            if age > ttl:
+                self._stats["stale_hits"] += 1
+                return json.loads(row[0]), self.STALE
+            self._stats["hits"] += 1
+            return json.loads(row[0]), self.FRESH
+
+    def set(self, provider: str, keywords: Iterable[str], value: Any, search_type: str = ""):
+        """응답 저장 후 크기 제한 적용"""
+        key = self.make_key(provider, keywords, search_type)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, provider, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._stats["writes"] += 1
+
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                evicted = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+                self._stats["evictions"] += evicted
+            self._conn.commit()
+
+    def clear(self, provider: Optional[str] = None):
+        """캐시 비우기 (provider를 지정하면 해당 API만)"""
+        with self._lock:
+            if provider:
+                self._conn.execute("DELETE FROM responses WHERE provider = ?", (provider,))
+            else:
+                self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """적중/실패 통계와 현재 항목 수"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """프로세스 전체에서 공유하는 API 응답 캐시 반환 (fork된 작업자 프로세스는 새 연결 사용)"""
+    global _cache, _cache_pid
+    if _cache is None or _cache_pid != os.getpid():
+        with _cache_lock:
+            if _cache is None or _cache_pid != os.getpid():
+                _cache = ResponseCache()
+                _cache_pid = os.getpid()
+    return _cache
@@ -0,0 +1,172 @@
+"""
+로컬 검색 색인 - 기획서 문단을 BM25로 색인하여 섹션별 관련 문단 검색 (네트워크 사용 안 함)
+참고 자료(references/) 검색은 디스크 색인을 사용하는 utils.reference_index 참조
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.coverage import SECTION_KEYWORDS
+from utils.text_processing import words
+
+# BM25 매개변수 (빈도 포화, 문서 길이 정규화)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 한글 단어 끝의 조사/어미 (긴 것부터 제거)
+JOSA_SUFFIXES = sorted([
+    "으로써", "으로서", "에서는", "에게서", "이라는", "이라고", "입니다", "습니다", "합니다",
+    "에서", "에게", "한테", "으로", "부터", "까지", "처럼", "보다", "이다", "라는", "하는", "하고", "했다",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "며"
+], key=len, reverse=True)
+
+
+def _strip_josa(word: str) -> str:
+    """한글 단어의 조사/어미 제거 (남는 부분이 2글자 이상일 때만)"""
+    for suffix in JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def analyze(text: str) -> List[str]:
+    """
+    검색용 색인어 추출
+
+    - 영문/숫자 단어는 소문자로 그대로 사용
+    - 한글 단어는 조사/어미를 떼어낸 어간을 사용하고, 3글자 이상이면 2글자 단위(bigram)도 추가
+      ("시장규모를" → "시장규모", "시장", "장규", "규모")
+    """
+    terms = []
+    for word in words(text.lower(), min_length=1, split_scripts=True):
+        if word[0] < "가":
+            if len(word) > 1:
+                terms.append(word)
+            continue
+        stem = _strip_josa(word)
+        if len(stem) < 2:
+            continue
+        terms.append(stem)
+        if len(stem) >= 3:
+            terms.extend(stem[i:i + 2] for i in range(len(stem) - 1))
+    return terms
+
+
+class BM25Index:
+    """
+    메모리 BM25 색인
+
+    문서는 (본문, 메타데이터) 형태로 추가하며, search()는 점수가 높은 순서로 (점수, 문서 번호)를 반환합니다
+    """
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[Dict] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._lengths: List[int] = []
+        self._total_length = 0
+
+    def add(self, text: str, **metadata) -> int:
+        """문서 추가 후 문서 번호 반환"""
+        doc_id = len(self.documents)
+        terms = analyze(text)
+        for term, count in Counter(terms).items():
+            self._postings[term][doc_id] = count
+        self.documents.append(dict(metadata, text=text))
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        return doc_id
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        n = len(self.documents)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str, doc_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """질의에 대한 문서별 BM25 점수 (질의어가 하나도 없는 문서는 제외)"""
+        if not self.documents:
+            return {}
+        allowed = set(doc_ids) if doc_ids is not None else None
+        average_length = self._total_length / len(self.documents) or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(analyze(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return dict(scores)
+
+    def search(self, query: str, k: int = 5, doc_ids: Optional[Iterable[int]] = None) -> List[Tuple[float, int]]:
+        """점수 상위 k개 (점수, 문서 번호) 목록 (같은 점수는 앞 문서 우선)"""
+        ranked = sorted(self.scores(query, doc_ids).items(), key=lambda item: (-item[1], item[0]))
+        return [(score, doc_id) for doc_id, score in ranked[:k]]
+
+
+def section_query(section) -> str:
+    """섹션 검색 질의 (제목, 필수 요소 이름과 설명, 섹션 키워드)"""
+    parts = [section.title]
+    for element in section.required_elements:
+        parts.append(element.name)
+        if element.description:
+            parts.append(element.description)
+    parts.extend(SECTION_KEYWORDS.get(section.id, []))
+    return " ".join(parts)
+
+
+def _split_paragraphs(text: str) -> List[str]:
+    # utils.chunking이 이 모듈을 사용하므로 순환 import를 피하기 위해 함수 안에서 import
+    from utils.chunking import split_paragraphs
+    return split_paragraphs(text)
+
+
+class ProposalRetriever:
+    """
+    기획서 한 개에 대한 섹션별 관련 문단 검색기
+
+    예시:
+        retriever = ProposalRetriever(business_idea, get_section_config())
+        for passage in retriever.top_k("market", k=3):
+            print(passage["score"], passage["text"])
+    """
+    def __init__(self, business_idea: str, section_config, paragraphs: Optional[List[str]] = None):
+        self.section_config = section_config
+        self.index = BM25Index()
+        self.paragraphs = paragraphs if paragraphs is not None else _split_paragraphs(business_idea)
+        for position, paragraph in enumerate(self.paragraphs):
+            self.index.add(paragraph, position=position)
+
+    def query_for(self, section_id: str, extra: str = "") -> str:
+        section = self.section_config.get(section_id)
+        query = section_query(section) if section else " ".join(SECTION_KEYWORDS.get(section_id, []))
+        return f"{query} {extra}".strip()
+
+    def paragraph_scores(self, section_id: str, extra: str = "") -> List[float]:
+        """기획서 문단별 섹션 관련도 점수 (문단 순서)"""
+        scores = self.index.scores(self.query_for(section_id, extra))
+        return [scores.get(position, 0.0) for position in range(len(self.paragraphs))]
+
+    def top_k(self, section_id: str, k: int = 5, extra: str = "") -> List[Dict]:
+        """
+        섹션과 관련도가 높은 문단 k개
+
+        Args:
+            extra: 질의에 덧붙일 단어 (부족한 정보 항목 이름 등)
+        """
+        return [
+            dict(self.index.documents[doc_id], score=score)
+            for score, doc_id in self.index.search(self.query_for(section_id, extra), k)
+        ]
+
+    def excerpt(self, section_id: str, k: int = 3, extra: str = "", max_chars: Optional[int] = None) -> str:
+        """섹션 관련 기획서 문단 k개를 원래 순서로 이어 붙인 발췌문 (관련 문단이 없으면 첫 문단)"""
+        positions = sorted(passage["position"] for passage in self.top_k(section_id, k, extra))
+        if not positions and self.paragraphs:
+            positions = [0]
+        text = "\n\n".join(self.paragraphs[position] for position in positions)
+        return text[:max_chars] if max_chars else text
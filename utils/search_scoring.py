@@ -0,0 +1,137 @@
+"""
+검색 결과 평가 엔진 - 결과 제목/값을 한 번만 소문자로 바꿔 2글자(bigram) 역색인을 만들고,
+부족한 정보 항목별 관련성/완전성을 후보 집합 교집합과 부분 문자열 확인으로 계산
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _FieldIndex:
+    """결과 필드 하나(제목 또는 값)의 bigram → 결과 번호 역색인"""
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        for result_id, text in enumerate(texts):
+            for gram in _bigrams(text):
+                self.postings[gram].add(result_id)
+        self._cache: Dict[str, Set[int]] = {}
+
+    def containing(self, needle: str) -> Set[int]:
+        """needle(소문자)을 부분 문자열로 포함하는 결과 번호 집합"""
+        found = self._cache.get(needle)
+        if found is not None:
+            return found
+
+        if len(needle) < 2:
+            # 한 글자나 빈 문자열은 색인으로 좁힐 수 없으므로 직접 확인
+            found = {i for i, text in enumerate(self.texts) if needle in text}
+        else:
+            # 모든 bigram을 포함하는 후보(작은 집합부터 교집합)만 실제 부분 문자열인지 확인
+            postings = sorted((self.postings.get(gram, set()) for gram in _bigrams(needle)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            found = {i for i in candidates if needle in self.texts[i]}
+
+        self._cache[needle] = found
+        return found
+
+
+class SearchResultIndex:
+    """
+    검색 결과 목록의 제목/값 색인
+
+    결과 수를 N, 부족한 정보 항목과 세부 요구사항 수를 M이라 할 때 색인은 O(N) 한 번만 만들고,
+    항목별 평가는 색인 조회와 후보 결과 확인만 하므로 N×M 중첩 비교가 필요 없습니다.
+    같은 항목 이름이나 세부 요구사항은 한 번만 조회합니다.
+
+    예시:
+        index = SearchResultIndex(search_results["data"])
+        relevance = index.relevance(missing_items)
+        completeness = index.completeness(missing_items)
+    """
+    def __init__(self, data: List[Dict]):
+        self.data = data
+        self.titles = _FieldIndex([result.get("title", "").lower() for result in data])
+        self.values = _FieldIndex([str(result.get("value", "")).lower() for result in data])
+
+    def _item_hits(self, item: Dict, allowed: Optional[Set[int]]):
+        """(제목에 항목 이름이 포함된 결과, 값에 세부 요구사항이 포함된 결과)"""
+        title_hits = self.titles.containing(item["item"].lower())
+        value_hits = set()
+        for need in item["specific_needs"]:
+            value_hits |= self.values.containing(need.lower())
+        if allowed is not None:
+            title_hits, value_hits = title_hits & allowed, value_hits & allowed
+        return title_hits, value_hits
+
+    def relevance(self, missing_items: List[Dict], result_ids: Optional[Iterable[int]] = None) -> float:
+        """
+        항목별로 처음 일치하는 결과가 제목 일치면 1점, 값 일치면 0.5점 (항목 수로 정규화)
+
+        Args:
+            result_ids: 평가할 결과 번호 (None이면 전체, 순서가 "처음 일치하는 결과"의 기준)
+        """
+        order: Optional[Dict[int, int]] = None
+        if result_ids is not None:
+            order = {}
+            for position, result_id in enumerate(result_ids):
+                order.setdefault(result_id, position)
+        allowed = set(order) if order is not None else None
+        if not missing_items or not (self.data if allowed is None else allowed):
+            return 0.0
+
+        score = 0.0
+        for item in missing_items:
+            title_hits, value_hits = self._item_hits(item, allowed)
+            if not title_hits and not value_hits:
+                continue
+            first = min(title_hits | value_hits, key=order.get if order is not None else None)
+            score += 1.0 if first in title_hits else 0.5
+        return score / len(missing_items)
+
+    def completeness(self, missing_items: List[Dict], result_ids: Optional[Iterable[int]] = None) -> float:
+        """제목에 항목 이름이나 세부 요구사항이 포함된 결과가 있는 항목의 비율"""
+        allowed = set(result_ids) if result_ids is not None else None
+        if not missing_items or not (self.data if allowed is None else allowed):
+            return 0.0
+
+        addressed = set()
+        for item in missing_items:
+            needles = [item["item"]] + list(item["specific_needs"])
+            for needle in needles:
+                hits = self.titles.containing(needle.lower())
+                if allowed is not None:
+                    hits = hits & allowed
+                if hits:
+                    addressed.add(item["item"])
+                    break
+        return len(addressed) / len(missing_items)
+
+
+def build_batch_index(result_lists: Iterable[List[Dict]]):
+    """
+    여러 섹션의 검색 결과를 하나의 색인으로 구성 (같은 결과 객체는 한 번만 색인)
+
+    Returns:
+        (SearchResultIndex, 섹션 순서대로 각 결과 목록의 결과 번호 목록)
+    """
+    combined = []
+    positions: Dict[int, int] = {}
+    id_lists = []
+    for data in result_lists:
+        ids = []
+        for result in data:
+            key = id(result)
+            if key not in positions:
+                positions[key] = len(combined)
+                combined.append(result)
+            ids.append(positions[key])
+        id_lists.append(ids)
+    return SearchResultIndex(combined), id_lists
@@ -0,0 +1,85 @@
+"""
+스트리밍 응답 처리 - 청크 단위로 들어오는 생성 결과에서 필요 정보 표시를 찾고 진행 상황을 출력
+"""
+import re
+import time
+from typing import Callable, Iterable, List, Optional
+
+# 생성 결과의 "[필요 정보: ...]" 표시
+PLACEHOLDER_PATTERN = re.compile(r'\[필요 정보:[^\]]+\]')
+PLACEHOLDER_PREFIX = "[필요 정보:"
+
+
+class PlaceholderScanner:
+    """
+    청크 단위로 들어오는 텍스트에서 [필요 정보: ...] 표시를 찾는 증분 스캐너
+
+    전체 텍스트에 PLACEHOLDER_PATTERN.findall을 적용한 것과 같은 결과를 내며,
+    청크 경계에 걸친 표시를 위해 아직 닫히지 않은 표시 부분만 보관합니다
+    """
+    def __init__(self):
+        self.found: List[str] = []
+        self._tail = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """청크를 추가하고 새로 완성된 표시 목록 반환"""
+        text = self._tail + chunk
+        new_matches = []
+        end = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            new_matches.append(match.group())
+            end = match.end()
+
+        rest = text[end:]
+        start = rest.find(PLACEHOLDER_PREFIX)
+        if start != -1:
+            # 닫는 괄호를 기다리는 표시
+            self._tail = rest[start:]
+        else:
+            # 표시 시작 부분("[필요", "[필요 정" 등)이 청크 끝에 걸친 경우만 보관
+            self._tail = ""
+            for size in range(min(len(rest), len(PLACEHOLDER_PREFIX) - 1), 0, -1):
+                if PLACEHOLDER_PREFIX.startswith(rest[-size:]):
+                    self._tail = rest[-size:]
+                    break
+
+        self.found.extend(new_matches)
+        return new_matches
+
+
+def consume_stream(chunks: Iterable[str], label: str = "", on_chunk: Optional[Callable[[str], None]] = None,
+                   on_placeholder: Optional[Callable[[str], None]] = None, verbose: bool = True):
+    """
+    스트리밍 응답을 소비하면서 필요 정보 표시를 찾고 진행 상황 출력
+
+    Args:
+        chunks: 응답 청크 이터레이터 (LLMBackend.stream 결과)
+        label: 진행 상황 출력에 사용할 이름 (섹션 제목 등)
+        on_chunk: 청크마다 호출할 함수 (사업계획서 섹션에 바로 추가 등)
+        on_placeholder: 필요 정보 표시가 완성될 때마다 호출할 함수
+
+    Returns:
+        (전체 응답 길이, 필요 정보 표시 목록)
+    """
+    scanner = PlaceholderScanner()
+    started = time.monotonic()
+    length = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if length == 0 and verbose:
+            print(f"✍️ {label} 첫 응답 수신 ({time.monotonic() - started:.1f}초)")
+        length += len(chunk)
+
+        if on_chunk:
+            on_chunk(chunk)
+        for placeholder in scanner.feed(chunk):
+            if verbose:
+                print(f"🔎 {label} 필요 정보 감지: {placeholder}")
+            if on_placeholder:
+                on_placeholder(placeholder)
+
+    if verbose:
+        print(f"✍️ {label} 응답 완료 ({length}자, {time.monotonic() - started:.1f}초)")
+    return length, scanner.found
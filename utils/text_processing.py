@@ -0,0 +1,93 @@
+"""
+텍스트 처리 공통 도구 - 미리 컴파일한 정규식, 한글/영문 단어 분리(위치 포함), 단어 빈도, 불용어
+"""
+import re
+from collections import Counter
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+# 한글/영문/숫자가 이어진 단어 ("AI기반"은 한 단어)
+WORD_PATTERN = re.compile(r"[a-zA-Z가-힣0-9]+")
+
+# 한글과 영문/숫자를 나눈 단어 ("AI기반" → "AI", "기반")
+SCRIPT_WORD_PATTERN = re.compile(r"[a-zA-Z0-9]+|[가-힣]+")
+
+# 설명 문장에서 구체적인 필요 정보를 찾는 단서 단어와 패턴 (순서대로 적용)
+NEED_CUES = (
+    ("필요", "제공", "포함", "추가"),
+    ("데이터", "정보", "수치", "통계"),
+    ("구체적", "자세한", "명확한")
+)
+NEED_PATTERNS = tuple(re.compile(rf"([^,\.]+)({'|'.join(cues)})[^,\.]*") for cues in NEED_CUES)
+
+# 검색 키워드로 쓰기에 의미가 약한 단어
+STOP_WORDS = frozenset([
+    # 한글 조사/접속어/서술어
+    "및", "등", "또는", "그리고", "또한", "하지만", "그러나", "따라서", "이를", "이는", "이와", "그",
+    "위한", "위해", "통한", "통해", "대한", "대해", "관한", "관련", "있는", "있습니다", "있으며", "없는",
+    "하는", "하고", "합니다", "했습니다", "됩니다", "되는", "되어", "것", "것을", "것이", "수", "더",
+    "매우", "가장", "모든", "각", "중", "때", "경우",
+    # 영문 관사/전치사/접속사
+    "the", "and", "or", "of", "to", "in", "for", "on", "with", "a", "an", "is", "are", "by", "as"
+])
+
+
+class Token(NamedTuple):
+    """단어와 원문에서의 위치 (text[start:end] == word)"""
+    word: str
+    start: int
+    end: int
+
+    @property
+    def is_hangul(self) -> bool:
+        return "가" <= self.word[0] <= "힣"
+
+
+def tokenize(text: str, min_length: int = 1, split_scripts: bool = False) -> Iterator[Token]:
+    """
+    텍스트를 한 번만 훑어 단어와 위치를 순서대로 반환
+
+    Args:
+        min_length: 이보다 짧은 단어는 제외
+        split_scripts: True이면 한글과 영문/숫자가 붙어 있어도 나눔
+    """
+    pattern = SCRIPT_WORD_PATTERN if split_scripts else WORD_PATTERN
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if end - start >= min_length:
+            yield Token(match.group(), start, end)
+
+
+def words(text: str, min_length: int = 2, split_scripts: bool = False,
+          stop_words: Optional[Iterable[str]] = None) -> List[str]:
+    """단어 목록 (위치가 필요 없을 때 사용하는 빠른 경로)"""
+    pattern = SCRIPT_WORD_PATTERN if split_scripts else WORD_PATTERN
+    found = pattern.findall(text)
+    if min_length > 1:
+        found = [word for word in found if len(word) >= min_length]
+    if stop_words:
+        found = [word for word in found if word.lower() not in stop_words]
+    return found
+
+
+def word_frequencies(text: str, min_length: int = 2, stop_words: Optional[Iterable[str]] = STOP_WORDS) -> Counter:
+    """단어 빈도 (처음 나온 순서 유지)"""
+    return Counter(words(text, min_length, stop_words=stop_words))
+
+
+def top_words(text: str, n: int, min_length: int = 2, stop_words: Optional[Iterable[str]] = STOP_WORDS) -> List[str]:
+    """빈도 상위 n개 단어 (빈도가 같으면 먼저 나온 단어 우선)"""
+    return [word for word, _ in word_frequencies(text, min_length, stop_words).most_common(n)]
+
+
+def extract_needs(explanation: str) -> List[str]:
+    """설명에서 구체적인 필요 정보 추출 (찾지 못하면 설명 전체)"""
+    needs = []
+    for cues, pattern in zip(NEED_CUES, NEED_PATTERNS):
+        # 단서 단어가 없는 문장에는 (역추적이 많은) 패턴을 적용하지 않음
+        if not any(cue in explanation for cue in cues):
+            continue
+        for match in pattern.finditer(explanation):
+            need = match.group(1).strip()
+            if need:
+                needs.append(need)
+    return needs if needs else [explanation]